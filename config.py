@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from abc import ABC, abstractmethod
+from dataclasses import FrozenInstanceError, dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
 
 
 class BackendFramework(str, Enum):
@@ -43,6 +45,44 @@ class AuthMethod(str, Enum):
     SOCIAL = "social"
 
 
+# Integer pool settings of ``DatabaseConfig``
+POOL_FIELDS = ("pool_size", "max_overflow", "pool_recycle", "statement_cache_size")
+
+# Drivers a ``DatabaseConfig`` may name, sync and async, per engine
+DATABASE_DRIVERS: Dict[DatabaseType, Tuple[str, ...]] = {
+    DatabaseType.POSTGRESQL: ("asyncpg", "psycopg", "psycopg2", "pg"),
+    DatabaseType.MYSQL: ("aiomysql", "asyncmy", "pymysql", "mysqlclient", "mysql2"),
+    DatabaseType.SQLITE: ("aiosqlite", "pysqlite", "sqlite3"),
+    DatabaseType.MONGODB: ("motor", "pymongo", "mongodb"),
+    DatabaseType.REDIS: ("redis", "ioredis"),
+}
+
+# URL scheme aliases accepted by ``DatabaseConfig.from_url``
+URL_SCHEMES = {"postgres": "postgresql", "mariadb": "mysql", "rediss": "redis"}
+
+# Query parameters ``DatabaseConfig.from_url`` maps to fields rather than ``options``
+URL_FIELDS = POOL_FIELDS + ("pool_pre_ping", "replica")
+
+
+def _check_pool_settings(config: Any) -> None:
+    for name in POOL_FIELDS:
+        value = getattr(config, name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            raise ValueError(f"{name} must be a non-negative integer")
+    db_type = DatabaseType(config.type)
+    if config.driver is not None and config.driver not in DATABASE_DRIVERS.get(db_type, ()):
+        raise ValueError(f"Unknown driver {config.driver!r} for {db_type.value}")
+    if config.srv and db_type != DatabaseType.MONGODB:
+        raise ValueError("srv URLs are only supported for mongodb")
+
+
+def _url_int(query: Dict[str, List[str]], name: str) -> int:
+    try:
+        return int(query[name][-1])
+    except ValueError:
+        raise ValueError(f"{name} must be a non-negative integer") from None
+
+
 @dataclass
 class DatabaseConfig:
     """Database connection configuration."""
@@ -54,6 +94,87 @@ class DatabaseConfig:
     user: Optional[str] = None
     password: Optional[str] = None
     orm: Optional[ORMType] = None
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_recycle: Optional[int] = None
+    pool_pre_ping: Optional[bool] = None
+    statement_cache_size: Optional[int] = None
+    driver: Optional[str] = None
+    replica_urls: List[str] = field(default_factory=list)
+    srv: bool = False
+    options: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        _check_pool_settings(self)
+
+    @property
+    def driver_url(self) -> str:
+        """``connection_url`` with the driver in the scheme (``postgresql+asyncpg://``)."""
+        url = self.connection_url
+        if self.driver is None or self.type in (DatabaseType.MONGODB, DatabaseType.REDIS):
+            return url
+        scheme, rest = url.split("://", 1)
+        return f"{scheme}+{self.driver}://{rest}"
+
+    @property
+    def pool_options(self) -> Dict[str, Any]:
+        """The pool settings that are set, by field name."""
+        options = {name: getattr(self, name) for name in POOL_FIELDS + ("pool_pre_ping",)}
+        return {name: value for name, value in options.items() if value is not None}
+
+    @classmethod
+    def from_url(cls, url: str, orm: Optional[ORMType] = None) -> "DatabaseConfig":
+        """
+        Parse a database URL such as
+        ``postgresql+asyncpg://user:pass@db:5432/app?pool_size=10&replica=postgresql://replica/app``.
+
+        The scheme may carry a driver, or be ``mongodb+srv``; ``pool_size``,
+        ``max_overflow``, ``pool_recycle``, ``pool_pre_ping``,
+        ``statement_cache_size`` and repeated ``replica`` query parameters
+        fill the matching fields. Other query parameters (``sslmode``,
+        ``authSource``, ...) are kept in ``options``.
+        """
+        parts = urlsplit(url)
+        scheme, _, driver = parts.scheme.partition("+")
+        srv = scheme == "mongodb" and driver == "srv"
+        if srv:
+            driver = ""
+        try:
+            db_type = DatabaseType(URL_SCHEMES.get(scheme, scheme))
+        except ValueError:
+            raise ValueError(f"Unsupported database URL scheme {parts.scheme!r}") from None
+
+        query = parse_qs(parts.query)
+        settings: Dict[str, Any] = {}
+        for name in POOL_FIELDS:
+            if name in query:
+                settings[name] = _url_int(query, name)
+        if "pool_pre_ping" in query:
+            settings["pool_pre_ping"] = query["pool_pre_ping"][-1].lower() in ("1", "true", "yes", "on")
+
+        if db_type == DatabaseType.SQLITE:
+            name = parts.path[1:] or None
+            host = port = user = password = None
+        else:
+            name = parts.path.lstrip("/") or None
+            host, port = parts.hostname, parts.port
+            user = unquote(parts.username) if parts.username else None
+            password = unquote(parts.password) if parts.password else None
+
+        return cls(
+            type=db_type,
+            host=host,
+            port=port,
+            name=name,
+            user=user,
+            password=password,
+            orm=orm,
+            driver=driver or None,
+            replica_urls=query.get("replica", []),
+            srv=srv,
+            options={key: values[-1] for key, values in query.items() if key not in URL_FIELDS},
+            **settings
+        )
 
     @property
     def connection_url(self) -> str:
@@ -64,15 +185,17 @@ class DatabaseConfig:
 
         cred = ""
         if self.user:
-            cred = self.user
+            cred = quote(self.user, safe="")
             if self.password:
-                cred += f":{self.password}"
+                cred += f":{quote(self.password, safe='')}"
             cred += "@"
 
+        scheme = f"{self.type.value}+srv" if self.srv else self.type.value
         host = self.host or "localhost"
-        port = f":{self.port}" if self.port else ""
+        port = f":{self.port}" if self.port and not self.srv else ""
         name = f"/{self.name}" if self.name else ""
-        return f"{self.type.value}://{cred}{host}{port}{name}"
+        query = f"?{urlencode(self.options)}" if self.options else ""
+        return f"{scheme}://{cred}{host}{port}{name}{query}"
 
     def to_dict(self) -> Dict[str, Any]:
         data = {
@@ -83,6 +206,15 @@ class DatabaseConfig:
             "user": self.user,
             "password": self.password,
             "orm": self.orm.value if self.orm else None,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "statement_cache_size": self.statement_cache_size,
+            "driver": self.driver,
+            "replica_urls": list(self.replica_urls),
+            "srv": self.srv,
+            "options": dict(self.options),
         }
         return data
 
@@ -99,6 +231,9 @@ class DatabaseConfig:
             data["orm"] = ORMType(orm)
         return cls(**data)
 
+    def freeze(self) -> "FrozenDatabaseConfig":
+        return FrozenDatabaseConfig.from_config(self)
+
 
 @dataclass
 class AuthConfig:
@@ -136,6 +271,9 @@ class AuthConfig:
             data["method"] = AuthMethod(method)
         return cls(**data)
 
+    def freeze(self) -> "FrozenAuthConfig":
+        return FrozenAuthConfig.from_config(self)
+
 
 @dataclass
 class BackendConfig:
@@ -208,3 +346,287 @@ class BackendConfig:
             else:
                 data["auth"] = AuthConfig.from_dict(data["auth"])
         return cls(**data)
+
+    def freeze(self) -> "FrozenBackendConfig":
+        """Immutable, hashable copy (for cache keys and queued job specs)."""
+        return FrozenBackendConfig.from_config(self)
+
+
+class _FrozenConfig(ABC):
+    """
+    Base of the immutable config variants.
+
+    Instances are slotted, reject attribute assignment and carry a hash
+    computed once at construction, so they are cheap to hold in bulk and to
+    use as dict keys. ``thaw`` returns the mutable dataclass.
+    """
+
+    __slots__ = ("_hash",)
+    _fields: Tuple[str, ...] = ()
+
+    def _seal(self) -> None:
+        object.__setattr__(self, "_hash", hash((type(self).__name__,) + self._values()))
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._hash == other._hash and self._values() == other._values()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), self._values())
+
+    def replace(self, **changes: Any) -> "_FrozenConfig":
+        """Copy with some fields changed."""
+        values = dict(zip(self._fields, self._values()))
+        values.update(changes)
+        return type(self)(**values)
+
+    @abstractmethod
+    def thaw(self) -> Any:
+        """The mutable dataclass with the same values."""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.thaw().to_dict()
+
+
+class FrozenDatabaseConfig(_FrozenConfig):
+    """Immutable, hashable ``DatabaseConfig``; ``options`` is a sorted tuple of pairs."""
+
+    _fields = (
+        "type", "host", "port", "name", "user", "password", "orm",
+        "pool_size", "max_overflow", "pool_recycle", "pool_pre_ping",
+        "statement_cache_size", "driver", "replica_urls", "srv", "options",
+    )
+    __slots__ = _fields
+
+    def __init__(
+        self,
+        type: DatabaseType,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        name: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        orm: Optional[ORMType] = None,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_recycle: Optional[int] = None,
+        pool_pre_ping: Optional[bool] = None,
+        statement_cache_size: Optional[int] = None,
+        driver: Optional[str] = None,
+        replica_urls: Iterable[str] = (),
+        srv: bool = False,
+        options: Union[Dict[str, str], Iterable[Tuple[str, str]]] = ()
+    ):
+        object.__setattr__(self, "type", DatabaseType(type))
+        object.__setattr__(self, "host", host)
+        object.__setattr__(self, "port", port)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "user", user)
+        object.__setattr__(self, "password", password)
+        object.__setattr__(self, "orm", ORMType(orm) if orm is not None else None)
+        object.__setattr__(self, "pool_size", pool_size)
+        object.__setattr__(self, "max_overflow", max_overflow)
+        object.__setattr__(self, "pool_recycle", pool_recycle)
+        object.__setattr__(self, "pool_pre_ping", pool_pre_ping)
+        object.__setattr__(self, "statement_cache_size", statement_cache_size)
+        object.__setattr__(self, "driver", driver)
+        object.__setattr__(self, "replica_urls", tuple(replica_urls or ()))
+        object.__setattr__(self, "srv", bool(srv))
+        object.__setattr__(self, "options", tuple(sorted(dict(options or ()).items())))
+        _check_pool_settings(self)
+        self._seal()
+
+    @classmethod
+    def from_config(cls, config: DatabaseConfig) -> "FrozenDatabaseConfig":
+        return cls(*(getattr(config, name) for name in cls._fields))
+
+    @classmethod
+    def from_url(cls, url: str, orm: Optional[ORMType] = None) -> "FrozenDatabaseConfig":
+        return cls.from_config(DatabaseConfig.from_url(url, orm))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FrozenDatabaseConfig":
+        return cls.from_config(DatabaseConfig.from_dict(dict(data or {})))
+
+    @property
+    def connection_url(self) -> str:
+        return self.thaw().connection_url
+
+    @property
+    def driver_url(self) -> str:
+        return self.thaw().driver_url
+
+    @property
+    def pool_options(self) -> Dict[str, Any]:
+        return self.thaw().pool_options
+
+    def thaw(self) -> DatabaseConfig:
+        values = dict(zip(self._fields, self._values()))
+        values["replica_urls"] = list(self.replica_urls)
+        values["options"] = dict(self.options)
+        return DatabaseConfig(**values)
+
+
+class FrozenAuthConfig(_FrozenConfig):
+    """Immutable, hashable ``AuthConfig``; ``oauth_providers`` is a tuple."""
+
+    _fields = (
+        "method", "secret_key", "algorithm", "access_token_expire_minutes",
+        "refresh_token_expire_days", "oauth_providers", "session_timeout",
+        "cookie_secure", "cookie_httponly",
+    )
+    __slots__ = _fields
+
+    def __init__(
+        self,
+        method: AuthMethod,
+        secret_key: Optional[str] = None,
+        algorithm: str = "HS256",
+        access_token_expire_minutes: int = 30,
+        refresh_token_expire_days: int = 7,
+        oauth_providers: Iterable[str] = (),
+        session_timeout: Optional[int] = None,
+        cookie_secure: bool = False,
+        cookie_httponly: bool = False
+    ):
+        object.__setattr__(self, "method", AuthMethod(method))
+        object.__setattr__(self, "secret_key", secret_key)
+        object.__setattr__(self, "algorithm", algorithm)
+        object.__setattr__(self, "access_token_expire_minutes", access_token_expire_minutes)
+        object.__setattr__(self, "refresh_token_expire_days", refresh_token_expire_days)
+        object.__setattr__(self, "oauth_providers", tuple(oauth_providers or ()))
+        object.__setattr__(self, "session_timeout", session_timeout)
+        object.__setattr__(self, "cookie_secure", cookie_secure)
+        object.__setattr__(self, "cookie_httponly", cookie_httponly)
+        self._seal()
+
+    @classmethod
+    def from_config(cls, config: AuthConfig) -> "FrozenAuthConfig":
+        return cls(
+            config.method,
+            config.secret_key,
+            config.algorithm,
+            config.access_token_expire_minutes,
+            config.refresh_token_expire_days,
+            config.oauth_providers,
+            config.session_timeout,
+            config.cookie_secure,
+            config.cookie_httponly,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FrozenAuthConfig":
+        return cls.from_config(AuthConfig.from_dict(dict(data or {})))
+
+    def thaw(self) -> AuthConfig:
+        values = dict(zip(self._fields, self._values()))
+        values["oauth_providers"] = list(self.oauth_providers)
+        return AuthConfig(**values)
+
+
+class FrozenBackendConfig(_FrozenConfig):
+    """
+    Immutable, hashable ``BackendConfig``.
+
+    List fields become tuples and nested configs their frozen variants.
+    ``to_dict`` matches ``BackendConfig.to_dict``, so a frozen config can be
+    passed wherever agents read a config dict.
+    """
+
+    _fields = (
+        "project_name", "description", "framework", "version", "debug",
+        "features", "api_version", "cors_origins", "database", "auth",
+    )
+    __slots__ = _fields
+
+    def __init__(
+        self,
+        project_name: str,
+        description: str = "",
+        framework: BackendFramework = BackendFramework.FASTAPI,
+        version: str = "0.1.0",
+        debug: bool = False,
+        features: Iterable[str] = (),
+        api_version: str = "v1",
+        cors_origins: Iterable[str] = (),
+        database: Optional[FrozenDatabaseConfig] = None,
+        auth: Optional[FrozenAuthConfig] = None
+    ):
+        if not project_name:
+            raise ValueError("project_name is required")
+        if isinstance(database, DatabaseConfig):
+            database = database.freeze()
+        elif isinstance(database, dict):
+            database = FrozenDatabaseConfig.from_dict(database)
+        if isinstance(auth, AuthConfig):
+            auth = auth.freeze()
+        elif isinstance(auth, dict):
+            auth = FrozenAuthConfig.from_dict(auth)
+
+        object.__setattr__(self, "project_name", project_name)
+        object.__setattr__(self, "description", description)
+        object.__setattr__(self, "framework", BackendFramework(framework))
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "debug", debug)
+        object.__setattr__(self, "features", tuple(features or ()))
+        object.__setattr__(self, "api_version", api_version)
+        object.__setattr__(self, "cors_origins", tuple(cors_origins or ()))
+        object.__setattr__(self, "database", database)
+        object.__setattr__(self, "auth", auth)
+        self._seal()
+
+    @classmethod
+    def from_config(cls, config: BackendConfig) -> "FrozenBackendConfig":
+        return cls(
+            config.project_name,
+            config.description,
+            config.framework,
+            config.version,
+            config.debug,
+            config.features,
+            config.api_version,
+            config.cors_origins,
+            config.database.freeze() if config.database else None,
+            config.auth.freeze() if config.auth else None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FrozenBackendConfig":
+        return cls.from_config(BackendConfig.from_dict(data))
+
+    language = BackendConfig.language
+
+    def thaw(self) -> BackendConfig:
+        return BackendConfig(
+            project_name=self.project_name,
+            description=self.description,
+            framework=self.framework,
+            version=self.version,
+            debug=self.debug,
+            features=list(self.features),
+            api_version=self.api_version,
+            cors_origins=list(self.cors_origins),
+            database=self.database.thaw() if self.database else None,
+            auth=self.auth.thaw() if self.auth else None,
+        )
+
+
+# Either config variant; both expose the same fields and ``to_dict``
+AnyBackendConfig = Union[BackendConfig, FrozenBackendConfig]
@@ -6,18 +6,22 @@ Focuses specifically on backend concerns: APIs, data models, services, middlewar
 """
 
 from typing import Dict, Any, List, Optional
+import json
 import logging
 from datetime import datetime
+from functools import partial
 
-from genesis_agents import GenesisAgent, AgentTask, TaskResult
-from mcpturbo import protocol
+from genesis_agents import AgentTask, TaskResult
 
 from ..config import BackendConfig, BackendFramework, DatabaseType, AuthMethod
+from ..llm import DEFAULT_PAYLOAD_TOKENS, LLMClient, RequestLog, compact_payload, context_payload, estimate_tokens
+from .base import BackendAgent, DEFAULT_MAX_CONCURRENCY, TaskDeadlineExceeded
+from .sharding import DEFAULT_SHARD_SIZE, merge_findings, merge_verdicts, split_architecture
 
 logger = logging.getLogger(__name__)
 
 
-class ArchitectAgent(GenesisAgent):
+class ArchitectAgent(BackendAgent):
     """
     Agent specialized in backend architecture design.
     
@@ -29,11 +33,17 @@ class ArchitectAgent(GenesisAgent):
     - Define service layer architecture
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        llm_client: Optional[LLMClient] = None
+    ):
         super().__init__(
             agent_id="backend_architect",
             name="Backend Architect Agent",
-            agent_type="architect"
+            agent_type="architect",
+            max_concurrency=max_concurrency,
+            llm_client=llm_client
         )
         
         # Backend-specific capabilities
@@ -51,26 +61,24 @@ class ArchitectAgent(GenesisAgent):
         self.register_handler("select_backend_technologies", self._handle_select_technologies)
         self.register_handler("design_service_architecture", self._handle_design_services)
         self.register_handler("validate_backend_architecture", self._handle_validate_architecture)
+        
+        # Task name -> generator, looked up by execute_task
+        self._task_handlers = {
+            "analyze_backend_requirements": self._analyze_backend_requirements,
+            "design_api_architecture": self._design_api_architecture,
+            "design_data_models": self._design_data_models,
+            "select_backend_technologies": self._select_backend_technologies,
+            "design_service_architecture": self._design_service_architecture,
+            "validate_backend_architecture": self._validate_backend_architecture
+        }
     
     async def execute_task(self, task: AgentTask) -> TaskResult:
         """Execute backend architecture task using LLMs."""
+        usage = RequestLog()
         try:
             self.logger.info(f"🏗️ Executing backend architecture task: {task.name}")
             
-            if task.name == "analyze_backend_requirements":
-                result = await self._analyze_backend_requirements(task.params)
-            elif task.name == "design_api_architecture":
-                result = await self._design_api_architecture(task.params)
-            elif task.name == "design_data_models":
-                result = await self._design_data_models(task.params)
-            elif task.name == "select_backend_technologies":
-                result = await self._select_backend_technologies(task.params)
-            elif task.name == "design_service_architecture":
-                result = await self._design_service_architecture(task.params)
-            elif task.name == "validate_backend_architecture":
-                result = await self._validate_backend_architecture(task.params)
-            else:
-                result = await self._handle_generic_task(task)
+            result = await self._run_within_deadline(task, self._dispatch_task(task), usage)
             
             return TaskResult(
                 task_id=task.id,
@@ -79,17 +87,24 @@ class ArchitectAgent(GenesisAgent):
                 metadata={
                     "agent": self.name,
                     "task_type": task.name,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "llm_usage": usage.summary()
                 }
             )
             
+        except TaskDeadlineExceeded as e:
+            return self._timed_out_result(task, e, usage)
         except Exception as e:
             self.logger.error(f"❌ Error in backend architecture task {task.name}: {str(e)}")
             return TaskResult(
                 task_id=task.id,
                 success=False,
                 error=str(e),
-                metadata={"agent": self.name, "task_type": task.name}
+                metadata={
+                    "agent": self.name,
+                    "task_type": task.name,
+                    "llm_usage": usage.summary()
+                }
             )
     
     async def _analyze_backend_requirements(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -103,8 +118,8 @@ class ArchitectAgent(GenesisAgent):
         As a senior backend architect, analyze these requirements for backend system design:
         
         Project Description: {description}
-        Features Required: {features}
-        Constraints: {constraints}
+        Features Required: {compact_payload(features)}
+        Constraints: {context_payload(constraints)}
         
         Provide detailed analysis covering:
         1. Data storage requirements
@@ -118,8 +133,7 @@ class ArchitectAgent(GenesisAgent):
         Return as structured JSON with clear sections.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude is good at analysis
             action="reasoning",
             data={
@@ -129,7 +143,11 @@ class ArchitectAgent(GenesisAgent):
         )
         
         # Parse and structure the response
-        analysis = self._parse_requirements_analysis(response.result, features)
+        parsed = await self._post_process(
+            response.result,
+            analysis=partial(self._parse_requirements_analysis, features=features)
+        )
+        analysis = parsed["analysis"]
         
         return {
             "backend_requirements": analysis,
@@ -150,8 +168,8 @@ class ArchitectAgent(GenesisAgent):
         api_design_prompt = f"""
         Design a comprehensive REST API architecture for this backend system:
         
-        Requirements: {requirements}
-        Entities: {entities}
+        Requirements: {context_payload(requirements)}
+        Entities: {compact_payload(entities)}
         
         Design should include:
         1. API endpoints structure (/api/v1/...)
@@ -167,8 +185,7 @@ class ArchitectAgent(GenesisAgent):
         Return as OpenAPI 3.0 specification structure.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good for structured API design
             action="generate_text",
             data={
@@ -177,10 +194,15 @@ class ArchitectAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            api_specification=self._parse_api_design,
+            endpoint_summary=self._extract_endpoints_summary,
+            authentication_design=self._extract_auth_design
+        )
+        
         return {
-            "api_specification": self._parse_api_design(response.result),
-            "endpoint_summary": self._extract_endpoints_summary(response.result),
-            "authentication_design": self._extract_auth_design(response.result),
+            **parsed,
             "design_metadata": {
                 "designed_at": datetime.utcnow().isoformat(),
                 "designer": self.name
@@ -195,8 +217,8 @@ class ArchitectAgent(GenesisAgent):
         data_modeling_prompt = f"""
         Design data models and database schema for this backend system:
         
-        Requirements: {requirements}
-        API Design: {api_design}
+        Requirements: {context_payload(requirements)}
+        API Design: {compact_payload(api_design)}
         
         Design should include:
         1. Entity models with attributes and types
@@ -211,8 +233,7 @@ class ArchitectAgent(GenesisAgent):
         Return as structured schema definition.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at data modeling
             action="reasoning",
             data={
@@ -221,11 +242,16 @@ class ArchitectAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            data_models=self._parse_data_models,
+            relationships=self._extract_relationships,
+            database_schema=self._extract_database_schema,
+            migration_plan=self._extract_migration_plan
+        )
+        
         return {
-            "data_models": self._parse_data_models(response.result),
-            "relationships": self._extract_relationships(response.result),
-            "database_schema": self._extract_database_schema(response.result),
-            "migration_plan": self._extract_migration_plan(response.result),
+            **parsed,
             "design_metadata": {
                 "designed_at": datetime.utcnow().isoformat(),
                 "designer": self.name
@@ -241,9 +267,9 @@ class ArchitectAgent(GenesisAgent):
         tech_selection_prompt = f"""
         Select the best backend technologies for this system:
         
-        Requirements: {requirements}
-        Constraints: {constraints}
-        Preferences: {preferences}
+        Requirements: {context_payload(requirements)}
+        Constraints: {context_payload(constraints)}
+        Preferences: {context_payload(preferences)}
         
         Evaluate and recommend:
         1. Backend framework (FastAPI, Django, NestJS, etc.)
@@ -258,8 +284,7 @@ class ArchitectAgent(GenesisAgent):
         Provide rationale for each choice and alternatives.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",  # DeepSeek for technical decisions
             action="fast_coding",
             data={
@@ -268,10 +293,15 @@ class ArchitectAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            recommended_stack=self._parse_technology_recommendations,
+            alternatives=self._extract_technology_alternatives,
+            rationale=self._extract_technology_rationale
+        )
+        
         return {
-            "recommended_stack": self._parse_technology_recommendations(response.result),
-            "alternatives": self._extract_technology_alternatives(response.result),
-            "rationale": self._extract_technology_rationale(response.result),
+            **parsed,
             "selection_metadata": {
                 "selected_at": datetime.utcnow().isoformat(),
                 "selector": self.name
@@ -286,8 +316,8 @@ class ArchitectAgent(GenesisAgent):
         service_design_prompt = f"""
         Design the service layer architecture for this backend:
         
-        Data Models: {data_models}
-        API Design: {api_design}
+        Data Models: {compact_payload(data_models)}
+        API Design: {compact_payload(api_design)}
         
         Design should include:
         1. Service classes and their responsibilities
@@ -303,8 +333,7 @@ class ArchitectAgent(GenesisAgent):
         Focus on clean architecture and separation of concerns.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at architecture patterns
             action="reasoning",
             data={
@@ -313,10 +342,15 @@ class ArchitectAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            service_architecture=self._parse_service_architecture,
+            patterns_used=self._extract_architectural_patterns,
+            design_principles=self._extract_design_principles
+        )
+        
         return {
-            "service_architecture": self._parse_service_architecture(response.result),
-            "patterns_used": self._extract_architectural_patterns(response.result),
-            "design_principles": self._extract_design_principles(response.result),
+            **parsed,
             "design_metadata": {
                 "designed_at": datetime.utcnow().isoformat(),
                 "designer": self.name
@@ -324,13 +358,58 @@ class ArchitectAgent(GenesisAgent):
         }
     
     async def _validate_backend_architecture(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate complete backend architecture design."""
+        """
+        Validate complete backend architecture design.
+        
+        Architectures larger than one prompt's payload budget (or any
+        architecture when ``chunk_size`` is given) are split into subsystems
+        that are validated concurrently; the worst score of any subsystem
+        wins (see ``merge_verdicts``) and their findings are merged with
+        near-duplicates dropped.
+        """
         architecture = params.get("architecture", {})
+        chunk_size = params.get("chunk_size") or 0
+        if not chunk_size and estimate_tokens(json.dumps(architecture, default=str)) > DEFAULT_PAYLOAD_TOKENS:
+            chunk_size = DEFAULT_SHARD_SIZE
+        
+        subsystems = split_architecture(architecture, chunk_size) if chunk_size else []
+        if len(subsystems) <= 1:
+            parsed = await self._validate_architecture_part(architecture)
+            return {
+                **parsed,
+                "validation_metadata": {
+                    "validated_at": datetime.utcnow().isoformat(),
+                    "validator": self.name
+                }
+            }
+        
+        results = await self._gather_limited(*(
+            self._validate_architecture_part({"subsystem": name, **part})
+            for name, part in subsystems
+        ))
         
+        # Reduce pessimistically: the worst subsystem sets each verdict
+        verdicts = [result["validation_result"] for result in results]
+        return {
+            "validation_result": {
+                **merge_verdicts(verdicts),
+                "subsystems": {name: verdict for (name, _), verdict in zip(subsystems, verdicts)}
+            },
+            "issues_found": merge_findings(result["issues_found"] for result in results),
+            "recommendations": merge_findings(result["recommendations"] for result in results),
+            "validation_metadata": {
+                "validated_at": datetime.utcnow().isoformat(),
+                "validator": self.name,
+                "subsystems": len(subsystems)
+            }
+        }
+    
+    async def _validate_architecture_part(self, architecture: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate one architecture (or subsystem) with a single LLM call."""
         validation_prompt = f"""
         Validate this backend architecture design:
         
-        Architecture: {architecture}
+        Architecture: {compact_payload(architecture)}
         
         Check for:
         1. Consistency between API design and data models
@@ -345,8 +424,7 @@ class ArchitectAgent(GenesisAgent):
         Identify issues and suggest improvements.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at validation
             action="analysis",
             data={
@@ -355,15 +433,12 @@ class ArchitectAgent(GenesisAgent):
             }
         )
         
-        return {
-            "validation_result": self._parse_validation_result(response.result),
-            "issues_found": self._extract_issues(response.result),
-            "recommendations": self._extract_recommendations(response.result),
-            "validation_metadata": {
-                "validated_at": datetime.utcnow().isoformat(),
-                "validator": self.name
-            }
-        }
+        return await self._post_process(
+            response.result,
+            validation_result=self._parse_validation_result,
+            issues_found=self._extract_issues,
+            recommendations=self._extract_recommendations
+        )
     
     # Handler methods for MCP protocol
     async def _handle_analyze_requirements(self, request) -> Dict[str, Any]:
@@ -398,7 +473,8 @@ class ArchitectAgent(GenesisAgent):
         }
     
     # Utility methods for parsing LLM responses
-    def _parse_requirements_analysis(self, llm_response: str, features: List[str]) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_requirements_analysis(llm_response: str, features: List[str]) -> Dict[str, Any]:
         """Parse requirements analysis from LLM response."""
         # Basic parsing - in production, would use more sophisticated parsing
         return {
@@ -443,7 +519,8 @@ class ArchitectAgent(GenesisAgent):
             "caching": "Redis for session and data caching"
         }
     
-    def _parse_api_design(self, llm_response: str) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_api_design(llm_response: str) -> Dict[str, Any]:
         """Parse API design from LLM response."""
         return {
             "openapi_version": "3.0.0",
@@ -457,7 +534,8 @@ class ArchitectAgent(GenesisAgent):
             ]
         }
     
-    def _extract_endpoints_summary(self, llm_response: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_endpoints_summary(llm_response: str) -> List[Dict[str, str]]:
         """Extract endpoints summary from LLM response."""
         return [
             {"path": "/api/v1/auth/login", "method": "POST", "description": "User login"},
@@ -465,7 +543,8 @@ class ArchitectAgent(GenesisAgent):
             {"path": "/api/v1/users", "method": "GET", "description": "List users"},
         ]
     
-    def _extract_auth_design(self, llm_response: str) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_auth_design(llm_response: str) -> Dict[str, Any]:
         """Extract authentication design from LLM response."""
         return {
             "method": "JWT",
@@ -474,7 +553,8 @@ class ArchitectAgent(GenesisAgent):
             "refresh_strategy": "Refresh tokens"
         }
     
-    def _parse_data_models(self, llm_response: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _parse_data_models(llm_response: str) -> List[Dict[str, Any]]:
         """Parse data models from LLM response."""
         return [
             {
@@ -488,14 +568,16 @@ class ArchitectAgent(GenesisAgent):
             }
         ]
     
-    def _extract_relationships(self, llm_response: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_relationships(llm_response: str) -> List[Dict[str, str]]:
         """Extract entity relationships from LLM response."""
         return [
             {"from": "User", "to": "Profile", "type": "one_to_one"},
             {"from": "User", "to": "Post", "type": "one_to_many"}
         ]
     
-    def _extract_database_schema(self, llm_response: str) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_database_schema(llm_response: str) -> Dict[str, Any]:
         """Extract database schema from LLM response."""
         return {
             "tables": ["users", "profiles", "posts"],
@@ -503,7 +585,8 @@ class ArchitectAgent(GenesisAgent):
             "constraints": ["fk_posts_user_id"]
         }
     
-    def _extract_migration_plan(self, llm_response: str) -> List[str]:
+    @staticmethod
+    def _extract_migration_plan(llm_response: str) -> List[str]:
         """Extract migration plan from LLM response."""
         return [
             "Create users table",
@@ -513,7 +596,8 @@ class ArchitectAgent(GenesisAgent):
             "Add indexes"
         ]
     
-    def _parse_technology_recommendations(self, llm_response: str) -> Dict[str, str]:
+    @staticmethod
+    def _parse_technology_recommendations(llm_response: str) -> Dict[str, str]:
         """Parse technology recommendations from LLM response."""
         return {
             "framework": "FastAPI",
@@ -524,7 +608,8 @@ class ArchitectAgent(GenesisAgent):
             "testing": "pytest"
         }
     
-    def _extract_technology_alternatives(self, llm_response: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_technology_alternatives(llm_response: str) -> Dict[str, List[str]]:
         """Extract technology alternatives from LLM response."""
         return {
             "framework": ["Django", "Flask", "NestJS"],
@@ -533,7 +618,8 @@ class ArchitectAgent(GenesisAgent):
             "auth": ["OAuth2", "Session-based"]
         }
     
-    def _extract_technology_rationale(self, llm_response: str) -> Dict[str, str]:
+    @staticmethod
+    def _extract_technology_rationale(llm_response: str) -> Dict[str, str]:
         """Extract rationale for technology choices."""
         return {
             "framework": "FastAPI chosen for high performance and automatic API documentation",
@@ -541,7 +627,8 @@ class ArchitectAgent(GenesisAgent):
             "orm": "SQLAlchemy for mature ecosystem and flexibility"
         }
     
-    def _parse_service_architecture(self, llm_response: str) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_service_architecture(llm_response: str) -> Dict[str, Any]:
         """Parse service architecture from LLM response."""
         return {
             "layers": ["Controller", "Service", "Repository"],
@@ -552,15 +639,18 @@ class ArchitectAgent(GenesisAgent):
             "patterns": ["Dependency Injection", "Repository Pattern"]
         }
     
-    def _extract_architectural_patterns(self, llm_response: str) -> List[str]:
+    @staticmethod
+    def _extract_architectural_patterns(llm_response: str) -> List[str]:
         """Extract architectural patterns from LLM response."""
         return ["Repository Pattern", "Service Layer", "Dependency Injection"]
     
-    def _extract_design_principles(self, llm_response: str) -> List[str]:
+    @staticmethod
+    def _extract_design_principles(llm_response: str) -> List[str]:
         """Extract design principles from LLM response."""
         return ["Single Responsibility", "Dependency Inversion", "Open/Closed"]
     
-    def _parse_validation_result(self, llm_response: str) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_validation_result(llm_response: str) -> Dict[str, Any]:
         """Parse validation result from LLM response."""
         return {
             "overall_score": "good",
@@ -570,7 +660,8 @@ class ArchitectAgent(GenesisAgent):
             "maintainability": "high"
         }
     
-    def _extract_issues(self, llm_response: str) -> List[str]:
+    @staticmethod
+    def _extract_issues(llm_response: str) -> List[str]:
         """Extract issues from validation response."""
         return [
             "Missing input validation on some endpoints",
@@ -578,7 +669,8 @@ class ArchitectAgent(GenesisAgent):
             "Authentication error handling could be improved"
         ]
     
-    def _extract_recommendations(self, llm_response: str) -> List[str]:
+    @staticmethod
+    def _extract_recommendations(llm_response: str) -> List[str]:
         """Extract recommendations from validation response."""
         return [
             "Add comprehensive input validation",
@@ -0,0 +1,410 @@
+"""
+Backend Agent Base
+
+Shared behaviour for the backend generation agents.
+"""
+
+from contextlib import nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+import asyncio
+import logging
+import time
+
+from genesis_agents import AgentTask, GenesisAgent, TaskResult
+
+from ..llm import (
+    DEFAULT_PAYLOAD_TOKENS,
+    FileStreamParser,
+    GeneratedFile,
+    LLMClient,
+    RequestLog,
+    collect_requests,
+    compact_payload,
+    estimate_tokens,
+    get_default_client,
+)
+from ..plan import GenerationPlan, compile_plan
+from ..postprocess import get_post_processor
+from .sharding import (
+    DEFAULT_SHARD_SIZE,
+    merge_shard_results,
+    requested_shard_size,
+    shard_inputs,
+    shard_models,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default number of LLM calls a single agent method may have in flight at once
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Extra attempts for a failed shard before its task fails
+SHARD_RETRIES = 1
+
+# Receives generated files while a task runs in streaming mode
+_file_sink: ContextVar[Optional[Callable[[GeneratedFile], None]]] = ContextVar(
+    "file_sink", default=None
+)
+
+_STREAM_DONE = object()
+
+# Absolute deadline (epoch seconds) of the innermost running task
+_task_deadline: ContextVar[Optional[float]] = ContextVar("task_deadline", default=None)
+
+# LLM responses completed so far by the innermost running task
+_task_artifacts: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar(
+    "task_artifacts", default=None
+)
+
+
+class TaskDeadlineExceeded(Exception):
+    """Raised when a task is still running at its deadline."""
+
+    def __init__(self, task_name: str, artifacts: List[Dict[str, Any]]):
+        super().__init__(f"Task {task_name} exceeded its deadline")
+        self.task_name = task_name
+        self.artifacts = artifacts
+
+
+def task_deadline(task: AgentTask) -> Optional[float]:
+    """
+    Return the task's deadline as epoch seconds, if it has one.
+
+    Read from ``task.deadline`` or ``task.params["deadline"]``; either an
+    epoch timestamp or a timezone-aware ``datetime``.
+    """
+    deadline = getattr(task, "deadline", None)
+    if deadline is None:
+        deadline = (task.params or {}).get("deadline")
+    if deadline is None:
+        return None
+    if isinstance(deadline, datetime):
+        return deadline.timestamp()
+    return float(deadline)
+
+
+def current_deadline() -> Optional[float]:
+    """Deadline (epoch seconds) of the task running in this context, if any."""
+    return _task_deadline.get()
+
+
+class BackendAgent(GenesisAgent):
+    """
+    Base class for the backend generation agents.
+
+    Provides:
+    - A single LLM send path through an ``LLMClient`` (caching, coalescing, ...)
+    - Streaming execution that emits generated files as they complete
+    - Bounded concurrent execution of independent LLM calls
+    - Task deadlines that cancel all work a task started
+    - Per-task accounting of LLM requests
+    - Table-driven task dispatch and batch execution (``execute_tasks``)
+    - Post-processing of LLM output off the event loop
+    - Sharded generation of large model lists (``shard_size`` task param)
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        name: str,
+        agent_type: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        llm_client: Optional[LLMClient] = None
+    ):
+        super().__init__(
+            agent_id=agent_id,
+            name=name,
+            agent_type=agent_type
+        )
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._llm_client = llm_client
+
+        # Task name -> generator coroutine taking the task params; filled in
+        # by each agent so dispatch is a single lookup
+        self._task_handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {}
+
+    @property
+    def llm_client(self) -> LLMClient:
+        """Client used for LLM calls; falls back to the process-wide default."""
+        return self._llm_client or get_default_client()
+
+    async def execute_tasks(
+        self,
+        tasks: Iterable[AgentTask],
+        max_concurrency: Optional[int] = None
+    ) -> List[TaskResult]:
+        """
+        Execute a batch of tasks concurrently.
+
+        At most ``max_concurrency`` tasks (default: the agent's
+        ``max_concurrency``) run at once. Results are returned in input
+        order, and a failing task only fails its own result.
+        """
+        limit = max_concurrency if max_concurrency is not None else self.max_concurrency
+        if limit < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        tasks = list(tasks)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _run(task: AgentTask) -> TaskResult:
+            async with semaphore:
+                return await self.execute_task(task)
+
+        results = await asyncio.gather(
+            *(_run(task) for task in tasks),
+            return_exceptions=True
+        )
+
+        batch = []
+        for task, result in zip(tasks, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"❌ Unhandled error in task {task.name}: {result}")
+                result = TaskResult(
+                    task_id=task.id,
+                    success=False,
+                    error=str(result),
+                    metadata={"agent": self.name, "task_type": task.name}
+                )
+            batch.append(result)
+        return batch
+
+    async def _dispatch_task(self, task: AgentTask) -> Any:
+        """Run the generator registered for ``task.name``."""
+        handler = self._task_handlers.get(task.name)
+        if handler is None:
+            return await self._handle_generic_task(task)
+        return await handler(task.params)
+
+    async def _send_request(
+        self,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any]
+    ) -> Any:
+        """Send an LLM request on behalf of this agent."""
+        response = await self._send_llm_request(target_id, action, data)
+
+        artifacts = _task_artifacts.get()
+        if artifacts is not None and getattr(response, "success", True) is not False:
+            artifacts.append({
+                "target_id": target_id,
+                "action": action,
+                "result": getattr(response, "result", None)
+            })
+        return response
+
+    async def _send_llm_request(
+        self,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any]
+    ) -> Any:
+        sink = _file_sink.get()
+        if sink is None:
+            return await self.llm_client.send_request(
+                sender_id=self.agent_id,
+                target_id=target_id,
+                action=action,
+                data=data
+            )
+
+        parser = FileStreamParser()
+
+        def _on_chunk(chunk: str) -> None:
+            for generated in parser.feed(chunk):
+                sink(generated)
+
+        response = await self.llm_client.stream_request(
+            sender_id=self.agent_id,
+            target_id=target_id,
+            action=action,
+            data=data,
+            on_chunk=_on_chunk
+        )
+        for generated in parser.close():
+            sink(generated)
+        return response
+
+    async def _run_within_deadline(
+        self,
+        task: AgentTask,
+        work: Awaitable[Any],
+        usage: Optional[RequestLog] = None
+    ) -> Any:
+        """
+        Await ``work`` under the task's deadline.
+
+        The deadline is inherited by everything the task starts (LLM calls,
+        helpers, sub-tasks); a sub-task can only tighten it. On expiry all of
+        that work is cancelled and ``TaskDeadlineExceeded`` is raised with
+        the LLM responses completed so far. Every LLM request made by the
+        task is recorded in ``usage``.
+        """
+        with collect_requests(usage) if usage is not None else nullcontext():
+            deadline = task_deadline(task)
+            outer = _task_deadline.get()
+            if outer is not None:
+                deadline = outer if deadline is None else min(deadline, outer)
+
+            artifacts: List[Dict[str, Any]] = []
+            deadline_token = _task_deadline.set(deadline)
+            artifacts_token = _task_artifacts.set(artifacts)
+            try:
+                if deadline is None:
+                    return await work
+                try:
+                    return await asyncio.wait_for(work, max(deadline - time.time(), 0))
+                except asyncio.TimeoutError:
+                    if time.time() < deadline:
+                        raise
+                    raise TaskDeadlineExceeded(task.name, artifacts) from None
+            finally:
+                _task_artifacts.reset(artifacts_token)
+                _task_deadline.reset(deadline_token)
+
+    def _timed_out_result(
+        self,
+        task: AgentTask,
+        error: TaskDeadlineExceeded,
+        usage: Optional[RequestLog] = None
+    ) -> TaskResult:
+        """Build the result for a task cancelled at its deadline."""
+        self.logger.warning(f"⏱️ {error}; returning {len(error.artifacts)} partial artifact(s)")
+        metadata = {"agent": self.name, "task_type": task.name, "timed_out": True}
+        if usage is not None:
+            metadata["llm_usage"] = usage.summary()
+        return TaskResult(
+            task_id=task.id,
+            success=False,
+            result={"partial_artifacts": error.artifacts},
+            error=str(error),
+            metadata=metadata
+        )
+
+    async def _post_process(self, text: str, **parsers: Callable[[str], Any]) -> Dict[str, Any]:
+        """
+        Apply ``parsers`` to an LLM response and return their results by name.
+
+        Large responses are parsed in the shared process pool, so parsers
+        must be static methods or ``functools.partial`` of them.
+        """
+        return await get_post_processor().parse(text, parsers)
+
+    async def stream_task(self, task: AgentTask) -> AsyncIterator[Any]:
+        """
+        Execute ``task`` in streaming mode.
+
+        Yields each ``GeneratedFile`` as soon as its closing fence arrives
+        from the LLM, then the final ``TaskResult``.
+        """
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+
+        token = _file_sink.set(queue.put_nowait)
+        try:
+            runner = asyncio.ensure_future(self.execute_task(task))
+        finally:
+            _file_sink.reset(token)
+        runner.add_done_callback(lambda _: queue.put_nowait(_STREAM_DONE))
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_DONE:
+                    break
+                yield item
+            yield runner.result()
+        finally:
+            if not runner.done():
+                runner.cancel()
+
+    @staticmethod
+    def _plan(params: Dict[str, Any]) -> GenerationPlan:
+        """The project's ``GenerationPlan``: passed in ``params`` or compiled from its config."""
+        plan = params.get("plan")
+        if isinstance(plan, GenerationPlan):
+            return plan
+        return compile_plan(params.get("config", {}))
+
+    @staticmethod
+    def _should_shard(params: Dict[str, Any], models_key: str = "data_models") -> bool:
+        """
+        Whether ``params`` hold more models than one shard.
+
+        Sharding applies when asked for (``shard_size``) and, when
+        ``shard_size`` is absent, whenever the models would not fit one
+        prompt payload, so large schemas are split rather than trimmed.
+        """
+        models = params.get(models_key)
+        if not isinstance(models, list):
+            return False
+        if "shard_size" not in params:
+            return (
+                len(models) > DEFAULT_SHARD_SIZE
+                and estimate_tokens(compact_payload(models, max_tokens=None)) > DEFAULT_PAYLOAD_TOKENS
+            )
+        shard_size = requested_shard_size(params)
+        return bool(shard_size) and len(models) > shard_size
+
+    async def _generate_sharded(
+        self,
+        params: Dict[str, Any],
+        generate: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        models_key: str = "data_models",
+        language: str = "python"
+    ) -> Dict[str, Any]:
+        """
+        Run ``generate`` once per shard of ``params[models_key]`` and merge.
+
+        Shards group related models (see ``shard_models``) and run
+        concurrently; each gets the relationships and endpoints touching
+        its models. A failed shard is retried on its own.
+        """
+        shards = shard_models(
+            params[models_key],
+            params.get("relationships") or [],
+            requested_shard_size(params) or DEFAULT_SHARD_SIZE
+        )
+        self.logger.info(f"Generating {len(params[models_key])} models in {len(shards)} shards")
+
+        async def _shard(shard: List[Any]) -> Dict[str, Any]:
+            shard_params = {**params, **shard_inputs(params, shard, models_key), "shard_size": None}
+            for attempt in range(SHARD_RETRIES + 1):
+                try:
+                    return await generate(shard_params)
+                except Exception as e:
+                    if attempt == SHARD_RETRIES:
+                        raise
+                    self.logger.warning(f"Retrying shard of {len(shard)} models: {e}")
+
+        results = await self._gather_limited(*(_shard(shard) for shard in shards))
+        return merge_shard_results(results, language)
+
+    async def _gather_limited(self, *aws: Awaitable[Any]) -> List[Any]:
+        """
+        Await independent calls concurrently, at most ``max_concurrency`` at a time.
+
+        A failing call does not cancel its siblings: every call is allowed to
+        settle, then the first failure (in argument order) is re-raised.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run(aw: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await aw
+
+        results = await asyncio.gather(
+            *(_run(aw) for aw in aws),
+            return_exceptions=True
+        )
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        return list(results)
@@ -6,18 +6,67 @@ Specializes in generating Django backend applications using LLMs.
 
 from typing import Dict, Any, List, Optional
 import logging
+import pprint
 from datetime import datetime
 from pathlib import Path
 
-from genesis_agents import GenesisAgent, AgentTask, TaskResult
-from mcpturbo import protocol
+from genesis_agents import AgentTask, TaskResult
 
-from ..config import BackendConfig, BackendFramework
+from ..base import BackendAgent, DEFAULT_MAX_CONCURRENCY, TaskDeadlineExceeded
+from ..config import AnyBackendConfig, BackendFramework
+from ...llm import LLMClient, RequestLog, compact_payload, context_payload
+from ...plan import GenerationPlan, compile_plan
 
 logger = logging.getLogger(__name__)
 
+# Django database backends per engine
+DJANGO_ENGINES = {
+    "postgresql": "django.db.backends.postgresql",
+    "mysql": "django.db.backends.mysql",
+    "sqlite": "django.db.backends.sqlite3",
+}
 
-class DjangoAgent(GenesisAgent):
+# Database router sending reads to the replicas, rendered into settings/routers.py
+REPLICA_ROUTER = '''import random
+
+REPLICAS = {replicas!r}
+
+
+class ReadReplicaRouter:
+    """Send reads to a random read replica and writes and migrations to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return random.choice(REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+'''
+
+# Requirement pins per Django database driver
+DJANGO_DRIVER_REQUIREMENTS = {
+    "psycopg": "psycopg[binary]>=3.1",
+    "psycopg2": "psycopg2-binary>=2.9.0",
+    "mysqlclient": "mysqlclient>=2.2",
+}
+
+
+class _Expression:
+    """Python source emitted verbatim when a settings dict is rendered."""
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def __repr__(self) -> str:
+        return self.source
+
+
+class DjangoAgent(BackendAgent):
     """
     Agent specialized in Django backend generation.
     
@@ -30,11 +79,17 @@ class DjangoAgent(GenesisAgent):
     - Generate Django authentication systems
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        llm_client: Optional[LLMClient] = None
+    ):
         super().__init__(
             agent_id="django_generator",
             name="Django Generator Agent",
-            agent_type="generator"
+            agent_type="generator",
+            max_concurrency=max_concurrency,
+            llm_client=llm_client
         )
         
         # Django-specific capabilities
@@ -56,30 +111,26 @@ class DjangoAgent(GenesisAgent):
         self.register_handler("generate_django_rest_api", self._handle_generate_rest_api)
         self.register_handler("generate_django_auth", self._handle_generate_auth)
         self.register_handler("generate_django_settings", self._handle_generate_settings)
+        
+        # Task name -> generator, looked up by execute_task
+        self._task_handlers = {
+            "generate_django_project": self._generate_django_project,
+            "generate_django_models": self._generate_django_models,
+            "generate_django_views": self._generate_django_views,
+            "generate_django_urls": self._generate_django_urls,
+            "generate_django_admin": self._generate_django_admin,
+            "generate_django_rest_api": self._generate_django_rest_framework,
+            "generate_django_auth": self._generate_django_authentication,
+            "generate_django_settings": self._generate_django_settings
+        }
     
     async def execute_task(self, task: AgentTask) -> TaskResult:
         """Execute Django generation task using LLMs."""
+        usage = RequestLog()
         try:
             self.logger.info(f"🐍 Executing Django task: {task.name}")
             
-            if task.name == "generate_django_project":
-                result = await self._generate_django_project(task.params)
-            elif task.name == "generate_django_models":
-                result = await self._generate_django_models(task.params)
-            elif task.name == "generate_django_views":
-                result = await self._generate_django_views(task.params)
-            elif task.name == "generate_django_urls":
-                result = await self._generate_django_urls(task.params)
-            elif task.name == "generate_django_admin":
-                result = await self._generate_django_admin(task.params)
-            elif task.name == "generate_django_rest_api":
-                result = await self._generate_django_rest_framework(task.params)
-            elif task.name == "generate_django_auth":
-                result = await self._generate_django_authentication(task.params)
-            elif task.name == "generate_django_settings":
-                result = await self._generate_django_settings(task.params)
-            else:
-                result = await self._handle_generic_task(task)
+            result = await self._run_within_deadline(task, self._dispatch_task(task), usage)
             
             return TaskResult(
                 task_id=task.id,
@@ -89,22 +140,29 @@ class DjangoAgent(GenesisAgent):
                     "agent": self.name,
                     "task_type": task.name,
                     "framework": "django",
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "llm_usage": usage.summary()
                 }
             )
             
+        except TaskDeadlineExceeded as e:
+            return self._timed_out_result(task, e, usage)
         except Exception as e:
             self.logger.error(f"❌ Error in Django task {task.name}: {str(e)}")
             return TaskResult(
                 task_id=task.id,
                 success=False,
                 error=str(e),
-                metadata={"agent": self.name, "task_type": task.name}
+                metadata={
+                    "agent": self.name,
+                    "task_type": task.name,
+                    "llm_usage": usage.summary()
+                }
             )
     
     async def _generate_django_project(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate complete Django project structure using LLM."""
-        config = BackendConfig.from_dict(params.get("config", {}))
+        config = self._plan(params).config
         architecture = params.get("architecture", {})
         
         project_generation_prompt = f"""
@@ -112,11 +170,11 @@ class DjangoAgent(GenesisAgent):
         
         Project Name: {config.project_name}
         Description: {config.description}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         Database: {config.database.type.value}
         Authentication: {config.auth.method.value}
         
-        Architecture: {architecture}
+        Architecture: {context_payload(architecture)}
         
         Generate Django project with:
         1. Project configuration (settings.py split for environments)
@@ -140,27 +198,38 @@ class DjangoAgent(GenesisAgent):
         Return complete Django project structure with all necessary files.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
-            target_id="claude",  # Claude good at Django architecture
-            action="reasoning",
-            data={
-                "prompt": project_generation_prompt,
-                "system_prompt": "You are a Django expert. Generate production-ready Django projects."
-            }
+        # Supporting files only depend on the config, so request them
+        # alongside the main project instead of one after another
+        (
+            response,
+            settings_files,
+            requirements_files,
+            management_commands
+        ) = await self._gather_limited(
+            self._send_request(
+                target_id="claude",  # Claude good at Django architecture
+                action="reasoning",
+                data={
+                    "prompt": project_generation_prompt,
+                    "system_prompt": "You are a Django expert. Generate production-ready Django projects."
+                }
+            ),
+            self._generate_django_settings_files(config),
+            self._generate_requirements_files(config),
+            self._generate_management_commands(config)
         )
         
-        # Generate additional files
-        settings_files = await self._generate_django_settings_files(config)
-        requirements_files = await self._generate_requirements_files(config)
-        management_commands = await self._generate_management_commands(config)
+        parsed = await self._post_process(
+            response.result,
+            apps_created=self._extract_django_apps
+        )
         
         return {
             "project_structure": response.result,
             "settings_files": settings_files,
             "requirements_files": requirements_files,
             "management_commands": management_commands,
-            "apps_created": self._extract_django_apps(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name,
@@ -171,17 +240,20 @@ class DjangoAgent(GenesisAgent):
     
     async def _generate_django_models(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate Django models using LLM."""
+        if self._should_shard(params):
+            return await self._generate_sharded(params, self._generate_django_models)
+        
         data_models = params.get("data_models", [])
         relationships = params.get("relationships", [])
-        config = BackendConfig.from_dict(params.get("config", {}))
+        config = self._plan(params).config
         
         models_generation_prompt = f"""
         Generate Django models for this data schema:
         
-        Data Models: {data_models}
-        Relationships: {relationships}
+        Data Models: {compact_payload(data_models)}
+        Relationships: {compact_payload(relationships)}
         Database: {config.database.type.value}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         
         Generate comprehensive Django models including:
         1. Model classes with proper field types
@@ -206,8 +278,7 @@ class DjangoAgent(GenesisAgent):
         Return well-structured Django model classes.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good at Django models
             action="code_generation",
             data={
@@ -217,12 +288,17 @@ class DjangoAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            model_classes=self._extract_model_classes,
+            relationships_implemented=self._extract_relationships,
+            migrations_needed=self._extract_migration_info,
+            admin_registrations=self._extract_admin_registrations
+        )
+        
         return {
             "models_code": response.result,
-            "model_classes": self._extract_model_classes(response.result),
-            "relationships_implemented": self._extract_relationships(response.result),
-            "migrations_needed": self._extract_migration_info(response.result),
-            "admin_registrations": self._extract_admin_registrations(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -231,6 +307,9 @@ class DjangoAgent(GenesisAgent):
     
     async def _generate_django_views(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate Django views using LLM."""
+        if self._should_shard(params, "models"):
+            return await self._generate_sharded(params, self._generate_django_views, models_key="models")
+        
         api_design = params.get("api_design", {})
         models = params.get("models", [])
         view_type = params.get("view_type", "function")  # function or class
@@ -238,8 +317,8 @@ class DjangoAgent(GenesisAgent):
         views_generation_prompt = f"""
         Generate Django views for this API design:
         
-        API Design: {api_design}
-        Models: {models}
+        API Design: {compact_payload(api_design)}
+        Models: {compact_payload(models)}
         View Type: {view_type}
         
         Generate comprehensive Django views including:
@@ -267,8 +346,7 @@ class DjangoAgent(GenesisAgent):
         Return production-ready Django views.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",  # DeepSeek good at view patterns
             action="fast_coding",
             data={
@@ -277,11 +355,16 @@ class DjangoAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            view_functions=self._extract_view_functions,
+            url_patterns=self._extract_url_patterns,
+            permissions_used=self._extract_permissions
+        )
+        
         return {
             "views_code": response.result,
-            "view_functions": self._extract_view_functions(response.result),
-            "url_patterns": self._extract_url_patterns(response.result),
-            "permissions_used": self._extract_permissions(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -296,8 +379,8 @@ class DjangoAgent(GenesisAgent):
         urls_generation_prompt = f"""
         Generate Django URL configuration:
         
-        Views: {views}
-        API Design: {api_design}
+        Views: {compact_payload(views)}
+        API Design: {compact_payload(api_design)}
         
         Generate comprehensive URL patterns including:
         1. Main project URLs with app includes
@@ -321,8 +404,7 @@ class DjangoAgent(GenesisAgent):
         Return complete URL configuration.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good at URL patterns
             action="code_generation",
             data={
@@ -332,10 +414,15 @@ class DjangoAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            url_patterns=self._extract_all_url_patterns,
+            namespaces=self._extract_namespaces
+        )
+        
         return {
             "urls_code": response.result,
-            "url_patterns": self._extract_all_url_patterns(response.result),
-            "namespaces": self._extract_namespaces(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -350,8 +437,8 @@ class DjangoAgent(GenesisAgent):
         admin_generation_prompt = f"""
         Generate Django admin interface:
         
-        Models: {models}
-        Admin Features: {admin_features}
+        Models: {compact_payload(models)}
+        Admin Features: {compact_payload(admin_features)}
         
         Generate comprehensive Django admin including:
         1. ModelAdmin classes for each model
@@ -376,8 +463,7 @@ class DjangoAgent(GenesisAgent):
         Return production-ready Django admin configuration.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at admin interfaces
             action="reasoning",
             data={
@@ -386,11 +472,16 @@ class DjangoAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            admin_classes=self._extract_admin_classes,
+            custom_actions=self._extract_admin_actions,
+            inlines=self._extract_admin_inlines
+        )
+        
         return {
             "admin_code": response.result,
-            "admin_classes": self._extract_admin_classes(response.result),
-            "custom_actions": self._extract_admin_actions(response.result),
-            "inlines": self._extract_admin_inlines(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -405,8 +496,8 @@ class DjangoAgent(GenesisAgent):
         drf_generation_prompt = f"""
         Generate Django REST Framework API:
         
-        Models: {models}
-        API Design: {api_design}
+        Models: {compact_payload(models)}
+        API Design: {compact_payload(api_design)}
         
         Generate comprehensive DRF API including:
         1. Serializers for each model with validation
@@ -432,8 +523,7 @@ class DjangoAgent(GenesisAgent):
         Return production-ready DRF API.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good at DRF patterns
             action="code_generation",
             data={
@@ -443,12 +533,17 @@ class DjangoAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            serializers=self._extract_serializers,
+            viewsets=self._extract_viewsets,
+            permissions=self._extract_drf_permissions,
+            api_endpoints=self._extract_api_endpoints
+        )
+        
         return {
             "drf_code": response.result,
-            "serializers": self._extract_serializers(response.result),
-            "viewsets": self._extract_viewsets(response.result),
-            "permissions": self._extract_drf_permissions(response.result),
-            "api_endpoints": self._extract_api_endpoints(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -463,8 +558,8 @@ class DjangoAgent(GenesisAgent):
         auth_generation_prompt = f"""
         Generate Django authentication system:
         
-        Auth Config: {auth_config}
-        User Model: {user_model}
+        Auth Config: {compact_payload(auth_config)}
+        User Model: {compact_payload(user_model)}
         
         Generate comprehensive Django authentication including:
         1. Custom User model if needed
@@ -489,8 +584,7 @@ class DjangoAgent(GenesisAgent):
         Return complete Django authentication system.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at auth systems
             action="reasoning",
             data={
@@ -499,12 +593,17 @@ class DjangoAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            user_model=self._extract_user_model,
+            auth_views=self._extract_auth_views,
+            auth_forms=self._extract_auth_forms,
+            auth_backends=self._extract_auth_backends
+        )
+        
         return {
             "auth_code": response.result,
-            "user_model": self._extract_user_model(response.result),
-            "auth_views": self._extract_auth_views(response.result),
-            "auth_forms": self._extract_auth_forms(response.result),
-            "auth_backends": self._extract_auth_backends(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -513,14 +612,14 @@ class DjangoAgent(GenesisAgent):
     
     async def _generate_django_settings(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate Django settings configuration using LLM."""
-        config = BackendConfig.from_dict(params.get("config", {}))
+        config = self._plan(params).config
         
         settings_generation_prompt = f"""
         Generate Django settings configuration:
         
         Project: {config.project_name}
         Database: {config.database.type.value}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         Environment: Production-ready
         
         Generate Django settings including:
@@ -546,8 +645,7 @@ class DjangoAgent(GenesisAgent):
         Return complete Django settings structure.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at configuration
             action="reasoning",
             data={
@@ -556,11 +654,16 @@ class DjangoAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            environment_configs=self._extract_environment_configs,
+            security_settings=self._extract_security_settings,
+            database_configs=self._extract_database_configs
+        )
+        
         return {
             "settings_code": response.result,
-            "environment_configs": self._extract_environment_configs(response.result),
-            "security_settings": self._extract_security_settings(response.result),
-            "database_configs": self._extract_database_configs(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -608,70 +711,165 @@ class DjangoAgent(GenesisAgent):
         }
     
     # Utility methods for additional file generation
-    async def _generate_django_settings_files(self, config: BackendConfig) -> Dict[str, str]:
+    async def _generate_django_settings_files(self, config: AnyBackendConfig) -> Dict[str, str]:
         """Generate Django settings files for different environments."""
-        return {
-            "base.py": "# Base Django settings",
+        databases = self._databases_setting(compile_plan(config))
+        replicas = [alias for alias in databases if alias != "default"]
+        base = "# Base Django settings"
+        if databases:
+            base += f"\nimport os\n\nDATABASES = {pprint.pformat(databases, sort_dicts=False)}\n"
+        files = {
+            "base.py": base,
             "development.py": "# Development environment settings",
             "production.py": "# Production environment settings",
             "testing.py": "# Testing environment settings"
         }
-    
-    async def _generate_requirements_files(self, config: BackendConfig) -> Dict[str, str]:
-        """Generate requirements files for Django."""
+        if replicas:
+            # Without a router Django never reads from the replica aliases
+            module = config.project_name.replace("-", "_")
+            files["base.py"] += f"\nDATABASE_ROUTERS = [{f'{module}.settings.routers.ReadReplicaRouter'!r}]\n"
+            files["routers.py"] = REPLICA_ROUTER.format(replicas=replicas)
+        return files
+    
+    async def _generate_requirements_files(self, config: AnyBackendConfig) -> Dict[str, str]:
+        """Generate requirements files for Django, pinned to what the settings use."""
+        plan = compile_plan(config)
+        if self._psycopg_pool(plan):
+            # Connection pools in OPTIONS["pool"] need Django 5.1 and psycopg 3
+            base = ["Django>=5.1", "psycopg[binary,pool]>=3.1"]
+        elif plan.database is None:
+            base = ["Django>=4.2.0", "psycopg2-binary>=2.9.0"]
+        else:
+            base = ["Django>=4.2.0"]
+            if plan.driver in DJANGO_DRIVER_REQUIREMENTS:
+                base.append(DJANGO_DRIVER_REQUIREMENTS[plan.driver])
         return {
-            "requirements/base.txt": "Django>=4.2.0\npsycopg2-binary>=2.9.0",
+            "requirements/base.txt": "\n".join(base),
             "requirements/development.txt": "-r base.txt\ndjango-debug-toolbar>=4.0.0",
             "requirements/production.txt": "-r base.txt\ngunicorn>=20.1.0"
         }
     
-    async def _generate_management_commands(self, config: BackendConfig) -> Dict[str, str]:
+    async def _generate_management_commands(self, config: AnyBackendConfig) -> Dict[str, str]:
         """Generate custom Django management commands."""
         return {
             "management/commands/seed_data.py": "# Custom command to seed database",
             "management/commands/export_data.py": "# Custom command to export data"
         }
     
+    @staticmethod
+    def _psycopg_pool(plan: GenerationPlan) -> bool:
+        """Whether ``DATABASES`` configures a psycopg 3 connection pool."""
+        database = plan.config.database
+        return (
+            database is not None
+            and plan.database is not None
+            and plan.database.value == "postgresql"
+            and plan.driver == "psycopg"
+            and database.pool_size is not None
+        )
+
+    @classmethod
+    def _databases_setting(cls, plan: GenerationPlan) -> Dict[str, Dict[str, Any]]:
+        """
+        ``DATABASES`` for the configured database: the primary as
+        ``default`` and each read replica as ``replica_<n>`` (mirroring
+        ``default`` in tests; routed by ``REPLICA_ROUTER``), all with the
+        pool settings mapped to Django's (the psycopg pool ``OPTIONS``, or
+        ``CONN_MAX_AGE`` without a pool, and ``CONN_HEALTH_CHECKS``) and the
+        URL's extra query parameters passed through as ``OPTIONS``.
+        """
+        database = plan.config.database
+        if database is None or plan.database is None or plan.database.value not in DJANGO_ENGINES:
+            return {}
+
+        pooled = cls._psycopg_pool(plan)
+
+        def entry(connection: Any, password_env: str) -> Dict[str, Any]:
+            settings: Dict[str, Any] = {"ENGINE": DJANGO_ENGINES[plan.database.value], "NAME": connection.name}
+            if plan.database.value != "sqlite":
+                settings.update({
+                    "HOST": connection.host or "localhost",
+                    "PORT": str(connection.port or ""),
+                    "USER": connection.user or "",
+                    "PASSWORD": _Expression(f"os.environ.get({password_env!r}, '')"),
+                })
+            # Django rejects persistent connections alongside a pool; the pool recycles instead
+            if database.pool_recycle is not None and not pooled:
+                settings["CONN_MAX_AGE"] = database.pool_recycle
+            if database.pool_pre_ping is not None:
+                settings["CONN_HEALTH_CHECKS"] = database.pool_pre_ping
+
+            options: Dict[str, Any] = dict(connection.options)
+            if pooled:
+                options["pool"] = {
+                    "min_size": database.pool_size,
+                    "max_size": database.pool_size + (database.max_overflow or 0),
+                }
+                if database.pool_recycle is not None:
+                    options["pool"]["max_lifetime"] = database.pool_recycle
+            if plan.driver == "psycopg" and database.statement_cache_size == 0:
+                # No server-side prepared statements (transaction-mode pgbouncer); psycopg 3 only
+                options["prepare_threshold"] = None
+            if options:
+                settings["OPTIONS"] = options
+            return settings
+
+        databases = {"default": entry(database, "DATABASE_PASSWORD")}
+        for index, url in enumerate(database.replica_urls, start=1):
+            replica = entry(type(database).from_url(url), f"DATABASE_REPLICA_{index}_PASSWORD")
+            replica["TEST"] = {"MIRROR": "default"}
+            databases[f"replica_{index}"] = replica
+        return databases
+
     # Utility methods for parsing LLM responses
-    def _extract_django_apps(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_django_apps(code: str) -> List[str]:
         """Extract Django apps from generated code."""
         return ["users", "core", "api"]
     
-    def _extract_model_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_model_classes(code: str) -> List[str]:
         """Extract model class names."""
         return ["User", "Profile", "Post"]
     
-    def _extract_relationships(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_relationships(code: str) -> List[Dict[str, str]]:
         """Extract model relationships."""
         return [
             {"from": "Profile", "to": "User", "type": "OneToOneField"},
             {"from": "Post", "to": "User", "type": "ForeignKey"}
         ]
     
-    def _extract_migration_info(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_migration_info(code: str) -> List[str]:
         """Extract migration information."""
         return ["Initial migration", "Add user profile", "Add post model"]
     
-    def _extract_admin_registrations(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_admin_registrations(code: str) -> List[str]:
         """Extract admin registrations needed."""
         return ["UserAdmin", "ProfileAdmin", "PostAdmin"]
     
-    def _extract_view_functions(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_view_functions(code: str) -> List[str]:
         """Extract view function names."""
         return ["user_list", "user_detail", "user_create", "user_update"]
     
-    def _extract_url_patterns(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_url_patterns(code: str) -> List[Dict[str, str]]:
         """Extract URL patterns."""
         return [
             {"pattern": "users/", "name": "user_list", "view": "user_list"},
             {"pattern": "users/<int:pk>/", "name": "user_detail", "view": "user_detail"}
         ]
     
-    def _extract_permissions(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_permissions(code: str) -> List[str]:
         """Extract permissions used."""
         return ["login_required", "permission_required", "user_passes_test"]
     
-    def _extract_all_url_patterns(self, code: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_all_url_patterns(code: str) -> Dict[str, List[str]]:
         """Extract all URL patterns by app."""
         return {
             "main": ["/admin/", "/api/", "/users/"],
@@ -679,42 +877,51 @@ class DjangoAgent(GenesisAgent):
             "api": ["/v1/users/", "/v1/auth/"]
         }
     
-    def _extract_namespaces(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_namespaces(code: str) -> List[str]:
         """Extract URL namespaces."""
         return ["admin", "api", "users"]
     
-    def _extract_admin_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_admin_classes(code: str) -> List[str]:
         """Extract admin class names."""
         return ["UserAdmin", "ProfileAdmin", "PostAdmin"]
     
-    def _extract_admin_actions(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_admin_actions(code: str) -> List[str]:
         """Extract custom admin actions."""
         return ["activate_users", "deactivate_users", "export_users"]
     
-    def _extract_admin_inlines(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_admin_inlines(code: str) -> List[str]:
         """Extract admin inline classes."""
         return ["ProfileInline", "PostInline"]
     
-    def _extract_serializers(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_serializers(code: str) -> List[str]:
         """Extract DRF serializer names."""
         return ["UserSerializer", "ProfileSerializer", "PostSerializer"]
     
-    def _extract_viewsets(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_viewsets(code: str) -> List[str]:
         """Extract DRF viewset names."""
         return ["UserViewSet", "ProfileViewSet", "PostViewSet"]
     
-    def _extract_drf_permissions(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_drf_permissions(code: str) -> List[str]:
         """Extract DRF permission classes."""
         return ["IsAuthenticated", "IsOwnerOrReadOnly", "IsAdminUser"]
     
-    def _extract_api_endpoints(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_api_endpoints(code: str) -> List[Dict[str, str]]:
         """Extract API endpoints."""
         return [
             {"path": "/api/v1/users/", "method": "GET", "description": "List users"},
             {"path": "/api/v1/users/", "method": "POST", "description": "Create user"}
         ]
     
-    def _extract_user_model(self, code: str) -> Dict[str, str]:
+    @staticmethod
+    def _extract_user_model(code: str) -> Dict[str, str]:
         """Extract custom user model info."""
         return {
             "model_name": "CustomUser",
@@ -722,27 +929,33 @@ class DjangoAgent(GenesisAgent):
             "manager": "CustomUserManager"
         }
     
-    def _extract_auth_views(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_views(code: str) -> List[str]:
         """Extract authentication views."""
         return ["LoginView", "LogoutView", "RegisterView", "PasswordResetView"]
     
-    def _extract_auth_forms(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_forms(code: str) -> List[str]:
         """Extract authentication forms."""
         return ["LoginForm", "RegisterForm", "PasswordResetForm"]
     
-    def _extract_auth_backends(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_backends(code: str) -> List[str]:
         """Extract authentication backends."""
         return ["EmailBackend", "SocialAuthBackend"]
     
-    def _extract_environment_configs(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_environment_configs(code: str) -> List[str]:
         """Extract environment configurations."""
         return ["development", "production", "testing", "staging"]
     
-    def _extract_security_settings(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_security_settings(code: str) -> List[str]:
         """Extract security settings."""
         return ["SECURE_SSL_REDIRECT", "CSRF_COOKIE_SECURE", "SESSION_COOKIE_SECURE"]
     
-    def _extract_database_configs(self, code: str) -> Dict[str, str]:
+    @staticmethod
+    def _extract_database_configs(code: str) -> Dict[str, str]:
         """Extract database configurations."""
         return {
             "development": "SQLite for local development",
@@ -9,15 +9,17 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
-from genesis_agents import GenesisAgent, AgentTask, TaskResult
-from mcpturbo import protocol
+from genesis_agents import AgentTask, TaskResult
 
-from ..config import BackendConfig, BackendFramework
+from ..base import BackendAgent, DEFAULT_MAX_CONCURRENCY, TaskDeadlineExceeded
+from ..config import AnyBackendConfig, BackendFramework
+from ...llm import LLMClient, RequestLog, compact_payload, context_payload
+from ...plan import GenerationPlan, compile_plan
 
 logger = logging.getLogger(__name__)
 
 
-class FastAPIAgent(GenesisAgent):
+class FastAPIAgent(BackendAgent):
     """
     Agent specialized in FastAPI backend generation.
     
@@ -30,11 +32,17 @@ class FastAPIAgent(GenesisAgent):
     - Generate database integration
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        llm_client: Optional[LLMClient] = None
+    ):
         super().__init__(
             agent_id="fastapi_generator",
             name="FastAPI Generator Agent",
-            agent_type="generator"
+            agent_type="generator",
+            max_concurrency=max_concurrency,
+            llm_client=llm_client
         )
         
         # FastAPI-specific capabilities
@@ -53,28 +61,25 @@ class FastAPIAgent(GenesisAgent):
         self.register_handler("generate_fastapi_middleware", self._handle_generate_middleware)
         self.register_handler("generate_fastapi_auth", self._handle_generate_auth)
         self.register_handler("generate_sqlalchemy_models", self._handle_generate_models)
+        
+        # Task name -> generator, looked up by execute_task
+        self._task_handlers = {
+            "generate_fastapi_app": self._generate_fastapi_application,
+            "generate_fastapi_routes": self._generate_fastapi_routes,
+            "generate_pydantic_models": self._generate_pydantic_schemas,
+            "generate_fastapi_middleware": self._generate_fastapi_middleware,
+            "generate_fastapi_auth": self._generate_fastapi_authentication,
+            "generate_sqlalchemy_models": self._generate_sqlalchemy_models,
+            "generate_fastapi_dependencies": self._generate_fastapi_dependencies
+        }
     
     async def execute_task(self, task: AgentTask) -> TaskResult:
         """Execute FastAPI generation task using LLMs."""
+        usage = RequestLog()
         try:
             self.logger.info(f"⚡ Executing FastAPI task: {task.name}")
             
-            if task.name == "generate_fastapi_app":
-                result = await self._generate_fastapi_application(task.params)
-            elif task.name == "generate_fastapi_routes":
-                result = await self._generate_fastapi_routes(task.params)
-            elif task.name == "generate_pydantic_models":
-                result = await self._generate_pydantic_schemas(task.params)
-            elif task.name == "generate_fastapi_middleware":
-                result = await self._generate_fastapi_middleware(task.params)
-            elif task.name == "generate_fastapi_auth":
-                result = await self._generate_fastapi_authentication(task.params)
-            elif task.name == "generate_sqlalchemy_models":
-                result = await self._generate_sqlalchemy_models(task.params)
-            elif task.name == "generate_fastapi_dependencies":
-                result = await self._generate_fastapi_dependencies(task.params)
-            else:
-                result = await self._handle_generic_task(task)
+            result = await self._run_within_deadline(task, self._dispatch_task(task), usage)
             
             return TaskResult(
                 task_id=task.id,
@@ -84,22 +89,29 @@ class FastAPIAgent(GenesisAgent):
                     "agent": self.name,
                     "task_type": task.name,
                     "framework": "fastapi",
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "llm_usage": usage.summary()
                 }
             )
             
+        except TaskDeadlineExceeded as e:
+            return self._timed_out_result(task, e, usage)
         except Exception as e:
             self.logger.error(f"❌ Error in FastAPI task {task.name}: {str(e)}")
             return TaskResult(
                 task_id=task.id,
                 success=False,
                 error=str(e),
-                metadata={"agent": self.name, "task_type": task.name}
+                metadata={
+                    "agent": self.name,
+                    "task_type": task.name,
+                    "llm_usage": usage.summary()
+                }
             )
     
     async def _generate_fastapi_application(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate complete FastAPI application structure using LLM."""
-        config = BackendConfig.from_dict(params.get("config", {}))
+        config = self._plan(params).config
         architecture = params.get("architecture", {})
         
         app_generation_prompt = f"""
@@ -107,13 +119,13 @@ class FastAPIAgent(GenesisAgent):
         
         Project Name: {config.project_name}
         Description: {config.description}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         Database: {config.database.type.value}
         Authentication: {config.auth.method.value}
         API Version: {config.api_version}
-        CORS Origins: {config.cors_origins}
+        CORS Origins: {compact_payload(config.cors_origins)}
         
-        Architecture: {architecture}
+        Architecture: {context_payload(architecture)}
         
         Generate the main FastAPI application file (main.py) that includes:
         1. FastAPI app initialization with metadata
@@ -131,22 +143,23 @@ class FastAPIAgent(GenesisAgent):
         Return only the Python code.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
-            target_id="openai",  # OpenAI good at code generation
-            action="code_generation",
-            data={
-                "prompt": app_generation_prompt,
-                "language": "python",
-                "framework": "fastapi"
-            }
+        # Supporting files only depend on the config, so request them
+        # alongside the main application instead of one after another
+        response, config_files, requirements, dockerfile = await self._gather_limited(
+            self._send_request(
+                target_id="openai",  # OpenAI good at code generation
+                action="code_generation",
+                data={
+                    "prompt": app_generation_prompt,
+                    "language": "python",
+                    "framework": "fastapi"
+                }
+            ),
+            self._generate_config_files(config),
+            self._generate_requirements_file(config),
+            self._generate_dockerfile(config)
         )
         
-        # Generate additional configuration files
-        config_files = await self._generate_config_files(config)
-        requirements = await self._generate_requirements_file(config)
-        dockerfile = await self._generate_dockerfile(config)
-        
         return {
             "main_application": response.result,
             "config_files": config_files,
@@ -163,6 +176,9 @@ class FastAPIAgent(GenesisAgent):
     
     async def _generate_fastapi_routes(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate FastAPI routes and endpoints using LLM."""
+        if self._should_shard(params):
+            return await self._generate_sharded(params, self._generate_fastapi_routes)
+        
         api_design = params.get("api_design", {})
         data_models = params.get("data_models", [])
         auth_required = params.get("auth_required", False)
@@ -170,8 +186,8 @@ class FastAPIAgent(GenesisAgent):
         routes_generation_prompt = f"""
         Generate FastAPI routes for this API design:
         
-        API Design: {api_design}
-        Data Models: {data_models}
+        API Design: {compact_payload(api_design)}
+        Data Models: {compact_payload(data_models)}
         Authentication Required: {auth_required}
         
         Generate comprehensive FastAPI routes that include:
@@ -190,8 +206,7 @@ class FastAPIAgent(GenesisAgent):
         Return structured code for each router.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",  # DeepSeek good at fast code generation
             action="fast_coding",
             data={
@@ -201,11 +216,18 @@ class FastAPIAgent(GenesisAgent):
             }
         )
         
+        parsers = {
+            "router_files": self._parse_router_files,
+            "endpoints_summary": self._extract_endpoints_from_routes
+        }
+        if auth_required:
+            parsers["auth_dependencies"] = self._extract_auth_dependencies
+        parsed = await self._post_process(response.result, **parsers)
+        parsed.setdefault("auth_dependencies", {})
+        
         return {
             "routes_code": response.result,
-            "router_files": self._parse_router_files(response.result),
-            "endpoints_summary": self._extract_endpoints_from_routes(response.result),
-            "auth_dependencies": self._extract_auth_dependencies(response.result) if auth_required else {},
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -220,8 +242,8 @@ class FastAPIAgent(GenesisAgent):
         schemas_generation_prompt = f"""
         Generate Pydantic schemas for this data model:
         
-        Data Models: {data_models}
-        API Design: {api_design}
+        Data Models: {compact_payload(data_models)}
+        API Design: {compact_payload(api_design)}
         
         Generate comprehensive Pydantic schemas including:
         1. Base schemas for each entity
@@ -239,8 +261,7 @@ class FastAPIAgent(GenesisAgent):
         Return well-organized schema classes.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good at structured data modeling
             action="code_generation",
             data={
@@ -250,10 +271,15 @@ class FastAPIAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            schema_classes=self._parse_schema_classes,
+            validation_rules=self._extract_validation_rules
+        )
+        
         return {
             "schemas_code": response.result,
-            "schema_classes": self._parse_schema_classes(response.result),
-            "validation_rules": self._extract_validation_rules(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -262,14 +288,14 @@ class FastAPIAgent(GenesisAgent):
     
     async def _generate_fastapi_middleware(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate FastAPI middleware using LLM."""
-        config = BackendConfig.from_dict(params.get("config", {}))
+        config = self._plan(params).config
         features = params.get("features", [])
         
         middleware_generation_prompt = f"""
         Generate FastAPI middleware for this configuration:
         
-        Features: {features}
-        CORS Origins: {config.cors_origins}
+        Features: {compact_payload(features)}
+        CORS Origins: {compact_payload(config.cors_origins)}
         Authentication: {config.auth.method.value}
         Debug Mode: {config.debug}
         
@@ -288,8 +314,7 @@ class FastAPIAgent(GenesisAgent):
         Return production-ready middleware code.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at middleware patterns
             action="reasoning",
             data={
@@ -298,10 +323,15 @@ class FastAPIAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            middleware_order=self._extract_middleware_order,
+            configuration=self._extract_middleware_config
+        )
+        
         return {
             "middleware_code": response.result,
-            "middleware_order": self._extract_middleware_order(response.result),
-            "configuration": self._extract_middleware_config(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -320,7 +350,7 @@ class FastAPIAgent(GenesisAgent):
         Secret Key: {auth_config.get('secret_key', 'secret')}
         Algorithm: {auth_config.get('algorithm', 'HS256')}
         Token Expiration: {auth_config.get('access_token_expire_minutes', 30)} minutes
-        User Model: {user_model}
+        User Model: {compact_payload(user_model)}
         
         Generate complete authentication system including:
         1. JWT token creation and verification
@@ -337,8 +367,7 @@ class FastAPIAgent(GenesisAgent):
         Use FastAPI security utilities and follow OAuth2 patterns.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good at authentication patterns
             action="code_generation",
             data={
@@ -348,11 +377,16 @@ class FastAPIAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            auth_routes=self._extract_auth_routes,
+            dependencies=self._extract_auth_dependencies,
+            utilities=self._extract_auth_utilities
+        )
+        
         return {
             "auth_code": response.result,
-            "auth_routes": self._extract_auth_routes(response.result),
-            "dependencies": self._extract_auth_dependencies(response.result),
-            "utilities": self._extract_auth_utilities(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -361,6 +395,9 @@ class FastAPIAgent(GenesisAgent):
     
     async def _generate_sqlalchemy_models(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate SQLAlchemy models using LLM."""
+        if self._should_shard(params):
+            return await self._generate_sharded(params, self._generate_sqlalchemy_models)
+        
         data_models = params.get("data_models", [])
         relationships = params.get("relationships", [])
         database_config = params.get("database_config", {})
@@ -368,8 +405,8 @@ class FastAPIAgent(GenesisAgent):
         models_generation_prompt = f"""
         Generate SQLAlchemy models for this database schema:
         
-        Data Models: {data_models}
-        Relationships: {relationships}
+        Data Models: {compact_payload(data_models)}
+        Relationships: {compact_payload(relationships)}
         Database: {database_config.get('type', 'postgresql')}
         
         Generate comprehensive SQLAlchemy models including:
@@ -388,8 +425,7 @@ class FastAPIAgent(GenesisAgent):
         Include Base class and database configuration.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at data modeling
             action="reasoning",
             data={
@@ -398,11 +434,16 @@ class FastAPIAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            model_classes=self._parse_model_classes,
+            relationships_defined=self._extract_model_relationships,
+            database_config=self._extract_database_config
+        )
+        
         return {
             "models_code": response.result,
-            "model_classes": self._parse_model_classes(response.result),
-            "relationships_defined": self._extract_model_relationships(response.result),
-            "database_config": self._extract_database_config(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -411,14 +452,14 @@ class FastAPIAgent(GenesisAgent):
     
     async def _generate_fastapi_dependencies(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate FastAPI dependencies using LLM."""
-        config = BackendConfig.from_dict(params.get("config", {}))
+        config = self._plan(params).config
         
         dependencies_generation_prompt = f"""
         Generate FastAPI dependencies for this configuration:
         
         Database: {config.database.type.value}
         Authentication: {config.auth.method.value}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         
         Generate dependencies for:
         1. Database session management
@@ -435,8 +476,7 @@ class FastAPIAgent(GenesisAgent):
         Use FastAPI Depends() properly with proper typing.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",  # DeepSeek for dependency patterns
             action="fast_coding",
             data={
@@ -445,9 +485,14 @@ class FastAPIAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            dependency_functions=self._parse_dependency_functions
+        )
+        
         return {
             "dependencies_code": response.result,
-            "dependency_functions": self._parse_dependency_functions(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -455,34 +500,39 @@ class FastAPIAgent(GenesisAgent):
         }
     
     # Generate supporting files
-    async def _generate_config_files(self, config: BackendConfig) -> Dict[str, str]:
+    async def _generate_config_files(self, config: AnyBackendConfig) -> Dict[str, str]:
         """Generate configuration files for FastAPI."""
+        plan = compile_plan(config)
         config_prompt = f"""
         Generate configuration files for FastAPI project:
         
         Project: {config.project_name}
         Database: {config.database.type.value}
-        Features: {config.features}
+        Database Driver: {plan.driver}
+        Engine Options: {compact_payload(self._engine_options(plan))}
+        Read Replicas: {len(config.database.replica_urls)}
+        Features: {compact_payload(config.features)}
         
         Generate:
         1. settings.py with Pydantic BaseSettings
         2. .env.example file
-        3. database.py for SQLAlchemy setup
+        3. database.py for SQLAlchemy setup: create_async_engine with exactly
+           the engine options above, plus a read-only engine per replica URL
         4. logging configuration
         
         Return structured configuration code.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",
             action="code_generation",
             data={"prompt": config_prompt, "language": "python"}
         )
         
-        return self._parse_config_files(response.result)
+        parsed = await self._post_process(response.result, config_files=self._parse_config_files)
+        return parsed["config_files"]
     
-    async def _generate_requirements_file(self, config: BackendConfig) -> str:
+    async def _generate_requirements_file(self, config: AnyBackendConfig) -> str:
         """Generate requirements.txt for FastAPI project."""
         requirements_prompt = f"""
         Generate requirements.txt for FastAPI project with:
@@ -490,13 +540,12 @@ class FastAPIAgent(GenesisAgent):
         Framework: FastAPI
         Database: {config.database.type.value}
         Authentication: {config.auth.method.value}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         
         Include all necessary dependencies with proper versions.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",
             action="fast_coding",
             data={"prompt": requirements_prompt}
@@ -504,7 +553,7 @@ class FastAPIAgent(GenesisAgent):
         
         return response.result
     
-    async def _generate_dockerfile(self, config: BackendConfig) -> str:
+    async def _generate_dockerfile(self, config: AnyBackendConfig) -> str:
         """Generate Dockerfile for FastAPI project."""
         dockerfile_prompt = f"""
         Generate production-ready Dockerfile for FastAPI project:
@@ -521,8 +570,7 @@ class FastAPIAgent(GenesisAgent):
         - Non-root user
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",
             action="reasoning",
             data={"prompt": dockerfile_prompt}
@@ -563,7 +611,7 @@ class FastAPIAgent(GenesisAgent):
         }
     
     # Utility methods for parsing LLM responses
-    def _generate_project_structure(self, config: BackendConfig) -> Dict[str, Any]:
+    def _generate_project_structure(self, config: AnyBackendConfig) -> Dict[str, Any]:
         """Generate project structure for FastAPI."""
         return {
             "app/": {
@@ -590,7 +638,18 @@ class FastAPIAgent(GenesisAgent):
             "Dockerfile": "Container configuration"
         }
     
-    def _parse_router_files(self, code: str) -> Dict[str, str]:
+    @staticmethod
+    def _engine_options(plan: GenerationPlan) -> Dict[str, Any]:
+        """SQLAlchemy engine keyword arguments for the configured pool settings."""
+        database = plan.config.database
+        options = database.pool_options if database is not None else {}
+        statement_cache_size = options.pop("statement_cache_size", None)
+        if statement_cache_size is not None and plan.driver == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": statement_cache_size}
+        return options
+
+    @staticmethod
+    def _parse_router_files(code: str) -> Dict[str, str]:
         """Parse router files from generated code."""
         # In production, would parse actual code structure
         return {
@@ -599,7 +658,8 @@ class FastAPIAgent(GenesisAgent):
             "health.py": "Health check routes"
         }
     
-    def _extract_endpoints_from_routes(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_endpoints_from_routes(code: str) -> List[Dict[str, str]]:
         """Extract endpoint information from route code."""
         return [
             {"path": "/api/v1/auth/login", "method": "POST", "description": "User login"},
@@ -607,7 +667,8 @@ class FastAPIAgent(GenesisAgent):
             {"path": "/health", "method": "GET", "description": "Health check"}
         ]
     
-    def _extract_auth_dependencies(self, code: str) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_auth_dependencies(code: str) -> Dict[str, Any]:
         """Extract authentication dependencies from code."""
         return {
             "get_current_user": "Get current authenticated user",
@@ -615,11 +676,13 @@ class FastAPIAgent(GenesisAgent):
             "get_current_superuser": "Get current superuser"
         }
     
-    def _parse_schema_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _parse_schema_classes(code: str) -> List[str]:
         """Parse schema class names from code."""
         return ["UserBase", "UserCreate", "UserUpdate", "User", "UserInDB"]
     
-    def _extract_validation_rules(self, code: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_validation_rules(code: str) -> Dict[str, List[str]]:
         """Extract validation rules from schemas."""
         return {
             "email": ["email validation", "required"],
@@ -627,11 +690,13 @@ class FastAPIAgent(GenesisAgent):
             "name": ["max length 100"]
         }
     
-    def _extract_middleware_order(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_middleware_order(code: str) -> List[str]:
         """Extract middleware execution order."""
         return ["CORS", "Authentication", "Logging", "Error Handling"]
     
-    def _extract_middleware_config(self, code: str) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_middleware_config(code: str) -> Dict[str, Any]:
         """Extract middleware configuration."""
         return {
             "cors_origins": ["http://localhost:3000"],
@@ -639,26 +704,31 @@ class FastAPIAgent(GenesisAgent):
             "allow_headers": ["*"]
         }
     
-    def _extract_auth_routes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_routes(code: str) -> List[str]:
         """Extract authentication routes."""
         return ["/auth/login", "/auth/register", "/auth/logout", "/auth/refresh"]
     
-    def _extract_auth_utilities(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_utilities(code: str) -> List[str]:
         """Extract authentication utilities."""
         return ["create_access_token", "verify_password", "get_password_hash"]
     
-    def _parse_model_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _parse_model_classes(code: str) -> List[str]:
         """Parse model class names from code."""
         return ["User", "Profile", "Post"]
     
-    def _extract_model_relationships(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_model_relationships(code: str) -> List[Dict[str, str]]:
         """Extract model relationships."""
         return [
             {"from": "User", "to": "Profile", "type": "one_to_one"},
             {"from": "User", "to": "Post", "type": "one_to_many"}
         ]
     
-    def _extract_database_config(self, code: str) -> Dict[str, str]:
+    @staticmethod
+    def _extract_database_config(code: str) -> Dict[str, str]:
         """Extract database configuration."""
         return {
             "engine_config": "SQLAlchemy engine configuration",
@@ -666,11 +736,13 @@ class FastAPIAgent(GenesisAgent):
             "base_class": "Declarative base class"
         }
     
-    def _parse_dependency_functions(self, code: str) -> List[str]:
+    @staticmethod
+    def _parse_dependency_functions(code: str) -> List[str]:
         """Parse dependency function names."""
         return ["get_db", "get_current_user", "get_settings"]
     
-    def _parse_config_files(self, code: str) -> Dict[str, str]:
+    @staticmethod
+    def _parse_config_files(code: str) -> Dict[str, str]:
         """Parse configuration files from generated code."""
         return {
             "settings.py": "# Application settings configuration",
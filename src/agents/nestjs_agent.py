@@ -5,19 +5,30 @@ Specializes in generating NestJS backend applications using LLMs.
 """
 
 from typing import Dict, Any, List, Optional
+import json
 import logging
 from datetime import datetime
 from pathlib import Path
 
-from genesis_agents import GenesisAgent, AgentTask, TaskResult
-from mcpturbo import protocol
+from genesis_agents import AgentTask, TaskResult
 
-from ..config import BackendConfig, BackendFramework
+from ..config import AnyBackendConfig, BackendFramework
+from ..llm import LLMClient, RequestLog, compact_payload, context_payload
+from ..plan import GenerationPlan, compile_plan
+from .base import BackendAgent, DEFAULT_MAX_CONCURRENCY, TaskDeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
+# TypeORM connection types per engine
+TYPEORM_TYPES = {
+    "postgresql": "postgres",
+    "mysql": "mysql",
+    "sqlite": "sqlite",
+    "mongodb": "mongodb",
+}
 
-class NestJSAgent(GenesisAgent):
+
+class NestJSAgent(BackendAgent):
     """
     Agent specialized in NestJS backend generation.
     
@@ -30,11 +41,17 @@ class NestJSAgent(GenesisAgent):
     - Generate DTOs and validation pipes
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        llm_client: Optional[LLMClient] = None
+    ):
         super().__init__(
             agent_id="nestjs_generator",
             name="NestJS Generator Agent",
-            agent_type="generator"
+            agent_type="generator",
+            max_concurrency=max_concurrency,
+            llm_client=llm_client
         )
         
         # NestJS-specific capabilities
@@ -56,30 +73,26 @@ class NestJSAgent(GenesisAgent):
         self.register_handler("generate_nestjs_auth", self._handle_generate_auth)
         self.register_handler("generate_nestjs_dtos", self._handle_generate_dtos)
         self.register_handler("generate_nestjs_pipes", self._handle_generate_pipes)
+        
+        # Task name -> generator, looked up by execute_task
+        self._task_handlers = {
+            "generate_nestjs_project": self._generate_nestjs_project,
+            "generate_nestjs_modules": self._generate_nestjs_modules,
+            "generate_nestjs_controllers": self._generate_nestjs_controllers,
+            "generate_nestjs_services": self._generate_nestjs_services,
+            "generate_typeorm_entities": self._generate_typeorm_entities,
+            "generate_nestjs_auth": self._generate_nestjs_authentication,
+            "generate_nestjs_dtos": self._generate_nestjs_dtos,
+            "generate_nestjs_pipes": self._generate_nestjs_pipes
+        }
     
     async def execute_task(self, task: AgentTask) -> TaskResult:
         """Execute NestJS generation task using LLMs."""
+        usage = RequestLog()
         try:
             self.logger.info(f"🟦 Executing NestJS task: {task.name}")
             
-            if task.name == "generate_nestjs_project":
-                result = await self._generate_nestjs_project(task.params)
-            elif task.name == "generate_nestjs_modules":
-                result = await self._generate_nestjs_modules(task.params)
-            elif task.name == "generate_nestjs_controllers":
-                result = await self._generate_nestjs_controllers(task.params)
-            elif task.name == "generate_nestjs_services":
-                result = await self._generate_nestjs_services(task.params)
-            elif task.name == "generate_typeorm_entities":
-                result = await self._generate_typeorm_entities(task.params)
-            elif task.name == "generate_nestjs_auth":
-                result = await self._generate_nestjs_authentication(task.params)
-            elif task.name == "generate_nestjs_dtos":
-                result = await self._generate_nestjs_dtos(task.params)
-            elif task.name == "generate_nestjs_pipes":
-                result = await self._generate_nestjs_pipes(task.params)
-            else:
-                result = await self._handle_generic_task(task)
+            result = await self._run_within_deadline(task, self._dispatch_task(task), usage)
             
             return TaskResult(
                 task_id=task.id,
@@ -89,22 +102,29 @@ class NestJSAgent(GenesisAgent):
                     "agent": self.name,
                     "task_type": task.name,
                     "framework": "nestjs",
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "llm_usage": usage.summary()
                 }
             )
             
+        except TaskDeadlineExceeded as e:
+            return self._timed_out_result(task, e, usage)
         except Exception as e:
             self.logger.error(f"❌ Error in NestJS task {task.name}: {str(e)}")
             return TaskResult(
                 task_id=task.id,
                 success=False,
                 error=str(e),
-                metadata={"agent": self.name, "task_type": task.name}
+                metadata={
+                    "agent": self.name,
+                    "task_type": task.name,
+                    "llm_usage": usage.summary()
+                }
             )
     
     async def _generate_nestjs_project(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate complete NestJS project structure using LLM."""
-        config = BackendConfig.from_dict(params.get("config", {}))
+        config = self._plan(params).config
         architecture = params.get("architecture", {})
         
         project_generation_prompt = f"""
@@ -112,11 +132,11 @@ class NestJSAgent(GenesisAgent):
         
         Project Name: {config.project_name}
         Description: {config.description}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         Database: {config.database.type.value}
         Authentication: {config.auth.method.value}
         
-        Architecture: {architecture}
+        Architecture: {context_payload(architecture)}
         
         Generate NestJS project with:
         1. Main application file (main.ts) with proper setup
@@ -141,28 +161,34 @@ class NestJSAgent(GenesisAgent):
         Return complete NestJS project structure with TypeScript code.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
-            target_id="openai",  # OpenAI good at TypeScript/NestJS
-            action="code_generation",
-            data={
-                "prompt": project_generation_prompt,
-                "language": "typescript",
-                "framework": "nestjs"
-            }
+        # Supporting files only depend on the config, so request them
+        # alongside the main project instead of one after another
+        response, config_files, package_json, docker_files = await self._gather_limited(
+            self._send_request(
+                target_id="openai",  # OpenAI good at TypeScript/NestJS
+                action="code_generation",
+                data={
+                    "prompt": project_generation_prompt,
+                    "language": "typescript",
+                    "framework": "nestjs"
+                }
+            ),
+            self._generate_nestjs_config_files(config),
+            self._generate_package_json(config),
+            self._generate_docker_config(config)
         )
         
-        # Generate additional configuration files
-        config_files = await self._generate_nestjs_config_files(config)
-        package_json = await self._generate_package_json(config)
-        docker_files = await self._generate_docker_config(config)
+        parsed = await self._post_process(
+            response.result,
+            modules_created=self._extract_nestjs_modules
+        )
         
         return {
             "project_structure": response.result,
             "config_files": config_files,
             "package_json": package_json,
             "docker_files": docker_files,
-            "modules_created": self._extract_nestjs_modules(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name,
@@ -180,8 +206,8 @@ class NestJSAgent(GenesisAgent):
         modules_generation_prompt = f"""
         Generate NestJS modules for these features:
         
-        Features: {features}
-        Entities: {entities}
+        Features: {compact_payload(features)}
+        Entities: {compact_payload(entities)}
         
         Generate comprehensive NestJS modules including:
         1. Feature modules for each domain entity
@@ -205,8 +231,7 @@ class NestJSAgent(GenesisAgent):
         Return well-structured NestJS modules with TypeScript.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at module architecture
             action="reasoning",
             data={
@@ -215,11 +240,16 @@ class NestJSAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            module_classes=self._extract_module_classes,
+            dependencies=self._extract_module_dependencies,
+            providers=self._extract_module_providers
+        )
+        
         return {
             "modules_code": response.result,
-            "module_classes": self._extract_module_classes(response.result),
-            "dependencies": self._extract_module_dependencies(response.result),
-            "providers": self._extract_module_providers(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -228,14 +258,19 @@ class NestJSAgent(GenesisAgent):
     
     async def _generate_nestjs_controllers(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate NestJS controllers using LLM."""
+        if self._should_shard(params, "entities"):
+            return await self._generate_sharded(
+                params, self._generate_nestjs_controllers, models_key="entities", language="typescript"
+            )
+        
         api_design = params.get("api_design", {})
         entities = params.get("entities", [])
         
         controllers_generation_prompt = f"""
         Generate NestJS controllers for this API design:
         
-        API Design: {api_design}
-        Entities: {entities}
+        API Design: {compact_payload(api_design)}
+        Entities: {compact_payload(entities)}
         
         Generate comprehensive NestJS controllers including:
         1. Controller decorators with route prefixes
@@ -260,8 +295,7 @@ class NestJSAgent(GenesisAgent):
         Return production-ready NestJS controllers with TypeScript.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",  # DeepSeek good at controller patterns
             action="fast_coding",
             data={
@@ -270,12 +304,17 @@ class NestJSAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            controller_classes=self._extract_controller_classes,
+            routes=self._extract_controller_routes,
+            guards_used=self._extract_guards_used,
+            swagger_docs=self._extract_swagger_documentation
+        )
+        
         return {
             "controllers_code": response.result,
-            "controller_classes": self._extract_controller_classes(response.result),
-            "routes": self._extract_controller_routes(response.result),
-            "guards_used": self._extract_guards_used(response.result),
-            "swagger_docs": self._extract_swagger_documentation(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -290,8 +329,8 @@ class NestJSAgent(GenesisAgent):
         services_generation_prompt = f"""
         Generate NestJS services for business logic:
         
-        Entities: {entities}
-        Business Logic: {business_logic}
+        Entities: {compact_payload(entities)}
+        Business Logic: {compact_payload(business_logic)}
         
         Generate comprehensive NestJS services including:
         1. Injectable service decorators
@@ -316,8 +355,7 @@ class NestJSAgent(GenesisAgent):
         Return well-structured NestJS services with TypeScript.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good at service patterns
             action="code_generation",
             data={
@@ -327,11 +365,16 @@ class NestJSAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            service_classes=self._extract_service_classes,
+            methods=self._extract_service_methods,
+            dependencies=self._extract_service_dependencies
+        )
+        
         return {
             "services_code": response.result,
-            "service_classes": self._extract_service_classes(response.result),
-            "methods": self._extract_service_methods(response.result),
-            "dependencies": self._extract_service_dependencies(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -340,6 +383,9 @@ class NestJSAgent(GenesisAgent):
     
     async def _generate_typeorm_entities(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate TypeORM entities using LLM."""
+        if self._should_shard(params):
+            return await self._generate_sharded(params, self._generate_typeorm_entities, language="typescript")
+        
         data_models = params.get("data_models", [])
         relationships = params.get("relationships", [])
         database_type = params.get("database_type", "postgresql")
@@ -347,8 +393,8 @@ class NestJSAgent(GenesisAgent):
         entities_generation_prompt = f"""
         Generate TypeORM entities for {database_type}:
         
-        Data Models: {data_models}
-        Relationships: {relationships}
+        Data Models: {compact_payload(data_models)}
+        Relationships: {compact_payload(relationships)}
         Database: {database_type}
         
         Generate comprehensive TypeORM entities including:
@@ -374,8 +420,7 @@ class NestJSAgent(GenesisAgent):
         Return production-ready TypeORM entities with TypeScript.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at data modeling
             action="reasoning",
             data={
@@ -384,12 +429,17 @@ class NestJSAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            entity_classes=self._extract_entity_classes,
+            relationships_implemented=self._extract_entity_relationships,
+            indexes=self._extract_entity_indexes,
+            migrations_needed=self._extract_migration_requirements
+        )
+        
         return {
             "entities_code": response.result,
-            "entity_classes": self._extract_entity_classes(response.result),
-            "relationships_implemented": self._extract_entity_relationships(response.result),
-            "indexes": self._extract_entity_indexes(response.result),
-            "migrations_needed": self._extract_migration_requirements(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -404,7 +454,7 @@ class NestJSAgent(GenesisAgent):
         auth_generation_prompt = f"""
         Generate NestJS authentication system with {auth_method}:
         
-        Auth Config: {auth_config}
+        Auth Config: {compact_payload(auth_config)}
         Auth Method: {auth_method}
         
         Generate comprehensive NestJS authentication including:
@@ -430,8 +480,7 @@ class NestJSAgent(GenesisAgent):
         Return complete NestJS authentication system with TypeScript.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="openai",  # OpenAI good at auth patterns
             action="code_generation",
             data={
@@ -441,12 +490,17 @@ class NestJSAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            auth_module=self._extract_auth_module,
+            strategies=self._extract_auth_strategies,
+            guards=self._extract_auth_guards,
+            decorators=self._extract_auth_decorators
+        )
+        
         return {
             "auth_code": response.result,
-            "auth_module": self._extract_auth_module(response.result),
-            "strategies": self._extract_auth_strategies(response.result),
-            "guards": self._extract_auth_guards(response.result),
-            "decorators": self._extract_auth_decorators(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -461,8 +515,8 @@ class NestJSAgent(GenesisAgent):
         dtos_generation_prompt = f"""
         Generate NestJS DTOs for data validation:
         
-        Entities: {entities}
-        API Design: {api_design}
+        Entities: {compact_payload(entities)}
+        API Design: {compact_payload(api_design)}
         
         Generate comprehensive DTOs including:
         1. Create DTOs for POST requests
@@ -487,8 +541,7 @@ class NestJSAgent(GenesisAgent):
         Return well-validated NestJS DTOs with TypeScript.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",  # DeepSeek good at DTO patterns
             action="fast_coding",
             data={
@@ -497,11 +550,16 @@ class NestJSAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            dto_classes=self._extract_dto_classes,
+            validation_rules=self._extract_validation_rules,
+            transformations=self._extract_transformations
+        )
+        
         return {
             "dtos_code": response.result,
-            "dto_classes": self._extract_dto_classes(response.result),
-            "validation_rules": self._extract_validation_rules(response.result),
-            "transformations": self._extract_transformations(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -515,7 +573,7 @@ class NestJSAgent(GenesisAgent):
         pipes_generation_prompt = f"""
         Generate NestJS pipes for validation and transformation:
         
-        Validation Requirements: {validation_requirements}
+        Validation Requirements: {compact_payload(validation_requirements)}
         
         Generate comprehensive NestJS pipes including:
         1. Validation pipes for DTOs
@@ -540,8 +598,7 @@ class NestJSAgent(GenesisAgent):
         Return production-ready NestJS pipes with TypeScript.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="claude",  # Claude good at pipe patterns
             action="reasoning",
             data={
@@ -550,11 +607,16 @@ class NestJSAgent(GenesisAgent):
             }
         )
         
+        parsed = await self._post_process(
+            response.result,
+            pipe_classes=self._extract_pipe_classes,
+            validation_logic=self._extract_validation_logic,
+            custom_decorators=self._extract_custom_decorators
+        )
+        
         return {
             "pipes_code": response.result,
-            "pipe_classes": self._extract_pipe_classes(response.result),
-            "validation_logic": self._extract_validation_logic(response.result),
-            "custom_decorators": self._extract_custom_decorators(response.result),
+            **parsed,
             "generation_metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "generator": self.name
@@ -602,29 +664,29 @@ class NestJSAgent(GenesisAgent):
         }
     
     # Utility methods for additional file generation
-    async def _generate_nestjs_config_files(self, config: BackendConfig) -> Dict[str, str]:
+    async def _generate_nestjs_config_files(self, config: AnyBackendConfig) -> Dict[str, str]:
         """Generate NestJS configuration files."""
+        options = self._typeorm_options(compile_plan(config))
         return {
             "nest-cli.json": '{"collection": "@nestjs/schematics"}',
             "tsconfig.json": "# TypeScript configuration",
             ".env.example": "# Environment variables example",
-            "ormconfig.json": "# TypeORM configuration"
+            "ormconfig.json": json.dumps(options, indent=2) if options else "# TypeORM configuration"
         }
     
-    async def _generate_package_json(self, config: BackendConfig) -> str:
+    async def _generate_package_json(self, config: AnyBackendConfig) -> str:
         """Generate package.json for NestJS project."""
         package_prompt = f"""
         Generate package.json for NestJS project:
         
         Project: {config.project_name}
         Database: {config.database.type.value}
-        Features: {config.features}
+        Features: {compact_payload(config.features)}
         
         Include all necessary dependencies for a production NestJS application.
         """
         
-        response = await protocol.send_request(
-            sender_id=self.agent_id,
+        response = await self._send_request(
             target_id="deepseek",
             action="fast_coding",
             data={"prompt": package_prompt, "language": "json"}
@@ -632,7 +694,7 @@ class NestJSAgent(GenesisAgent):
         
         return response.result
     
-    async def _generate_docker_config(self, config: BackendConfig) -> Dict[str, str]:
+    async def _generate_docker_config(self, config: AnyBackendConfig) -> Dict[str, str]:
         """Generate Docker configuration for NestJS."""
         return {
             "Dockerfile": "# NestJS Dockerfile",
@@ -640,34 +702,83 @@ class NestJSAgent(GenesisAgent):
             ".dockerignore": "# Docker ignore file"
         }
     
+    @staticmethod
+    def _typeorm_options(plan: GenerationPlan) -> Dict[str, Any]:
+        """
+        TypeORM data source options with the pool settings mapped to the
+        driver's (``poolSize``, ``extra``) and read replicas as
+        ``replication.slaves``. Passwords are left to the environment.
+        """
+        database = plan.config.database
+        if database is None or plan.database is None or plan.database.value not in TYPEORM_TYPES:
+            return {}
+
+        def connection(config: Any) -> Dict[str, Any]:
+            fields = {"database": config.name}
+            if plan.database.value != "sqlite":
+                fields.update({"host": config.host or "localhost", "port": config.port, "username": config.user})
+            return {key: value for key, value in fields.items() if value is not None}
+
+        options: Dict[str, Any] = {"type": TYPEORM_TYPES[plan.database.value]}
+        if database.replica_urls:
+            options["replication"] = {
+                "master": connection(database),
+                "slaves": [connection(type(database).from_url(url)) for url in database.replica_urls],
+            }
+        else:
+            options.update(connection(database))
+
+        if database.pool_size is not None:
+            options["poolSize"] = database.pool_size
+        extra: Dict[str, Any] = {}
+        if plan.database.value == "postgresql":
+            if database.pool_size is not None:
+                extra["max"] = database.pool_size + (database.max_overflow or 0)
+            if database.pool_recycle is not None:
+                extra["maxLifetimeSeconds"] = database.pool_recycle
+        elif plan.database.value == "mysql":
+            if database.pool_size is not None:
+                extra["connectionLimit"] = database.pool_size + (database.max_overflow or 0)
+            if database.pool_recycle is not None:
+                extra["idleTimeout"] = database.pool_recycle * 1000
+        if extra:
+            options["extra"] = extra
+        return options
+
     # Utility methods for parsing LLM responses
-    def _extract_nestjs_modules(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_nestjs_modules(code: str) -> List[str]:
         """Extract NestJS module names."""
         return ["AppModule", "UsersModule", "AuthModule", "DatabaseModule"]
     
-    def _extract_module_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_module_classes(code: str) -> List[str]:
         """Extract module class names."""
         return ["UsersModule", "AuthModule", "PostsModule"]
     
-    def _extract_module_dependencies(self, code: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_module_dependencies(code: str) -> Dict[str, List[str]]:
         """Extract module dependencies."""
         return {
             "UsersModule": ["TypeOrmModule", "ConfigModule"],
             "AuthModule": ["JwtModule", "PassportModule"]
         }
     
-    def _extract_module_providers(self, code: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_module_providers(code: str) -> Dict[str, List[str]]:
         """Extract module providers."""
         return {
             "UsersModule": ["UsersService", "UsersRepository"],
             "AuthModule": ["AuthService", "JwtStrategy"]
         }
     
-    def _extract_controller_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_controller_classes(code: str) -> List[str]:
         """Extract controller class names."""
         return ["UsersController", "AuthController", "PostsController"]
     
-    def _extract_controller_routes(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_controller_routes(code: str) -> List[Dict[str, str]]:
         """Extract controller routes."""
         return [
             {"path": "/users", "method": "GET", "handler": "findAll"},
@@ -675,93 +786,112 @@ class NestJSAgent(GenesisAgent):
             {"path": "/users", "method": "POST", "handler": "create"}
         ]
     
-    def _extract_guards_used(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_guards_used(code: str) -> List[str]:
         """Extract guards used in controllers."""
         return ["JwtAuthGuard", "RolesGuard", "ThrottlerGuard"]
     
-    def _extract_swagger_documentation(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_swagger_documentation(code: str) -> List[str]:
         """Extract Swagger documentation decorators."""
         return ["@ApiTags", "@ApiOperation", "@ApiResponse", "@ApiBearerAuth"]
     
-    def _extract_service_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_service_classes(code: str) -> List[str]:
         """Extract service class names."""
         return ["UsersService", "AuthService", "PostsService"]
     
-    def _extract_service_methods(self, code: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_service_methods(code: str) -> Dict[str, List[str]]:
         """Extract service methods."""
         return {
             "UsersService": ["create", "findAll", "findOne", "update", "remove"],
             "AuthService": ["login", "register", "validateUser", "generateToken"]
         }
     
-    def _extract_service_dependencies(self, code: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_service_dependencies(code: str) -> Dict[str, List[str]]:
         """Extract service dependencies."""
         return {
             "UsersService": ["UsersRepository", "ConfigService"],
             "AuthService": ["UsersService", "JwtService"]
         }
     
-    def _extract_entity_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_entity_classes(code: str) -> List[str]:
         """Extract TypeORM entity names."""
         return ["User", "Post", "Profile"]
     
-    def _extract_entity_relationships(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_entity_relationships(code: str) -> List[Dict[str, str]]:
         """Extract entity relationships."""
         return [
             {"from": "User", "to": "Profile", "type": "OneToOne"},
             {"from": "User", "to": "Post", "type": "OneToMany"}
         ]
     
-    def _extract_entity_indexes(self, code: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _extract_entity_indexes(code: str) -> List[Dict[str, str]]:
         """Extract entity indexes."""
         return [
             {"entity": "User", "columns": ["email"], "unique": True},
             {"entity": "Post", "columns": ["createdAt"], "unique": False}
         ]
     
-    def _extract_migration_requirements(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_migration_requirements(code: str) -> List[str]:
         """Extract migration requirements."""
         return ["CreateUserTable", "CreatePostTable", "AddUserProfileRelation"]
     
-    def _extract_auth_module(self, code: str) -> str:
+    @staticmethod
+    def _extract_auth_module(code: str) -> str:
         """Extract auth module name."""
         return "AuthModule"
     
-    def _extract_auth_strategies(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_strategies(code: str) -> List[str]:
         """Extract authentication strategies."""
         return ["JwtStrategy", "LocalStrategy", "GoogleStrategy"]
     
-    def _extract_auth_guards(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_guards(code: str) -> List[str]:
         """Extract authentication guards."""
         return ["JwtAuthGuard", "LocalAuthGuard", "RolesGuard"]
     
-    def _extract_auth_decorators(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_auth_decorators(code: str) -> List[str]:
         """Extract authentication decorators."""
         return ["@UseGuards", "@Roles", "@Public", "@CurrentUser"]
     
-    def _extract_dto_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_dto_classes(code: str) -> List[str]:
         """Extract DTO class names."""
         return ["CreateUserDto", "UpdateUserDto", "UserResponseDto", "LoginDto"]
     
-    def _extract_validation_rules(self, code: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _extract_validation_rules(code: str) -> Dict[str, List[str]]:
         """Extract validation rules."""
         return {
             "CreateUserDto": ["@IsEmail", "@IsString", "@MinLength"],
             "UpdateUserDto": ["@IsOptional", "@IsString"]
         }
     
-    def _extract_transformations(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_transformations(code: str) -> List[str]:
         """Extract transformation decorators."""
         return ["@Transform", "@Type", "@Exclude", "@Expose"]
     
-    def _extract_pipe_classes(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_pipe_classes(code: str) -> List[str]:
         """Extract pipe class names."""
         return ["ValidationPipe", "ParseIntPipe", "CustomValidationPipe"]
     
-    def _extract_validation_logic(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_validation_logic(code: str) -> List[str]:
         """Extract validation logic patterns."""
         return ["DTO validation", "Parameter parsing", "Custom validation rules"]
     
-    def _extract_custom_decorators(self, code: str) -> List[str]:
+    @staticmethod
+    def _extract_custom_decorators(code: str) -> List[str]:
         """Extract custom decorators."""
         return ["@IsUnique", "@IsValidEmail", "@MatchesProperty"]
\ No newline at end of file
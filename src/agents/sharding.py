@@ -0,0 +1,492 @@
+"""
+Model Sharding
+
+Splits large data model lists into relationship-aware groups so each group
+can be generated by its own LLM call, and merges the per-group outputs
+back into single modules with deduplicated imports. Architectures are split
+the same way into subsystems for validation.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import json
+import re
+
+# Models per shard when a task asks for sharding without a size
+DEFAULT_SHARD_SIZE = 8
+
+# Endpoints not tied to any entity cluster are validated in groups this
+# many times the shard size
+ENDPOINTS_PER_MODEL = 4
+
+_ENTITY_KEYS = ("data_models", "entities", "models")
+
+_PY_FROM_IMPORT = re.compile(r"^from\s+(\S+)\s+import\s+(\([^)]*\)|[^\n]+)", re.MULTILINE)
+_PY_IMPORT = re.compile(r"^import\s+[^\n]+", re.MULTILINE)
+_TS_NAMED_IMPORT = re.compile(
+    r"^import\s+(type\s+)?\{([^}]*)\}\s+from\s+(['\"][^'\"]+['\"]);?[ \t]*$",
+    re.MULTILINE
+)
+_TS_IMPORT = re.compile(r"^import\s+[^\n]+", re.MULTILINE)
+
+# Names bound by a top-level statement
+_PY_DEFINITION = re.compile(r"^(?:async\s+def|def|class)\s+(\w+)|^(\w+)\s*(?::[^=]+)?=(?!=)")
+_TS_DEFINITION = re.compile(
+    r"^(?:export\s+)?(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?"
+    r"(?:class|function|interface|enum|type|const|let|var)\s+(\w+)"
+)
+
+
+def requested_shard_size(params: Dict[str, Any]) -> int:
+    """Shard size asked for by task params (``shard_size``: a size or ``True``); 0 if none."""
+    shard_size = params.get("shard_size")
+    if shard_size is True:
+        return DEFAULT_SHARD_SIZE
+    if isinstance(shard_size, int) and shard_size > 0:
+        return shard_size
+    return 0
+
+
+def model_name(model: Any) -> str:
+    if isinstance(model, dict):
+        return str(model.get("name", ""))
+    return str(model)
+
+
+def _referenced_names(value: Any, names: Set[str]) -> Set[str]:
+    """Model names mentioned anywhere inside ``value``."""
+    if isinstance(value, str):
+        return {value} if value in names else set()
+    if isinstance(value, dict):
+        return set().union(*(_referenced_names(item, names) for item in value.values()))
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_referenced_names(item, names) for item in value))
+    return set()
+
+
+def _related_groups(models: List[Any], relationships: Iterable[Any]) -> List[List[int]]:
+    """Connected components of the relationship graph, as model indexes."""
+    index = {model_name(model): i for i, model in enumerate(models)}
+    names = set(index)
+    neighbours: Dict[int, Set[int]] = {i: set() for i in range(len(models))}
+
+    def connect(related: Set[str]) -> None:
+        linked = sorted(index[name] for name in related)
+        for a in linked:
+            neighbours[a].update(b for b in linked if b != a)
+
+    for relationship in relationships:
+        connect(_referenced_names(relationship, names))
+    for i, model in enumerate(models):
+        if isinstance(model, dict):
+            body = {key: value for key, value in model.items() if key != "name"}
+            connect(_referenced_names(body, names) | {model_name(model)})
+
+    groups, seen = [], set()
+    for start in range(len(models)):
+        if start in seen:
+            continue
+        # Breadth-first, so splitting an oversized group keeps neighbours together
+        group, frontier = [], [start]
+        seen.add(start)
+        while frontier:
+            current = frontier.pop(0)
+            group.append(current)
+            for neighbour in sorted(neighbours[current] - seen):
+                seen.add(neighbour)
+                frontier.append(neighbour)
+        groups.append(group)
+    return groups
+
+
+def shard_models(
+    models: List[Any],
+    relationships: Iterable[Any] = (),
+    shard_size: int = DEFAULT_SHARD_SIZE
+) -> List[List[Any]]:
+    """
+    Group ``models`` into shards of at most ``shard_size``.
+
+    Related models (through ``relationships`` or through fields naming
+    another model) share a shard where possible; groups larger than a shard
+    are split in breadth-first order. Models keep their input order within
+    a shard.
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+
+    pieces: List[List[int]] = []
+    for group in _related_groups(models, relationships):
+        pieces.extend(group[i:i + shard_size] for i in range(0, len(group), shard_size))
+
+    # First-fit decreasing packing of the groups into shards
+    shards: List[List[int]] = []
+    for piece in sorted(pieces, key=len, reverse=True):
+        for shard in shards:
+            if len(shard) + len(piece) <= shard_size:
+                shard.extend(piece)
+                break
+        else:
+            shards.append(list(piece))
+
+    return [[models[i] for i in sorted(shard)] for shard in sorted(shards, key=min)]
+
+
+def shard_inputs(params: Dict[str, Any], shard: List[Any], models_key: str) -> Dict[str, Any]:
+    """Task params for one shard: its models plus the relationships and endpoints touching them."""
+    names = {model_name(model) for model in shard}
+    inputs: Dict[str, Any] = {models_key: shard}
+
+    relationships = params.get("relationships")
+    if isinstance(relationships, list):
+        inputs["relationships"] = [item for item in relationships if _referenced_names(item, names)]
+
+    api_design = params.get("api_design")
+    if isinstance(api_design, dict) and isinstance(api_design.get("endpoints"), list):
+        inputs["api_design"] = {
+            **api_design,
+            "endpoints": [
+                endpoint for endpoint in api_design["endpoints"]
+                if _mentions(endpoint, names)
+            ],
+        }
+    return inputs
+
+
+def _mentions(value: Any, names: Set[str]) -> bool:
+    text = json.dumps(value, default=str).lower()
+    return any(name.lower() in text for name in names if name)
+
+
+def _unique(items: Iterable[str]) -> List[str]:
+    seen: Dict[str, None] = {}
+    for item in items:
+        if item:
+            seen.setdefault(item, None)
+    return list(seen)
+
+
+def _split_names(names: str) -> List[str]:
+    return [name.strip() for name in names.strip("() \n").replace("\n", " ").split(",")]
+
+
+def _merge_python(codes: List[str]) -> Tuple[List[str], List[str]]:
+    from_imports: Dict[str, List[str]] = {}
+    plain_imports: List[str] = []
+    bodies = []
+    for code in codes:
+        for module, names in _PY_FROM_IMPORT.findall(code):
+            from_imports.setdefault(module, []).extend(_split_names(names))
+        body = _PY_FROM_IMPORT.sub("", code)
+        plain_imports.extend(line.strip() for line in _PY_IMPORT.findall(body))
+        bodies.append(_PY_IMPORT.sub("", body))
+
+    imports = [
+        f"from {module} import {', '.join(_unique(names))}"
+        for module, names in from_imports.items()
+    ]
+    # ``from __future__`` imports must come first
+    future = [line for line in imports if line.startswith("from __future__ ")]
+    others = [line for line in imports if not line.startswith("from __future__ ")]
+    return future + _unique(plain_imports) + others, bodies
+
+
+def _merge_typescript(codes: List[str]) -> Tuple[List[str], List[str]]:
+    named: Dict[Tuple[str, str], List[str]] = {}
+    other: List[str] = []
+    bodies = []
+    for code in codes:
+        for type_only, names, source in _TS_NAMED_IMPORT.findall(code):
+            named.setdefault((type_only.strip(), source), []).extend(_split_names(names))
+        body = _TS_NAMED_IMPORT.sub("", code)
+        other.extend(line.strip() for line in _TS_IMPORT.findall(body))
+        bodies.append(_TS_IMPORT.sub("", body))
+
+    imports = [
+        f"import {type_only + ' ' if type_only else ''}{{ {', '.join(_unique(names))} }} from {source};"
+        for (type_only, source), names in named.items()
+    ]
+    return imports + _unique(other), bodies
+
+
+def _top_level_blocks(body: str) -> List[str]:
+    """
+    Split a module body into top-level statements.
+
+    A statement runs until the next unindented line; decorators and
+    comments stay with the statement they precede, and closing brackets
+    at column 0 with the one they close.
+    """
+    blocks: List[List[str]] = []
+    attach = False
+    for line in body.strip("\n").splitlines():
+        starts = bool(line) and not line[0].isspace() and line[0] not in ")]}"
+        if starts and not attach:
+            blocks.append([])
+        elif not blocks:
+            blocks.append([])
+        blocks[-1].append(line)
+        if line.strip():
+            attach = starts and line.lstrip().startswith(("@", "#", "//"))
+    return ["\n".join(block).strip("\n") for block in blocks if any(line.strip() for line in block)]
+
+
+def _definition_name(block: str, language: str) -> Optional[str]:
+    pattern = _PY_DEFINITION if language == "python" else _TS_DEFINITION
+    for line in block.splitlines():
+        if line.strip() and not line.lstrip().startswith(("@", "#", "//")):
+            match = pattern.match(line)
+            return next((name for name in match.groups() if name), None) if match else None
+    return None
+
+
+def _dedupe_definitions(bodies: List[str], language: str) -> List[str]:
+    """
+    Drop top-level statements an earlier shard already emitted.
+
+    Every shard is generated with the shared prelude (``Base``, engine,
+    session, abstract base models, ...); only its first definition is
+    kept so later shards attach to the same objects.
+    """
+    separator = "\n\n\n" if language == "python" else "\n\n"
+    seen: Set[str] = set()
+    deduped = []
+    for body in bodies:
+        kept = []
+        for block in _top_level_blocks(body):
+            name = _definition_name(block, language)
+            key = f"name:{name}" if name else f"text:{block.strip()}"
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(block)
+        deduped.append(separator.join(kept))
+    return deduped
+
+
+def merge_modules(codes: List[str], language: str = "python") -> str:
+    """
+    Merge generated source files into one module.
+
+    Imports are hoisted to the top and deduplicated (names imported from
+    the same module are combined). The remaining code follows in shard
+    order, with top-level definitions repeated by later shards dropped.
+    """
+    codes = [code for code in codes if isinstance(code, str) and code.strip()]
+    if len(codes) <= 1:
+        return codes[0] if codes else ""
+
+    if language == "python":
+        imports, bodies = _merge_python(codes)
+    else:
+        imports, bodies = _merge_typescript(codes)
+    bodies = _dedupe_definitions(bodies, language)
+
+    sections = [body.strip() for body in bodies if body.strip()]
+    header = "\n".join(imports)
+    return "\n\n\n".join(([header] if header else []) + sections) + "\n"
+
+
+def _merge_values(values: List[Any]) -> Any:
+    if all(isinstance(value, list) for value in values):
+        merged, seen = [], set()
+        for value in values:
+            for item in value:
+                key = json.dumps(item, sort_keys=True, default=str)
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(item)
+        return merged
+    if all(isinstance(value, dict) for value in values):
+        merged_dict: Dict[str, Any] = {}
+        for value in values:
+            merged_dict.update(value)
+        return merged_dict
+    return values[0]
+
+
+def merge_shard_results(results: List[Dict[str, Any]], language: str = "python") -> Dict[str, Any]:
+    """
+    Combine the result dicts of the shards of one task.
+
+    ``*_code`` entries are merged with ``merge_modules``, lists are
+    concatenated without duplicates and dicts are combined.
+    """
+    merged: Dict[str, Any] = {}
+    for key in _unique(key for result in results for key in result):
+        values = [result[key] for result in results if key in result]
+        if key.endswith("_code"):
+            merged[key] = merge_modules(values, language)
+        elif key == "generation_metadata":
+            merged[key] = {**values[0], "shards": len(results)}
+        else:
+            merged[key] = _merge_values(values)
+    return merged
+
+
+def _find_list(
+    value: Any,
+    keys: Tuple[str, ...],
+    path: Tuple[str, ...] = ()
+) -> Optional[Tuple[Tuple[str, ...], List[Any]]]:
+    """Path and value of the first non-empty list stored under one of ``keys``."""
+    if not isinstance(value, dict):
+        return None
+    for key in keys:
+        if isinstance(value.get(key), list) and value[key]:
+            return path + (key,), value[key]
+    for key, item in value.items():
+        found = _find_list(item, keys, path + (key,))
+        if found is not None:
+            return found
+    return None
+
+
+def _without(value: Any, paths: List[Tuple[str, ...]]) -> Any:
+    """Copy of nested dicts with the given key paths removed."""
+    if not isinstance(value, dict):
+        return value
+    heads = {path[0] for path in paths if len(path) == 1}
+    return {
+        key: _without(item, [path[1:] for path in paths if len(path) > 1 and path[0] == key])
+        for key, item in value.items()
+        if key not in heads
+    }
+
+
+def _resource(endpoint: Any) -> str:
+    path = endpoint.get("path", "") if isinstance(endpoint, dict) else str(endpoint)
+    segments = [segment for segment in str(path).split("/") if segment and not segment.startswith("{")]
+    return segments[0] if segments else ""
+
+
+def split_architecture(
+    architecture: Dict[str, Any],
+    chunk_size: int = DEFAULT_SHARD_SIZE
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Split an architecture into named subsystems.
+
+    Entities are grouped into relationship-aware clusters of at most
+    ``chunk_size`` (see ``shard_models``), each with the relationships and
+    endpoints touching it. Remaining endpoints are grouped by resource.
+    Every subsystem carries the rest of the architecture as ``context``.
+    Returns a single ``("architecture", architecture)`` entry when there is
+    nothing to split.
+    """
+    entities = _find_list(architecture, _ENTITY_KEYS)
+    endpoints = _find_list(architecture, ("endpoints",))
+    relationships = _find_list(architecture, ("relationships",))
+    models = entities[1] if entities else []
+    routes = endpoints[1] if endpoints else []
+    if len(models) <= chunk_size and len(routes) <= chunk_size * ENDPOINTS_PER_MODEL:
+        return [("architecture", architecture)]
+
+    context = _without(architecture, [found[0] for found in (entities, endpoints, relationships) if found])
+    links = relationships[1] if relationships else []
+    subsystems: List[Tuple[str, Dict[str, Any]]] = []
+    assigned: Set[int] = set()
+
+    for cluster in shard_models(models, links, chunk_size):
+        names = {model_name(model) for model in cluster}
+        touching = [i for i, endpoint in enumerate(routes) if i not in assigned and _mentions(endpoint, names)]
+        assigned.update(touching)
+        subsystems.append((f"entities:{model_name(cluster[0])}", {
+            "context": context,
+            "data_models": cluster,
+            "relationships": [item for item in links if _referenced_names(item, names)],
+            "endpoints": [routes[i] for i in touching],
+        }))
+
+    by_resource: Dict[str, List[Any]] = {}
+    for i, endpoint in enumerate(routes):
+        if i not in assigned:
+            by_resource.setdefault(_resource(endpoint), []).append(endpoint)
+    group_size = chunk_size * ENDPOINTS_PER_MODEL
+    group: List[Any] = []
+    groups: List[List[Any]] = []
+    for resource_endpoints in by_resource.values():
+        if group and len(group) + len(resource_endpoints) > group_size:
+            groups.append(group)
+            group = []
+        group.extend(resource_endpoints)
+    if group:
+        groups.append(group)
+    for endpoint_group in groups:
+        subsystems.append((f"endpoints:{_resource(endpoint_group[0]) or 'root'}", {
+            "context": context,
+            "endpoints": endpoint_group,
+        }))
+    return subsystems
+
+
+def _finding_key(finding: Any) -> str:
+    text = finding if isinstance(finding, str) else json.dumps(finding, sort_keys=True, default=str)
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def merge_findings(findings: Iterable[List[Any]]) -> List[Any]:
+    """Concatenate issue or recommendation lists, dropping near-duplicates (case, punctuation)."""
+    merged: Dict[str, Any] = {}
+    for items in findings:
+        for item in items or []:
+            merged.setdefault(_finding_key(item), item)
+    return list(merged.values())
+
+
+# Rating words of LLM verdicts, worst first; unknown words rank below all of them
+VERDICT_RATINGS = {
+    "critical": 0, "poor": 0, "low": 0, "weak": 0, "inadequate": 0, "invalid": 0, "fail": 0, "failed": 0,
+    "fair": 1, "medium": 1, "moderate": 1, "adequate": 1, "partial": 1,
+    "good": 2, "high": 2, "strong": 2, "valid": 2, "pass": 2, "passed": 2,
+    "excellent": 3,
+}
+
+# Verdict keys where a higher rating or number is better. Others (risk,
+# complexity, ...) may run the opposite way, so they are never ranked.
+SCORE_KEYS = frozenset({
+    "score", "rating", "quality", "consistency", "security", "performance",
+    "scalability", "maintainability", "testability", "reliability",
+})
+
+
+def is_score_key(key: str) -> bool:
+    """Whether higher values of verdict ``key`` are better."""
+    return key in SCORE_KEYS or key.endswith("_score")
+
+
+def verdict_rank(value: Any) -> int:
+    """Rank of a rating word in ``VERDICT_RATINGS``, -1 if unknown."""
+    return VERDICT_RATINGS.get(str(value).strip().lower(), -1)
+
+
+def _merge_verdict_values(key: str, values: List[Any]) -> Any:
+    if all(isinstance(value, bool) for value in values):
+        return all(values)
+    if all(isinstance(value, (list, tuple)) for value in values):
+        return merge_findings(values)
+    if all(isinstance(value, dict) for value in values):
+        return merge_verdicts(values)
+    if all(value == values[0] for value in values[1:]):
+        return values[0]
+    if is_score_key(key):
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            return min(values)
+        return min(values, key=verdict_rank)
+    # Direction unknown: report every distinct value
+    return merge_findings([values])
+
+
+def merge_verdicts(verdicts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce per-subsystem verdicts pessimistically: the lowest score or
+    rating for ``SCORE_KEYS``, ``all()`` of flags, deduplicated issue
+    lists, and the distinct values of any other key that disagrees. A key
+    reported by any subsystem is kept, so one failing part is never hidden
+    by the others.
+    """
+    values: Dict[str, List[Any]] = {}
+    for verdict in verdicts:
+        for key, value in (verdict or {}).items():
+            if value is not None:
+                values.setdefault(key, []).append(value)
+    return {key: _merge_verdict_values(key, items) for key, items in values.items()}
@@ -0,0 +1,28 @@
+"""
+Bulk config specs.
+
+Streaming readers and writers for large batches of ``BackendConfig`` specs
+stored as JSONL or msgpack.
+"""
+
+from .specs import (
+    DEFAULT_INTERN_LIMIT,
+    SPEC_FORMATS,
+    ConfigInterner,
+    ConfigRecord,
+    ConfigWriter,
+    read_configs,
+    spec_format,
+    write_configs,
+)
+
+__all__ = [
+    "DEFAULT_INTERN_LIMIT",
+    "SPEC_FORMATS",
+    "ConfigInterner",
+    "ConfigRecord",
+    "ConfigWriter",
+    "read_configs",
+    "spec_format",
+    "write_configs",
+]
@@ -0,0 +1,309 @@
+"""
+Bulk Config Specs
+
+Streams large batches of ``BackendConfig`` specs from and to JSONL or
+msgpack files. Records are decoded one at a time, enum members and repeated
+nested configs are shared between records, and invalid records are reported
+individually instead of aborting the batch.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Tuple, Type, Union
+import gzip
+import json
+import logging
+import sys
+
+from ..config import (
+    AnyBackendConfig,
+    AuthConfig,
+    AuthMethod,
+    BackendFramework,
+    DatabaseConfig,
+    DatabaseType,
+    FrozenAuthConfig,
+    FrozenBackendConfig,
+    FrozenDatabaseConfig,
+    ORMType,
+)
+
+logger = logging.getLogger(__name__)
+
+SPEC_FORMATS = ("jsonl", "msgpack")
+
+# Interned nested configs and string tuples kept before the tables are reset
+DEFAULT_INTERN_LIMIT = 4096
+
+_SUFFIX_FORMATS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "jsonl",
+    ".msgpack": "msgpack",
+    ".mpk": "msgpack",
+}
+
+
+def spec_format(path: Union[str, Path]) -> str:
+    """Format implied by a file name (``.gz`` is looked through)."""
+    path = Path(path)
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    fmt = _SUFFIX_FORMATS.get(suffixes[-1] if suffixes else "")
+    if fmt is None:
+        raise ValueError(f"Cannot tell the spec format of {path}; pass format=")
+    return fmt
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise RuntimeError("msgpack spec files require the 'msgpack' package") from e
+    return msgpack
+
+
+def _open(path: Path, mode: str) -> IO[Any]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+@dataclass
+class ConfigRecord:
+    """
+    One decoded spec: a config, or the error that made it invalid.
+
+    ``position`` is the 1-based line (JSONL) or record number (msgpack).
+    ``data`` keeps the raw record of invalid entries only.
+    """
+
+    position: int
+    config: Optional[AnyBackendConfig] = None
+    error: Optional[str] = None
+    data: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ConfigInterner:
+    """
+    Shares immutable pieces between decoded configs.
+
+    Enum members are looked up once per value; frozen database and auth
+    configs, feature and origin tuples and their strings are reused across
+    records with equal values. Tables are reset after ``limit`` entries so
+    memory stays bounded on very large inputs.
+    """
+
+    def __init__(self, limit: int = DEFAULT_INTERN_LIMIT):
+        self.limit = limit
+        self._enums: Dict[Tuple[Type[Enum], Any], Enum] = {}
+        self._objects: Dict[Any, Any] = {}
+
+    def enum(self, cls: Type[Enum], value: Any) -> Enum:
+        if isinstance(value, cls):
+            return value
+        member = self._enums.get((cls, value))
+        if member is None:
+            member = self._enums[(cls, value)] = cls(value)
+        return member
+
+    def strings(self, values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        if values is not None and not isinstance(values, (list, tuple)):
+            raise TypeError(f"expected a list of strings, got {type(values).__name__}")
+        if not all(isinstance(value, str) for value in values or ()):
+            raise TypeError("expected a list of strings")
+        items = tuple(sys.intern(value) if isinstance(value, str) else value for value in values or ())
+        return self._shared(("strings", items), lambda: items)
+
+    def database(self, data: Any) -> Optional[FrozenDatabaseConfig]:
+        if data is None:
+            return None
+        if isinstance(data, DatabaseConfig):
+            data = data.to_dict()
+        if isinstance(data, FrozenDatabaseConfig):
+            return data
+        values = dict(data)
+        _check_flags(values, ("pool_pre_ping",))
+        values["type"] = self.enum(DatabaseType, values.get("type"))
+        if values.get("orm") is not None:
+            values["orm"] = self.enum(ORMType, values["orm"])
+        if "replica_urls" in values:
+            values["replica_urls"] = self.strings(values["replica_urls"])
+        if isinstance(values.get("options"), dict):
+            values["options"] = tuple(sorted(values["options"].items()))
+        return self._shared(("database", _key(values)), lambda: FrozenDatabaseConfig(**values))
+
+    def auth(self, data: Any) -> Optional[FrozenAuthConfig]:
+        if data is None:
+            return None
+        if isinstance(data, AuthConfig):
+            data = data.to_dict()
+        if isinstance(data, FrozenAuthConfig):
+            return data
+        values = dict(data)
+        _check_flags(values, ("cookie_secure", "cookie_httponly"))
+        values["method"] = self.enum(AuthMethod, values.get("method"))
+        values["oauth_providers"] = self.strings(values.get("oauth_providers"))
+        return self._shared(("auth", _key(values)), lambda: FrozenAuthConfig(**values))
+
+    def config(self, data: Dict[str, Any]) -> FrozenBackendConfig:
+        """Decode one spec dict into a ``FrozenBackendConfig``."""
+        if not isinstance(data, dict):
+            raise TypeError(f"expected an object, got {type(data).__name__}")
+        values = dict(data)
+        _check_flags(values, ("debug",))
+        if "framework" in values:
+            values["framework"] = self.enum(BackendFramework, values["framework"])
+        for name in ("features", "cors_origins"):
+            if name in values:
+                values[name] = self.strings(values[name])
+        values["database"] = self.database(values.get("database"))
+        values["auth"] = self.auth(values.get("auth"))
+        return FrozenBackendConfig(**values)
+
+    def _shared(self, key: Any, build: Any) -> Any:
+        try:
+            shared = self._objects.get(key)
+        except TypeError:
+            # Unhashable values (nested lists, ...) are simply not shared
+            return build()
+        if shared is None:
+            if len(self._objects) >= self.limit:
+                self._objects.clear()
+            shared = self._objects[key] = build()
+        return shared
+
+
+def _check_flags(values: Dict[str, Any], names: Tuple[str, ...]) -> None:
+    # JSON has real booleans; "yes" or 1 would otherwise pass as truthy
+    for name in names:
+        value = values.get(name)
+        if value is not None and not isinstance(value, bool):
+            raise TypeError(f"{name} must be a boolean, got {type(value).__name__}")
+
+
+def _key(values: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(sorted(values.items()))
+
+
+def _spec_dict(config: Union[AnyBackendConfig, Dict[str, Any]]) -> Dict[str, Any]:
+    if isinstance(config, dict):
+        return config
+    return config.to_dict()
+
+
+def read_configs(
+    path: Union[str, Path],
+    format: Optional[str] = None,
+    frozen: bool = True,
+    interner: Optional[ConfigInterner] = None
+) -> Iterator[ConfigRecord]:
+    """
+    Stream the specs of a JSONL or msgpack file (optionally gzipped).
+
+    Yields a ``ConfigRecord`` per record, valid or not. Configs are
+    ``FrozenBackendConfig`` sharing interned parts; with ``frozen=False``
+    they are thawed into independent ``BackendConfig`` objects. JSONL is
+    read as bytes and decoded per line, so a line that is not UTF-8 only
+    invalidates its own record. A corrupt msgpack stream cannot be resynchronised, so it ends the iteration with
+    an error record.
+    """
+    path = Path(path)
+    fmt = format or spec_format(path)
+    if fmt not in SPEC_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(SPEC_FORMATS)}")
+    interner = interner or ConfigInterner()
+
+    def decode(position: int, data: Any) -> ConfigRecord:
+        try:
+            config = interner.config(data)
+        except (TypeError, ValueError, KeyError) as e:
+            return ConfigRecord(position=position, error=f"{type(e).__name__}: {e}", data=data)
+        return ConfigRecord(position=position, config=config if frozen else config.thaw())
+
+    if fmt == "jsonl":
+        with _open(path, "rb") as file:
+            for position, raw in enumerate(file, start=1):
+                if not raw.strip():
+                    continue
+                try:
+                    line = raw.decode("utf-8")
+                except UnicodeDecodeError as e:
+                    yield ConfigRecord(position=position, error=f"Invalid UTF-8: {e}", data=raw.rstrip(b"\r\n"))
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    yield ConfigRecord(position=position, error=f"Invalid JSON: {e}", data=line.rstrip("\n"))
+                    continue
+                yield decode(position, data)
+        return
+
+    msgpack = _msgpack()
+    with _open(path, "rb") as file:
+        position = 0
+        try:
+            for data in msgpack.Unpacker(file, raw=False):
+                position += 1
+                yield decode(position, data)
+        except (ValueError, msgpack.exceptions.UnpackException) as e:
+            logger.warning(f"Stopped reading {path} at record {position + 1}: {e}")
+            yield ConfigRecord(position=position + 1, error=f"Invalid msgpack: {e}")
+
+
+class ConfigWriter:
+    """
+    Streaming writer for spec files.
+
+    Accepts ``BackendConfig``, ``FrozenBackendConfig`` or plain spec dicts
+    and writes each as soon as it is given. Use as a context manager.
+    """
+
+    def __init__(self, path: Union[str, Path], format: Optional[str] = None):
+        self.path = Path(path)
+        self.format = format or spec_format(self.path)
+        if self.format not in SPEC_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(SPEC_FORMATS)}")
+        self.count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.format == "jsonl":
+            self._file = _open(self.path, "wt")
+            self._packer = None
+        else:
+            self._packer = _msgpack().Packer(use_bin_type=True)
+            self._file = _open(self.path, "wb")
+
+    def __enter__(self) -> "ConfigWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, config: Union[AnyBackendConfig, Dict[str, Any]]) -> None:
+        data = _spec_dict(config)
+        if self._packer is None:
+            self._file.write(json.dumps(data, separators=(",", ":")) + "\n")
+        else:
+            self._file.write(self._packer.pack(data))
+        self.count += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def write_configs(
+    configs: Iterable[Union[AnyBackendConfig, Dict[str, Any]]],
+    path: Union[str, Path],
+    format: Optional[str] = None
+) -> int:
+    """Stream ``configs`` to ``path``; returns the number written."""
+    with ConfigWriter(path, format) as writer:
+        for config in configs:
+            writer.write(config)
+    return writer.count
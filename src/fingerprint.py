@@ -0,0 +1,134 @@
+"""
+Content Fingerprints
+
+Canonical form and digest of a generation request (``BackendConfig`` plus
+architecture). Two requests with the same fingerprint generate the same
+project, so it serves as the shared key for response caches, artifact
+stores, job dedup and incremental regeneration.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Union
+import hashlib
+import json
+
+from .config import AnyBackendConfig, FrozenBackendConfig
+
+# Field names callers usually pass as ``exclude`` to keep secrets out of keys
+SECRET_FIELDS = frozenset({"password", "secret_key", "api_key", "client_secret", "token"})
+
+# Config lists whose order carries no meaning
+UNORDERED_CONFIG_PATHS = frozenset({"config.features", "config.cors_origins", "config.auth.oauth_providers"})
+
+Exclude = Iterable[str]
+
+
+# Top-level paths of a canonical request
+_ROOTS = frozenset({"config", "architecture"})
+
+
+def _is_metadata(key: str, top: bool) -> bool:
+    # A nested ``metadata`` key may be a model or field attribute
+    return key.endswith("_metadata") or (top and key == "metadata")
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _prune(value: Any, path: str, exclude: FrozenSet[str], unordered: FrozenSet[str]) -> Any:
+    if isinstance(value, dict):
+        pruned = {}
+        top = path in _ROOTS
+        for key, item in value.items():
+            key = str(key)
+            item_path = f"{path}.{key}"
+            if item is None or _is_metadata(key, top) or key in exclude or item_path in exclude:
+                continue
+            pruned[key] = _prune(item, item_path, exclude, unordered)
+        return pruned
+    if isinstance(value, (list, tuple)):
+        items = [_prune(item, path, exclude, unordered) for item in value]
+        if path in unordered:
+            items.sort(key=_encode)
+        return items
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _exclusions(exclude: Optional[Exclude]) -> FrozenSet[str]:
+    if exclude is None:
+        return frozenset()
+    if isinstance(exclude, str):
+        return frozenset({exclude})
+    return frozenset(exclude)
+
+
+def canonical_config(
+    config: Union[AnyBackendConfig, Dict[str, Any]],
+    exclude: Optional[Exclude] = None
+) -> Dict[str, Any]:
+    """
+    Canonical form of a config.
+
+    ``None`` values and metadata are dropped and set-like lists sorted.
+    ``exclude`` holds field names (``"password"``, dropped at any depth) or
+    dotted paths from the request root (``"config.auth.secret_key"``).
+    """
+    exclude = _exclusions(exclude)
+    if isinstance(config, FrozenBackendConfig):
+        return json.loads(_frozen_config_encoding(config, exclude))
+    data = config if isinstance(config, dict) else config.to_dict()
+    return _prune(data, "config", exclude, UNORDERED_CONFIG_PATHS)
+
+
+def canonical_architecture(architecture: Optional[Dict[str, Any]], exclude: Optional[Exclude] = None) -> Dict[str, Any]:
+    """
+    Canonical form of an architecture.
+
+    ``*_metadata`` entries (timestamps, token counts, ...), a top-level
+    ``metadata`` and ``None`` values are dropped. Lists keep their order,
+    since the order of models, fields and endpoints shows in the output.
+    """
+    return _prune(architecture or {}, "architecture", _exclusions(exclude), frozenset())
+
+
+def canonical_request(
+    config: Optional[Union[AnyBackendConfig, Dict[str, Any]]] = None,
+    architecture: Optional[Dict[str, Any]] = None,
+    exclude: Optional[Exclude] = None
+) -> Dict[str, Any]:
+    """Canonical ``{"config": ..., "architecture": ...}`` of a request."""
+    exclude = _exclusions(exclude)
+    return {
+        "config": canonical_config(config, exclude) if config is not None else {},
+        "architecture": canonical_architecture(architecture, exclude),
+    }
+
+
+def fingerprint(
+    config: Optional[Union[AnyBackendConfig, Dict[str, Any]]] = None,
+    architecture: Optional[Dict[str, Any]] = None,
+    exclude: Optional[Exclude] = None
+) -> str:
+    """
+    SHA-256 fingerprint of a generation request.
+
+    Equal for requests that differ only in metadata, ``None`` fields, key
+    order or the order of set-like lists. Frozen configs memoise their
+    canonical encoding, so repeated fingerprints only pay for the
+    architecture.
+    """
+    exclude = _exclusions(exclude)
+    if isinstance(config, FrozenBackendConfig):
+        config_part = _frozen_config_encoding(config, exclude)
+    else:
+        config_part = _encode(canonical_config(config, exclude) if config is not None else {})
+    payload = f'{{"architecture":{_encode(canonical_architecture(architecture, exclude))},"config":{config_part}}}'
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _frozen_config_encoding(config: FrozenBackendConfig, exclude: FrozenSet[str]) -> str:
+    return _encode(_prune(config.to_dict(), "config", exclude, UNORDERED_CONFIG_PATHS))
@@ -0,0 +1,81 @@
+"""
+LLM transport layer.
+
+Wraps ``mcpturbo.protocol`` with the cross-cutting concerns shared by all
+backend agents (response caching, request coalescing, provider rate
+limiting, hedging, streaming, record/replay, ...).
+"""
+
+from .accounting import AttemptRecord, MetricsSink, RequestLog, RequestRecord, collect_requests
+from .cache import CacheStats, ResponseCache, request_key
+from .cassette import Cassette, CassetteMiss, ReplayedResponse
+from .client import (
+    CachedResponse,
+    LLMClient,
+    StreamedResponse,
+    get_default_client,
+    set_default_client,
+)
+from .hedging import HedgingPolicy, LatencyTracker, race_hedged
+from .limiter import (
+    LimiterStats,
+    ProviderLimiter,
+    RateLimiter,
+    RateLimitPolicy,
+    TokenBucket,
+    get_rate_limiter,
+    throttle_signal,
+)
+from .payload import (
+    DEFAULT_CONTEXT_TOKENS,
+    DEFAULT_PAYLOAD_TOKENS,
+    MAX_PAYLOAD_TOKENS,
+    PayloadTooLarge,
+    compact_payload,
+    context_payload,
+)
+from .singleflight import SingleFlight, SingleFlightStats
+from .streaming import FileStreamParser, GeneratedFile, chunk_text
+from .tokens import estimate_request_tokens, estimate_tokens
+
+__all__ = [
+    "AttemptRecord",
+    "MetricsSink",
+    "RequestLog",
+    "RequestRecord",
+    "collect_requests",
+    "CacheStats",
+    "ResponseCache",
+    "request_key",
+    "Cassette",
+    "CassetteMiss",
+    "ReplayedResponse",
+    "CachedResponse",
+    "LLMClient",
+    "StreamedResponse",
+    "get_default_client",
+    "set_default_client",
+    "HedgingPolicy",
+    "LatencyTracker",
+    "race_hedged",
+    "LimiterStats",
+    "ProviderLimiter",
+    "RateLimiter",
+    "RateLimitPolicy",
+    "TokenBucket",
+    "get_rate_limiter",
+    "throttle_signal",
+    "DEFAULT_CONTEXT_TOKENS",
+    "DEFAULT_PAYLOAD_TOKENS",
+    "MAX_PAYLOAD_TOKENS",
+    "PayloadTooLarge",
+    "compact_payload",
+    "context_payload",
+    "SingleFlight",
+    "SingleFlightStats",
+    "FileStreamParser",
+    "GeneratedFile",
+    "chunk_text",
+    "estimate_request_tokens",
+    "estimate_tokens",
+]
@@ -0,0 +1,149 @@
+"""
+Request Accounting
+
+Per-request size, token and latency records for LLM calls, aggregated per
+task and forwarded to an optional metrics sink.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AttemptRecord:
+    """One provider call made for a request (hedged requests make several)."""
+
+    provider: str
+    queue_wait: float = 0.0
+    latency: float = 0.0
+    success: bool = False
+    cancelled: bool = False
+    won: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        attempt = asdict(self)
+        attempt["queue_wait"] = round(self.queue_wait, 4)
+        attempt["latency"] = round(self.latency, 4)
+        return attempt
+
+
+@dataclass
+class RequestRecord:
+    """
+    Accounting for one ``send_request``/``stream_request`` call.
+
+    ``provider`` and ``queue_wait`` are those of the attempt that answered;
+    every provider call is listed in ``attempts``. Coalesced records share
+    the upstream call of another record and carry no attempts.
+    """
+
+    provider: str
+    action: str
+    prompt_chars: int = 0
+    prompt_tokens: int = 0
+    response_chars: int = 0
+    response_tokens: int = 0
+    queue_wait: float = 0.0
+    latency: float = 0.0
+    cached: bool = False
+    coalesced: bool = False
+    success: bool = True
+    attempts: List[AttemptRecord] = field(default_factory=list)
+
+    def attempt(self, provider: str) -> AttemptRecord:
+        """Start accounting for a provider call made for this request."""
+        attempt = AttemptRecord(provider=provider)
+        self.attempts.append(attempt)
+        return attempt
+
+    def settle(self, winner: Optional[AttemptRecord]) -> None:
+        """Take ``provider`` and ``queue_wait`` from the answering attempt."""
+        if winner is None:
+            return
+        winner.won = True
+        self.provider = winner.provider
+        self.queue_wait = winner.queue_wait
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = asdict(self)
+        record["queue_wait"] = round(self.queue_wait, 4)
+        record["latency"] = round(self.latency, 4)
+        record["attempts"] = [attempt.to_dict() for attempt in self.attempts]
+        return record
+
+
+# Receives every completed request record
+MetricsSink = Callable[[RequestRecord], None]
+
+
+@dataclass
+class RequestLog:
+    """Request records collected while a task runs."""
+
+    records: List[RequestRecord] = field(default_factory=list)
+
+    def add(self, record: RequestRecord) -> None:
+        self.records.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals for the task, broken down by provider and by action."""
+        return {
+            **self._totals(self.records),
+            "by_provider": self._grouped(lambda record: record.provider),
+            "by_action": self._grouped(lambda record: record.action),
+        }
+
+    def _grouped(self, key: Callable[[RequestRecord], str]) -> Dict[str, Dict[str, Any]]:
+        groups: Dict[str, List[RequestRecord]] = {}
+        for record in self.records:
+            groups.setdefault(key(record), []).append(record)
+        return {name: self._totals(records) for name, records in sorted(groups.items())}
+
+    @staticmethod
+    def _totals(records: List[RequestRecord]) -> Dict[str, Any]:
+        # Cache hits and coalesced followers made no upstream call of their own
+        upstream = [record for record in records if not (record.cached or record.coalesced)]
+        return {
+            "requests": len(records),
+            "cached": sum(1 for record in records if record.cached),
+            "coalesced": sum(1 for record in records if record.coalesced),
+            "failed": sum(1 for record in records if not record.success),
+            "attempts": sum(len(record.attempts) for record in records),
+            "prompt_chars": sum(record.prompt_chars for record in upstream),
+            "response_chars": sum(record.response_chars for record in upstream),
+            "prompt_tokens": sum(record.prompt_tokens for record in upstream),
+            "response_tokens": sum(record.response_tokens for record in upstream),
+            "queue_wait_seconds": round(sum(record.queue_wait for record in records), 4),
+            "latency_seconds": round(sum(record.latency for record in records), 4),
+        }
+
+
+# Logs of every task scope enclosing the current context, outermost first
+_active_logs: ContextVar[Tuple[RequestLog, ...]] = ContextVar("active_request_logs", default=())
+
+
+@contextmanager
+def collect_requests(log: RequestLog) -> Iterator[RequestLog]:
+    """Add every request made in this context (and its tasks) to ``log``."""
+    token = _active_logs.set(_active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+def publish(record: RequestRecord, sink: Optional[MetricsSink] = None) -> None:
+    """Add ``record`` to the active request logs and hand it to ``sink``."""
+    for log in _active_logs.get():
+        log.add(record)
+    if sink is None:
+        return
+    try:
+        sink(record)
+    except Exception as e:
+        logger.warning(f"Metrics sink failed: {e}")
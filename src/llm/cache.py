@@ -0,0 +1,282 @@
+"""
+LLM Response Cache
+
+Content-addressed cache for LLM responses with an in-memory LRU tier
+backed by an optional on-disk SQLite store.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sentinel distinguishing "not cached" from a cached ``None``
+_MISSING = object()
+
+
+def request_key(target_id: str, action: str, data: Dict[str, Any]) -> str:
+    """
+    Build the content address of an LLM request.
+
+    The key covers the provider, the action and the full request payload
+    (prompt, system prompt, language, framework, ...). The sender is left out
+    so identical prompts issued by different agents share an entry.
+    """
+    payload = json.dumps(
+        {"target_id": target_id, "action": action, "data": data},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a response cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM responses.
+
+    - Memory tier: LRU bounded by ``max_entries``
+    - Disk tier (optional): SQLite file bounded by ``max_disk_bytes``
+    - Entries older than ``ttl_seconds`` are treated as misses and dropped
+
+    Values must be JSON-serializable; anything else is silently not cached.
+    ``aget``/``aset`` serve memory hits inline and run disk reads and writes
+    in a worker thread, so coroutines never block the event loop on SQLite.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: int = 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Guards the memory tier and stats; the disk tier has its own lock so
+        # memory hits never wait behind a SQLite commit
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_created_at "
+                "ON responses (created_at)"
+            )
+            self._db.commit()
+            # Kept up to date on every write instead of summed per store
+            (self._disk_bytes,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default``."""
+        value = self._lookup_memory(key)
+        if value is _MISSING and self._db is not None:
+            value = self._lookup_disk(key)
+        return self._result(value, default)
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """``get`` for coroutines; disk lookups run in a worker thread."""
+        value = self._lookup_memory(key)
+        if value is _MISSING and self._db is not None:
+            value = await asyncio.to_thread(self._lookup_disk, key)
+        return self._result(value, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` in both tiers."""
+        encoded = self._store_memory(key, value)
+        if encoded is not None and self._db is not None:
+            self._store_disk(key, encoded, time.time())
+
+    async def aset(self, key: str, value: Any) -> None:
+        """``set`` for coroutines; the disk write runs in a worker thread."""
+        encoded = self._store_memory(key, value)
+        if encoded is not None and self._db is not None:
+            await asyncio.to_thread(self._store_disk, key, encoded, time.time())
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+                self._disk_bytes = 0
+
+    def close(self) -> None:
+        with self._disk_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # Internal helpers
+    def _lookup_memory(self, key: str) -> Any:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at):
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+            return _MISSING
+
+    def _lookup_disk(self, key: str) -> Any:
+        with self._disk_lock:
+            if self._db is None:
+                return _MISSING
+            row = self._db.execute(
+                "SELECT value, created_at, size FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            encoded, created_at, size = row
+            if self._expired(created_at):
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self._disk_bytes -= size
+                return _MISSING
+
+        value = json.loads(encoded)
+        with self._lock:
+            self._remember(key, created_at, value)
+            self.stats.disk_hits += 1
+        return value
+
+    def _result(self, value: Any, default: Any) -> Any:
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            self.stats.misses += 1
+        return default
+
+    def _store_memory(self, key: str, value: Any) -> Optional[str]:
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Skipping cache store for non-serializable value {key[:12]}")
+            return None
+
+        with self._lock:
+            self._remember(key, time.time(), value)
+            self.stats.stores += 1
+        return encoded
+
+    def _store_disk(self, key: str, encoded: str, now: float) -> None:
+        with self._disk_lock:
+            if self._db is None:
+                return
+            replaced = self._db.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, size) "
+                "VALUES (?, ?, ?, ?)",
+                (key, encoded, now, len(encoded))
+            )
+            self._disk_bytes += len(encoded) - (replaced[0] if replaced else 0)
+            self._evict_disk()
+            self._db.commit()
+
+    def _remember(self, key: str, created_at: float, value: Any) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _evict_disk(self) -> None:
+        # Called with ``_disk_lock`` held
+        evicted = 0
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            expired, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses WHERE created_at < ?",
+                (cutoff,)
+            ).fetchone()
+            if expired:
+                self._db.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+                self._disk_bytes -= size
+                evicted += expired
+
+        if self._disk_bytes > self.max_disk_bytes:
+            oldest = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY created_at ASC"
+            )
+            victims = []
+            while self._disk_bytes > self.max_disk_bytes:
+                row = oldest.fetchone()
+                if row is None:
+                    break
+                victims.append((row[0],))
+                self._disk_bytes -= row[1]
+            oldest.close()
+            self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+            evicted += len(victims)
+
+        if evicted:
+            with self._lock:
+                self.stats.evictions += evicted
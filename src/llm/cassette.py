@@ -0,0 +1,183 @@
+"""
+Record/Replay Cassettes
+
+Transport that records real protocol request/response pairs to a compact
+JSONL cassette and replays them deterministically offline, optionally
+re-injecting the recorded latencies.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import asyncio
+import gzip
+import json
+import logging
+import threading
+import time
+
+from mcpturbo import protocol
+
+from .cache import request_key
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request the cassette has no entry for."""
+
+
+@dataclass
+class ReplayedResponse:
+    """Protocol-compatible response replayed from a cassette."""
+
+    result: Any
+    success: bool = True
+    error: Optional[str] = None
+    replayed: bool = True
+
+
+class Cassette:
+    """
+    Record/replay transport for ``LLMClient(transport=...)``.
+
+    Modes:
+    - record: every request goes to ``protocol.send_request``; the cassette
+      file is truncated on the first recorded request and rewritten
+    - replay: requests are answered from the cassette only; misses raise
+      ``CassetteMiss``
+    - auto: replay when the cassette has the request, record (append)
+      otherwise
+
+    Entries are keyed like the response cache (provider, action, payload).
+    A request recorded several times is replayed in recorded order, the last
+    response repeating once exhausted. ``latency_scale`` sleeps for that
+    fraction of each recorded latency on replay (0 disables it). Paths
+    ending in ``.gz`` are gzip-compressed.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "replay",
+        latency_scale: float = 0.0
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(CASSETTE_MODES)}")
+        if latency_scale < 0:
+            raise ValueError("latency_scale must not be negative")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Record mode starts a fresh cassette; replay and auto extend the existing one
+        self._truncate = mode == "record"
+
+        if self.path.exists() and not self._truncate:
+            self._load()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    async def send_request(
+        self,
+        sender_id: str,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any]
+    ) -> Any:
+        key = request_key(target_id, action, data)
+
+        if self.mode != "record":
+            entry = self._next_entry(key)
+            if entry is not None:
+                return await self._replay(entry)
+            if self.mode == "replay":
+                raise CassetteMiss(f"No cassette entry for {target_id}/{action} ({key[:12]})")
+
+        start = time.monotonic()
+        response = await protocol.send_request(
+            sender_id=sender_id,
+            target_id=target_id,
+            action=action,
+            data=data
+        )
+        self._record(key, target_id, action, response, time.monotonic() - start)
+        return response
+
+    # Internal helpers
+    def _next_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[min(position, len(entries) - 1)]
+
+    async def _replay(self, entry: Dict[str, Any]) -> ReplayedResponse:
+        delay = entry.get("latency", 0.0) * self.latency_scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return ReplayedResponse(
+            result=entry.get("result"),
+            success=entry.get("success", True),
+            error=entry.get("error")
+        )
+
+    def _record(
+        self,
+        key: str,
+        target_id: str,
+        action: str,
+        response: Any,
+        latency: float
+    ) -> None:
+        result = getattr(response, "result", None)
+        try:
+            json.dumps(result)
+        except (TypeError, ValueError):
+            result = str(result)
+
+        entry: Dict[str, Any] = {
+            "key": key,
+            "target_id": target_id,
+            "action": action,
+            "result": result,
+            "latency": round(latency, 4),
+        }
+        if getattr(response, "success", True) is False:
+            entry["success"] = False
+            error = getattr(response, "error", None)
+            entry["error"] = error if isinstance(error, str) else None
+
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            self._entries.setdefault(key, []).append(entry)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._open("wt" if self._truncate else "at") as handle:
+                handle.write(line)
+            self._truncate = False
+
+    def _load(self) -> None:
+        with self._open("rt") as handle:
+            for number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed cassette line {number} in {self.path}")
+                    continue
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
@@ -0,0 +1,349 @@
+"""
+LLM Client
+
+Single send path between the backend agents and ``mcpturbo.protocol``.
+Optional layers (response caching, request coalescing, provider rate
+limiting, hedging, ...) are applied here so every agent benefits from them
+without touching its prompts.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+from mcpturbo import protocol
+
+from .accounting import AttemptRecord, MetricsSink, RequestRecord, publish
+from .cache import ResponseCache, request_key
+from .hedging import HedgingPolicy, LatencyTracker, race_hedged
+from .limiter import RateLimiter, get_rate_limiter
+from .singleflight import SingleFlight
+from .streaming import chunk_text
+from .tokens import estimate_request_tokens, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_NOT_CACHED = object()
+
+
+@dataclass
+class CachedResponse:
+    """Protocol-compatible response served from the response cache."""
+
+    result: Any
+    success: bool = True
+    cached: bool = True
+
+
+@dataclass
+class StreamedResponse:
+    """Protocol-compatible response assembled from a streamed reply."""
+
+    result: str
+    success: bool = True
+    streamed: bool = True
+
+
+class LLMClient:
+    """
+    Client wrapping ``protocol.send_request``.
+
+    Layers:
+    - cache (opt-in): content-addressed ``ResponseCache`` keyed on provider,
+      action and request payload
+    - single_flight (opt-in): ``SingleFlight`` sharing one upstream call
+      between concurrent identical requests
+    - limiter: per-provider ``RateLimiter``; defaults to the process-wide
+      limiter so every client and agent shares the same provider ceilings
+    - hedging (opt-in): ``HedgingPolicy`` re-sending slow or failed requests
+      to fallback providers; latencies are always tracked in ``latency``
+    - transport (opt-in): object with a ``send_request`` coroutine used in
+      place of ``protocol.send_request`` (e.g. a record/replay ``Cassette``)
+    - metrics_sink (opt-in): receives a ``RequestRecord`` per request; records
+      also go to the ``RequestLog`` of every enclosing task
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        limiter: Optional[RateLimiter] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        latency: Optional[LatencyTracker] = None,
+        metrics_sink: Optional[MetricsSink] = None,
+        transport: Optional[Any] = None
+    ):
+        self.cache = cache
+        self.single_flight = single_flight
+        self.limiter = limiter if limiter is not None else get_rate_limiter()
+        self.hedging = hedging
+        self.latency = latency if latency is not None else LatencyTracker()
+        self.metrics_sink = metrics_sink
+        self.transport = transport
+
+    async def send_request(
+        self,
+        sender_id: str,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any]
+    ) -> Any:
+        """Send a request to an LLM provider through the configured layers."""
+        record = self._new_record(target_id, action, data)
+        return await self._accounted(
+            record,
+            self._send(sender_id, target_id, action, data, record)
+        )
+
+    async def _send(
+        self,
+        sender_id: str,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any],
+        record: RequestRecord
+    ) -> Any:
+        key = None
+        if self.cache is not None or self.single_flight is not None:
+            key = request_key(target_id, action, data)
+
+        cached = await self._cached(key, target_id, action, record)
+        if cached is not None:
+            return cached
+
+        async def _call(provider: str) -> Any:
+            return await self._transport_send(
+                sender_id=sender_id,
+                target_id=provider,
+                action=action,
+                data=data
+            )
+
+        async def _fetch() -> Any:
+            if self.hedging is None:
+                return await self._dispatch(target_id, data, key, _call, record)
+            return await self._dispatch_hedged(target_id, action, data, key, _call, record)
+
+        if self.single_flight is None:
+            return await _fetch()
+
+        led = False
+
+        async def _lead() -> Any:
+            nonlocal led
+            led = True
+            return await _fetch()
+
+        try:
+            return await self.single_flight.do(key, _lead)
+        finally:
+            # Followers share the leader's upstream call and its accounting
+            record.coalesced = not led
+
+    async def stream_request(
+        self,
+        sender_id: str,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any],
+        on_chunk: Callable[[str], None]
+    ) -> Any:
+        """
+        Send a request and hand each text chunk to ``on_chunk`` as it arrives.
+
+        Uses ``protocol.stream_request`` when the installed protocol provides
+        it and falls back to one chunk from ``send_request`` otherwise. Cache
+        hits are replayed as a single chunk. Streams are never coalesced or
+        hedged, since chunks from two providers cannot be interleaved.
+        """
+        record = self._new_record(target_id, action, data)
+        return await self._accounted(
+            record,
+            self._stream(sender_id, target_id, action, data, on_chunk, record)
+        )
+
+    async def _stream(
+        self,
+        sender_id: str,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any],
+        on_chunk: Callable[[str], None],
+        record: RequestRecord
+    ) -> Any:
+        key = request_key(target_id, action, data) if self.cache is not None else None
+
+        cached = await self._cached(key, target_id, action, record)
+        if cached is not None:
+            if isinstance(cached.result, str):
+                on_chunk(cached.result)
+            return cached
+
+        stream = getattr(self.transport or protocol, "stream_request", None)
+
+        async def _call(provider: str) -> Any:
+            if stream is None:
+                response = await self._transport_send(
+                    sender_id=sender_id,
+                    target_id=provider,
+                    action=action,
+                    data=data
+                )
+                if isinstance(getattr(response, "result", None), str):
+                    on_chunk(response.result)
+                return response
+
+            parts = []
+            async for chunk in stream(
+                sender_id=sender_id,
+                target_id=provider,
+                action=action,
+                data=data
+            ):
+                text = chunk_text(chunk)
+                if text:
+                    parts.append(text)
+                    on_chunk(text)
+            return StreamedResponse(result="".join(parts))
+
+        return await self._dispatch(target_id, data, key, _call, record)
+
+    async def _transport_send(self, **request: Any) -> Any:
+        # Resolved per call so ``protocol.send_request`` can be patched
+        send = self.transport.send_request if self.transport is not None else protocol.send_request
+        return await send(**request)
+
+    def _new_record(self, target_id: str, action: str, data: Dict[str, Any]) -> RequestRecord:
+        return RequestRecord(
+            provider=target_id,
+            action=action,
+            prompt_chars=sum(len(value) for value in data.values() if isinstance(value, str)),
+            prompt_tokens=estimate_request_tokens(data)
+        )
+
+    async def _accounted(self, record: RequestRecord, work: Awaitable[Any]) -> Any:
+        start = time.monotonic()
+        try:
+            response = await work
+        except BaseException:
+            record.success = False
+            raise
+        else:
+            result = getattr(response, "result", None)
+            if result is not None:
+                record.response_chars = len(result if isinstance(result, str) else str(result))
+                record.response_tokens = estimate_tokens(result)
+            record.success = getattr(response, "success", True) is not False
+            return response
+        finally:
+            record.latency = time.monotonic() - start
+            publish(record, self.metrics_sink)
+
+    async def _cached(
+        self,
+        key: Optional[str],
+        target_id: str,
+        action: str,
+        record: RequestRecord
+    ) -> Optional[CachedResponse]:
+        if self.cache is None:
+            return None
+        cached = await self.cache.aget(key, _NOT_CACHED)
+        if cached is _NOT_CACHED:
+            return None
+        logger.debug(f"Cache hit for {target_id}/{action} ({key[:12]})")
+        record.cached = True
+        return CachedResponse(result=cached)
+
+    async def _dispatch(
+        self,
+        target_id: str,
+        data: Dict[str, Any],
+        key: Optional[str],
+        call: Callable[[str], Awaitable[Any]],
+        record: RequestRecord
+    ) -> Any:
+        attempt = record.attempt(target_id)
+        response = await self._attempt(target_id, data, call, attempt)
+        record.settle(attempt)
+        await self._store(key, response)
+        return response
+
+    async def _dispatch_hedged(
+        self,
+        target_id: str,
+        action: str,
+        data: Dict[str, Any],
+        key: Optional[str],
+        call: Callable[[str], Awaitable[Any]],
+        record: RequestRecord
+    ) -> Any:
+        answered: Dict[int, AttemptRecord] = {}
+
+        async def _hedge(provider: str) -> Any:
+            attempt = record.attempt(provider)
+            response = await self._attempt(provider, data, call, attempt)
+            answered[id(response)] = attempt
+            return response
+
+        response = await race_hedged(
+            self.hedging.candidates(target_id, action),
+            _hedge,
+            lambda provider: self.hedging.hedge_delay(self.latency, provider)
+        )
+        record.settle(answered.get(id(response)))
+        await self._store(key, response)
+        return response
+
+    async def _attempt(
+        self,
+        provider_id: str,
+        data: Dict[str, Any],
+        call: Callable[[str], Awaitable[Any]],
+        attempt: AttemptRecord
+    ) -> Any:
+        queued = time.monotonic()
+
+        async def _timed() -> Any:
+            # Timed inside the limiter so queueing does not skew latencies
+            start = time.monotonic()
+            attempt.queue_wait = start - queued
+            try:
+                response = await call(provider_id)
+            except asyncio.CancelledError:
+                attempt.cancelled = True
+                raise
+            finally:
+                attempt.latency = time.monotonic() - start
+            attempt.success = getattr(response, "success", True) is not False
+            if attempt.success:
+                self.latency.record(provider_id, attempt.latency)
+            return response
+
+        provider = self.limiter.for_provider(provider_id)
+        response = await provider.run(_timed, estimate_request_tokens(data))
+        provider.charge_tokens(estimate_tokens(getattr(response, "result", None)))
+        return response
+
+    async def _store(self, key: Optional[str], response: Any) -> None:
+        if self.cache is not None and getattr(response, "success", True) is not False:
+            await self.cache.aset(key, response.result)
+
+
+_default_client: Optional[LLMClient] = None
+
+
+def get_default_client() -> LLMClient:
+    """Return the process-wide client used by agents without their own."""
+    global _default_client
+    if _default_client is None:
+        _default_client = LLMClient()
+    return _default_client
+
+
+def set_default_client(client: Optional[LLMClient]) -> None:
+    """Replace the process-wide client (``None`` restores a bare client)."""
+    global _default_client
+    _default_client = client
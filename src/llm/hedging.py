@@ -0,0 +1,138 @@
+"""
+Hedged Requests
+
+Latency tracking per provider and a hedging policy: when a request has not
+completed within a percentile of its provider's recent latency, the same
+prompt is sent to an alternate provider and the first good answer wins.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per provider."""
+
+    def __init__(self, window: int = 200):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, seconds: float) -> None:
+        samples = self._samples.get(provider)
+        if samples is None:
+            samples = self._samples[provider] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def count(self, provider: str) -> int:
+        return len(self._samples.get(provider, ()))
+
+    def percentile(self, provider: str, q: float) -> Optional[float]:
+        """Return the ``q`` quantile (0..1) of recent latencies, if any."""
+        samples = self._samples.get(provider)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+@dataclass
+class HedgingPolicy:
+    """
+    When and where to hedge a request.
+
+    ``fallbacks`` maps an action (``reasoning``, ``code_generation``, ...) to
+    the ordered providers tried after the request's own ``target_id``;
+    actions without an entry use ``default_fallbacks``.
+    """
+
+    percentile: float = 0.95
+    min_samples: int = 20
+    initial_delay: Optional[float] = None
+    min_delay: float = 0.05
+    max_hedges: int = 1
+    fallbacks: Dict[str, List[str]] = field(default_factory=dict)
+    default_fallbacks: List[str] = field(default_factory=list)
+
+    def candidates(self, target_id: str, action: str) -> List[str]:
+        """Providers to try for a request, primary first."""
+        alternates = [
+            provider
+            for provider in self.fallbacks.get(action, self.default_fallbacks)
+            if provider != target_id
+        ]
+        return [target_id] + alternates[:self.max_hedges]
+
+    def hedge_delay(self, tracker: LatencyTracker, provider: str) -> Optional[float]:
+        """Seconds to wait on ``provider`` before hedging (``None`` = never)."""
+        if tracker.count(provider) < self.min_samples:
+            return self.initial_delay
+        latency = tracker.percentile(provider, self.percentile)
+        return max(self.min_delay, latency) if latency is not None else self.initial_delay
+
+
+def _is_good(response: Any) -> bool:
+    return getattr(response, "success", True) is not False
+
+
+async def race_hedged(
+    providers: List[str],
+    attempt: Callable[[str], Awaitable[Any]],
+    hedge_delay: Callable[[str], Optional[float]]
+) -> Any:
+    """
+    Run ``attempt`` against ``providers`` with hedging and failover.
+
+    The next provider is started when the latest one exceeds its hedge delay
+    or when every running attempt has failed. The first good response wins
+    and the remaining attempts are cancelled. If every provider fails, the
+    last failure is raised (or returned, for unsuccessful responses).
+    """
+    remaining = list(providers)
+    pending: Dict["asyncio.Future[Any]", str] = {}
+    last_provider = remaining[0]
+    last_failure: Any = None
+
+    def _launch() -> None:
+        nonlocal last_provider
+        last_provider = remaining.pop(0)
+        pending[asyncio.ensure_future(attempt(last_provider))] = last_provider
+
+    _launch()
+    try:
+        while pending:
+            timeout = hedge_delay(last_provider) if remaining else None
+            done, _ = await asyncio.wait(
+                list(pending),
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                logger.info(f"Hedging slow {last_provider} request to {remaining[0]}")
+                _launch()
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                if future.exception() is None and _is_good(future.result()):
+                    return future.result()
+                last_failure = future.exception() or future.result()
+                logger.warning(f"Provider {provider} failed; {len(remaining)} fallback(s) left")
+
+            if not pending and remaining:
+                _launch()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    if isinstance(last_failure, BaseException):
+        raise last_failure
+    return last_failure
@@ -0,0 +1,277 @@
+"""
+Provider Rate Limiting
+
+Process-wide, per-provider throttling for LLM calls: a max-in-flight
+semaphore, requests-per-minute and tokens-per-minute token buckets, and an
+adaptive backoff shared by every caller when a provider signals throttling.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+_THROTTLE_MARKERS = (
+    "rate limit",
+    "rate_limit",
+    "ratelimit",
+    "too many requests",
+    "429",
+    "throttl",
+    "overloaded",
+)
+
+
+def throttle_signal(outcome: Any) -> Optional[float]:
+    """
+    Inspect an exception or protocol response for a throttling signal.
+
+    Returns ``None`` when the outcome is not a throttle, otherwise the
+    provider's ``retry_after`` hint in seconds (``0.0`` when absent).
+    """
+    if not isinstance(outcome, BaseException):
+        if getattr(outcome, "success", True) is not False:
+            return None
+        error = getattr(outcome, "error", None)
+        if not isinstance(error, str):
+            return None
+        message = error
+    else:
+        message = f"{type(outcome).__name__} {outcome}"
+
+    status = getattr(outcome, "status_code", getattr(outcome, "status", None))
+    if status != 429 and not any(marker in message.lower() for marker in _THROTTLE_MARKERS):
+        return None
+
+    retry_after = getattr(outcome, "retry_after", None)
+    try:
+        return max(float(retry_after), 0.0) if retry_after is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class RateLimitPolicy:
+    """Throughput ceiling for one provider."""
+
+    max_in_flight: int = 16
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_retries: int = 3
+    backoff_base: float = 1.0
+    backoff_max: float = 60.0
+
+
+@dataclass
+class LimiterStats:
+    """Counters for one provider limiter."""
+
+    requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    wait_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``per_minute`` units per minute."""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` units; the bucket may go into debt."""
+        self._refill()
+        self.tokens -= amount
+
+    async def acquire(self, amount: float) -> float:
+        """Wait until ``amount`` units are available, take them, return the wait."""
+        waited = 0.0
+        while True:
+            delay = self.delay_for(amount)
+            if delay <= 0:
+                self.consume(min(amount, self.capacity))
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ProviderLimiter:
+    """Limiter for a single provider, shared by every agent calling it."""
+
+    def __init__(self, provider: str, policy: RateLimitPolicy):
+        if policy.max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.provider = provider
+        self.policy = policy
+        self.stats = LimiterStats()
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._requests = TokenBucket(policy.requests_per_minute) if policy.requests_per_minute else None
+        self._tokens = TokenBucket(policy.tokens_per_minute) if policy.tokens_per_minute else None
+        self._backoff = 0.0
+        self._paused_until = 0.0
+
+    async def run(self, fn: Callable[[], Awaitable[Any]], estimated_tokens: int = 0) -> Any:
+        """
+        Run ``fn`` within the provider's limits.
+
+        Throttled attempts (raised or returned) pause the whole provider for
+        the current backoff and are retried up to ``max_retries`` times.
+        Pauses and rate budgets are waited out before taking an in-flight
+        slot, so a waiting request never holds one.
+        """
+        attempt = 0
+        charged = False
+        while True:
+            await self._wait_for_capacity(estimated_tokens, charge=not charged)
+            charged = True
+            async with self._slot():
+                if self._paused_until > time.monotonic():
+                    # Throttled while queued for the slot; wait outside it
+                    continue
+                charged = False
+                self.stats.requests += 1
+                try:
+                    outcome = await fn()
+                except Exception as e:
+                    retry_after = throttle_signal(e)
+                    if retry_after is None:
+                        raise
+                    self._on_throttled(retry_after)
+                    if attempt >= self.policy.max_retries:
+                        raise
+                else:
+                    retry_after = throttle_signal(outcome)
+                    if retry_after is None:
+                        self._on_success()
+                        return outcome
+                    self._on_throttled(retry_after)
+                    if attempt >= self.policy.max_retries:
+                        return outcome
+
+            attempt += 1
+            self.stats.retries += 1
+
+    def charge_tokens(self, tokens: int) -> None:
+        """Debit tokens only known after the call (e.g. completion tokens)."""
+        if self._tokens is not None and tokens > 0:
+            self._tokens.consume(tokens)
+
+    def _slot(self) -> asyncio.Semaphore:
+        # The limiter is process-wide; rebuild the semaphore if it was
+        # created for an event loop that is no longer the running one
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.policy.max_in_flight)
+            self._loop = loop
+        return self._semaphore
+
+    async def _wait_for_capacity(self, estimated_tokens: int, charge: bool = True) -> None:
+        start = time.monotonic()
+
+        pause = self._paused_until - start
+        if pause > 0:
+            await asyncio.sleep(pause)
+        if self._requests is not None and charge:
+            await self._requests.acquire(1)
+        if self._tokens is not None and charge and estimated_tokens > 0:
+            await self._tokens.acquire(estimated_tokens)
+
+        self.stats.wait_seconds += time.monotonic() - start
+
+    def _on_throttled(self, retry_after: float) -> None:
+        self.stats.throttled += 1
+        self._backoff = min(
+            self.policy.backoff_max,
+            max(self.policy.backoff_base, self._backoff * 2)
+        )
+        delay = max(retry_after, self._backoff)
+        delay += random.uniform(0, delay * 0.1)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning(f"Provider {self.provider} throttled; pausing {delay:.2f}s")
+
+    def _on_success(self) -> None:
+        if self._backoff > self.policy.backoff_base:
+            self._backoff /= 2
+        else:
+            self._backoff = 0.0
+
+
+class RateLimiter:
+    """Registry of per-provider limiters keyed by ``target_id``."""
+
+    def __init__(
+        self,
+        default_policy: Optional[RateLimitPolicy] = None,
+        policies: Optional[Dict[str, RateLimitPolicy]] = None
+    ):
+        self.default_policy = default_policy or RateLimitPolicy()
+        self._policies: Dict[str, RateLimitPolicy] = dict(policies or {})
+        self._limiters: Dict[str, ProviderLimiter] = {}
+
+    def configure(self, provider: str, policy: RateLimitPolicy) -> None:
+        """Set the policy for ``provider`` (replaces its current limiter)."""
+        self._policies[provider] = policy
+        self._limiters.pop(provider, None)
+
+    def for_provider(self, provider: str) -> ProviderLimiter:
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            policy = self._policies.get(provider, self.default_policy)
+            limiter = self._limiters[provider] = ProviderLimiter(provider, policy)
+        return limiter
+
+    async def run(
+        self,
+        provider: str,
+        fn: Callable[[], Awaitable[Any]],
+        estimated_tokens: int = 0
+    ) -> Any:
+        return await self.for_provider(provider).run(fn, estimated_tokens)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.stats.to_dict() for name, limiter in self._limiters.items()}
+
+
+_shared_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by every ``LLMClient``."""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter()
+    return _shared_limiter
@@ -0,0 +1,167 @@
+"""
+Prompt Payload Serialization
+
+Canonical, compact rendering of architecture and design payloads for
+prompts. Output is deterministic, so identical payloads always produce
+identical prompts (and cache keys).
+"""
+
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional
+import json
+
+from .tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Token budget of one serialized payload; larger model lists are sharded
+DEFAULT_PAYLOAD_TOKENS = 2000
+
+# Hard ceiling of one schema payload in a prompt; larger inputs must be sharded
+MAX_PAYLOAD_TOKENS = 8 * DEFAULT_PAYLOAD_TOKENS
+
+# Budget of context payloads (earlier phase results, requirements) that may be trimmed
+DEFAULT_CONTEXT_TOKENS = 1000
+
+# Successively tighter list/string limits tried to fit the budget
+_LIST_LIMITS = (None, 32, 16, 8, 4, 2, 1)
+_STRING_LIMITS = (None, 400, 200, 80)
+
+_TRUNCATED = "…"
+
+
+class PayloadTooLarge(ValueError):
+    """Raised when a payload that must not be trimmed exceeds its token budget."""
+
+    def __init__(self, tokens: int, max_tokens: int):
+        super().__init__(f"Payload of ~{tokens} tokens exceeds the {max_tokens} token budget")
+        self.tokens = tokens
+        self.max_tokens = max_tokens
+
+
+def is_metadata_key(key: Any, top: bool = False) -> bool:
+    """
+    Keys copied from earlier results that carry no design information.
+
+    ``*_metadata`` (``analysis_metadata``, ``design_metadata``, ...) is
+    result bookkeeping at any depth; a bare ``metadata`` key only at the
+    top level, since deeper down it may be a user's model or field attribute.
+    """
+    if not isinstance(key, str):
+        return False
+    return key.endswith("_metadata") or (top and key == "metadata")
+
+
+def _plain(value: Any, top: bool = False) -> Any:
+    """Convert ``value`` to JSON types, dropping metadata keys."""
+    if isinstance(value, Enum):
+        return _plain(value.value)
+    if isinstance(value, dict):
+        return {
+            str(key): _plain(item)
+            for key, item in value.items()
+            if not is_metadata_key(key, top)
+        }
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_plain(item) for item in value), key=repr)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "to_dict"):
+        return _plain(value.to_dict(), top)
+    if is_dataclass(value) and not isinstance(value, type):
+        return _plain(asdict(value), top)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _collapse(value: Any) -> Any:
+    """
+    Collapse lists of same-shaped objects into a column/row table.
+
+    ``[{"name": "id", "type": "int"}, {"name": "email", "type": "str"}]``
+    becomes ``{"columns": ["name", "type"], "rows": [["id", "int"], ["email", "str"]]}``.
+    """
+    if isinstance(value, dict):
+        return {key: _collapse(item) for key, item in value.items()}
+    if not isinstance(value, list):
+        return value
+
+    items = [_collapse(item) for item in value]
+    if len(items) < 2 or not all(isinstance(item, dict) and item for item in items):
+        return items
+
+    columns = sorted(items[0])
+    if any(sorted(item) != columns for item in items[1:]):
+        return items
+    return {
+        "columns": columns,
+        "rows": [[item[column] for column in columns] for item in items]
+    }
+
+
+def _limit(value: Any, max_items: Optional[int], max_chars: Optional[int]) -> Any:
+    if isinstance(value, dict):
+        return {key: _limit(item, max_items, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        kept = [_limit(item, max_items, max_chars) for item in value[:max_items]]
+        if max_items is not None and len(value) > max_items:
+            kept.append(f"{_TRUNCATED}+{len(value) - max_items} more")
+        return kept
+    if isinstance(value, str) and max_chars is not None and len(value) > max_chars:
+        return value[:max_chars] + _TRUNCATED
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_payload(
+    value: Any,
+    max_tokens: Optional[int] = MAX_PAYLOAD_TOKENS,
+    truncate: bool = False
+) -> str:
+    """
+    Serialize a payload for interpolation into a prompt.
+
+    Drops metadata keys (see ``is_metadata_key``), sorts keys and collapses
+    repeated object shapes into tables. Content is never dropped by
+    default: a payload over ``max_tokens`` raises ``PayloadTooLarge``
+    (callers shard it instead; ``None`` disables the budget). Only with
+    ``truncate=True``, for context that may be summarised, are lists and
+    then long strings trimmed until the result fits.
+    """
+    if isinstance(value, str):
+        plain: Any = value
+    else:
+        plain = _collapse(_plain(value, top=True))
+
+    text = plain if isinstance(plain, str) else _dumps(plain)
+    if max_tokens is None or estimate_tokens(text) <= max_tokens:
+        return text
+    if not truncate:
+        raise PayloadTooLarge(estimate_tokens(text), max_tokens)
+
+    if not isinstance(plain, str):
+        for max_chars in _STRING_LIMITS:
+            for max_items in _LIST_LIMITS:
+                text = _dumps(_limit(plain, max_items, max_chars))
+                if estimate_tokens(text) <= max_tokens:
+                    return text
+
+    return _truncate(text, max_tokens)
+
+
+def context_payload(value: Any, max_tokens: int = DEFAULT_CONTEXT_TOKENS) -> str:
+    """``compact_payload`` for prompt context, trimmed to ``max_tokens``."""
+    return compact_payload(value, max_tokens=max_tokens, truncate=True)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    # Last resort for payloads that stay too large at the tightest limits
+    max_chars = max(0, max_tokens * CHARS_PER_TOKEN - len(_TRUNCATED))
+    return text[:max_chars] + _TRUNCATED
+
@@ -0,0 +1,83 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent callers asking for the same key share one upstream call
+instead of each issuing their own.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for coalesced calls."""
+
+    leaders: int = 0
+    followers: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "followers": self.followers}
+
+
+class SingleFlight:
+    """
+    Coalesce identical in-flight calls.
+
+    The first caller for a key (the leader) starts the call; callers arriving
+    while it is still running (followers) await the same result or exception.
+    Once the call settles the key is released, so later callers start fresh.
+
+    Cancelling one waiter does not cancel the shared call for the others;
+    once every waiter has been cancelled the shared call is cancelled too.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._waiters: Dict["asyncio.Future[Any]", int] = {}
+        self.stats = SingleFlightStats()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being fetched."""
+        return len(self._in_flight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` for ``key`` unless an identical call is already running."""
+        future = self._in_flight.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._release(key, done))
+            self.stats.leaders += 1
+        else:
+            logger.debug(f"Joining in-flight call {key[:12]}")
+            self.stats.followers += 1
+
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                if not future.done():
+                    # Nobody is left to receive the result; stop the upstream
+                    # call and let the next caller start a fresh one
+                    self._forget(key, future)
+                    future.cancel()
+
+    def _release(self, key: str, future: "asyncio.Future[Any]") -> None:
+        self._forget(key, future)
+        # Mark the exception as retrieved even if every waiter went away
+        if not future.cancelled():
+            future.exception()
+
+    def _forget(self, key: str, future: "asyncio.Future[Any]") -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
@@ -0,0 +1,150 @@
+"""
+Streaming File Emission
+
+Incremental parser that turns streamed LLM output into generated files as
+soon as each file's closing fence arrives.
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional
+import re
+
+# Extension-less file names that commonly head a generated block
+_BARE_FILE_NAMES = ("Dockerfile", "Makefile", "Procfile", ".env", ".env.example", ".dockerignore")
+
+_PATH_PATTERN = re.compile(r"[\w.\-/]*[\w\-]\.[A-Za-z0-9]+|[\w.\-/]*(?:%s)" % "|".join(
+    re.escape(name) for name in _BARE_FILE_NAMES
+))
+
+# Header lines longer than this are prose, not file names
+_MAX_HEADER_LENGTH = 160
+
+
+@dataclass
+class GeneratedFile:
+    """A complete file extracted from LLM output."""
+
+    path: str
+    content: str
+    language: Optional[str] = None
+
+
+def chunk_text(chunk: Any) -> str:
+    """Extract the text delta from a protocol stream chunk."""
+    if isinstance(chunk, str):
+        return chunk
+    for attribute in ("delta", "text", "result"):
+        value = getattr(chunk, attribute, None)
+        if isinstance(value, str):
+            return value
+    return ""
+
+
+def _find_path(text: str) -> Optional[str]:
+    for match in _PATH_PATTERN.finditer(text):
+        candidate = match.group(0)
+        if candidate.startswith("./"):
+            candidate = candidate[2:]
+        # Skip version numbers such as 3.11
+        if candidate and not candidate[0].isdigit():
+            return candidate
+    return None
+
+
+class FileStreamParser:
+    """
+    Incremental parser for fenced code blocks.
+
+    Feed chunks as they arrive; every call returns the files whose closing
+    fence has now been seen. A file is named from the fence info string
+    (```python app/main.py) or from the last non-empty line before the fence
+    (``### app/main.py``, ``File: app/main.py``). Unnamed blocks get
+    ``file_<n>`` names.
+    """
+
+    def __init__(self):
+        # Pieces of the current, not yet terminated line
+        self._partial: List[str] = []
+        self._header: Optional[str] = None
+        self._fence: Optional[str] = None
+        self._path: Optional[str] = None
+        self._language: Optional[str] = None
+        self._lines: List[str] = []
+        self._count = 0
+
+    def feed(self, chunk: str) -> List[GeneratedFile]:
+        """Consume a chunk and return any files completed by it."""
+        if "\n" not in chunk:
+            self._partial.append(chunk)
+            return []
+        # Split each chunk once, so long streams and lines stay linear
+        *lines, tail = chunk.split("\n")
+        self._partial.append(lines[0])
+        lines[0] = "".join(self._partial)
+        self._partial = [tail] if tail else []
+        completed = []
+        for line in lines:
+            generated = self._consume_line(line)
+            if generated is not None:
+                completed.append(generated)
+        return completed
+
+    def close(self) -> List[GeneratedFile]:
+        """Flush the stream; an unterminated block is emitted as-is."""
+        completed = []
+        tail = "".join(self._partial)
+        self._partial = []
+        if tail:
+            generated = self._consume_line(tail)
+            if generated is not None:
+                completed.append(generated)
+        if self._fence is not None:
+            completed.append(self._emit())
+        return completed
+
+    def _consume_line(self, line: str) -> Optional[GeneratedFile]:
+        stripped = line.strip()
+
+        if self._fence is not None:
+            if stripped == self._fence:
+                return self._emit()
+            self._lines.append(line)
+            return None
+
+        if stripped.startswith("```"):
+            self._open(stripped)
+        elif stripped:
+            self._header = stripped if len(stripped) <= _MAX_HEADER_LENGTH else None
+        return None
+
+    def _open(self, fence_line: str) -> None:
+        marker_length = len(fence_line) - len(fence_line.lstrip("`"))
+        self._fence = "`" * marker_length
+        info = fence_line[marker_length:].strip().split()
+
+        self._language = None
+        self._path = None
+        for token in info:
+            path = _find_path(token) if ("/" in token or "." in token) else None
+            if path is not None and self._path is None:
+                self._path = path
+            elif self._language is None and path is None:
+                self._language = token.lower()
+
+        if self._path is None and self._header is not None:
+            self._path = _find_path(self._header)
+        self._lines = []
+
+    def _emit(self) -> GeneratedFile:
+        self._count += 1
+        generated = GeneratedFile(
+            path=self._path or f"file_{self._count}",
+            content="\n".join(self._lines) + "\n" if self._lines else "",
+            language=self._language
+        )
+        self._fence = None
+        self._path = None
+        self._language = None
+        self._header = None
+        self._lines = []
+        return generated
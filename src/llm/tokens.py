@@ -0,0 +1,29 @@
+"""
+Token Estimation
+
+Cheap token estimates used for rate limiting and prompt budgeting when the
+provider does not report usage.
+"""
+
+from typing import Any, Dict
+
+# Rough average for English prose and source code across providers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: Any) -> int:
+    """Estimate the number of tokens in ``text``."""
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = str(text)
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_request_tokens(data: Dict[str, Any]) -> int:
+    """Estimate the prompt tokens of a protocol request payload."""
+    return sum(
+        estimate_tokens(value)
+        for value in data.values()
+        if isinstance(value, str)
+    )
@@ -0,0 +1,188 @@
+"""
+Generation Plans
+
+Compiles a ``BackendConfig`` once per project into an immutable
+``GenerationPlan``: resolved enums, the feature set, ORM and driver choices
+and the generation tasks to run. Agents read the plan from their task
+params instead of re-parsing the config dict in every task.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Union
+
+from .config import (
+    AnyBackendConfig,
+    AuthMethod,
+    BackendConfig,
+    BackendFramework,
+    DatabaseType,
+    FrozenBackendConfig,
+    ORMType,
+)
+from .fingerprint import fingerprint
+
+# ORM used when the database config does not name one
+DEFAULT_ORMS: Dict[BackendFramework, ORMType] = {
+    BackendFramework.FASTAPI: ORMType.SQLALCHEMY,
+    BackendFramework.DJANGO: ORMType.DJANGO_ORM,
+    BackendFramework.NESTJS: ORMType.TYPEORM,
+    BackendFramework.EXPRESS: ORMType.PRISMA,
+}
+
+# Document stores have their own mappers
+DOCUMENT_ORMS: Dict[BackendFramework, Optional[ORMType]] = {
+    BackendFramework.FASTAPI: None,
+    BackendFramework.DJANGO: None,
+    BackendFramework.NESTJS: ORMType.MONGOOSE,
+    BackendFramework.EXPRESS: ORMType.MONGOOSE,
+}
+
+# Database driver per runtime
+DRIVERS: Dict[Tuple[str, DatabaseType], str] = {
+    ("python", DatabaseType.POSTGRESQL): "asyncpg",
+    ("python", DatabaseType.MYSQL): "aiomysql",
+    ("python", DatabaseType.SQLITE): "aiosqlite",
+    ("python", DatabaseType.MONGODB): "motor",
+    ("python", DatabaseType.REDIS): "redis",
+    ("typescript", DatabaseType.POSTGRESQL): "pg",
+    ("typescript", DatabaseType.MYSQL): "mysql2",
+    ("typescript", DatabaseType.SQLITE): "sqlite3",
+    ("typescript", DatabaseType.MONGODB): "mongodb",
+    ("typescript", DatabaseType.REDIS): "ioredis",
+    ("javascript", DatabaseType.POSTGRESQL): "pg",
+    ("javascript", DatabaseType.MYSQL): "mysql2",
+    ("javascript", DatabaseType.SQLITE): "sqlite3",
+    ("javascript", DatabaseType.MONGODB): "mongodb",
+    ("javascript", DatabaseType.REDIS): "ioredis",
+}
+
+# Django's ORM is synchronous
+SYNC_DRIVERS: Dict[DatabaseType, str] = {
+    DatabaseType.POSTGRESQL: "psycopg",
+    DatabaseType.MYSQL: "mysqlclient",
+    DatabaseType.SQLITE: "sqlite3",
+}
+
+# Generation tasks of a project, in order, with the config part they need
+PLAN_TASKS: Dict[BackendFramework, Tuple[Tuple[str, Optional[str]], ...]] = {
+    BackendFramework.FASTAPI: (
+        ("generate_fastapi_app", None),
+        ("generate_sqlalchemy_models", "database"),
+        ("generate_pydantic_models", None),
+        ("generate_fastapi_routes", None),
+        ("generate_fastapi_middleware", None),
+        ("generate_fastapi_dependencies", None),
+        ("generate_fastapi_auth", "auth"),
+    ),
+    BackendFramework.DJANGO: (
+        ("generate_django_project", None),
+        ("generate_django_settings", None),
+        ("generate_django_models", "database"),
+        ("generate_django_views", None),
+        ("generate_django_urls", None),
+        ("generate_django_admin", "database"),
+        ("generate_django_rest_api", None),
+        ("generate_django_auth", "auth"),
+    ),
+    BackendFramework.NESTJS: (
+        ("generate_nestjs_project", None),
+        ("generate_nestjs_modules", None),
+        ("generate_typeorm_entities", "database"),
+        ("generate_nestjs_dtos", None),
+        ("generate_nestjs_services", None),
+        ("generate_nestjs_controllers", None),
+        ("generate_nestjs_pipes", None),
+        ("generate_nestjs_auth", "auth"),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class GenerationPlan:
+    """
+    Resolved, immutable view of a project's config.
+
+    Provides:
+    - ``config``: the frozen config, readable like a ``BackendConfig``
+    - Resolved framework, language, database, ORM, driver and auth method
+    - ``features`` as a frozenset for O(1) membership tests
+    - ``tasks``: the generation tasks of the project, in order
+    - ``fingerprint``: the request fingerprint of the config
+    """
+
+    config: FrozenBackendConfig
+    framework: BackendFramework
+    language: str
+    features: FrozenSet[str]
+    database: Optional[DatabaseType]
+    orm: Optional[ORMType]
+    driver: Optional[str]
+    auth: Optional[AuthMethod]
+    tasks: Tuple[str, ...]
+    fingerprint: str
+
+    def has_feature(self, name: str) -> bool:
+        return name in self.features
+
+    def params(self, architecture: Optional[Dict[str, Any]] = None, **extra: Any) -> Dict[str, Any]:
+        """Task params carrying the plan alongside the plain config dict."""
+        return {"config": self.config.to_dict(), "architecture": architecture or {}, "plan": self, **extra}
+
+
+def resolve_orm(framework: BackendFramework, database: Optional[DatabaseType], orm: Optional[ORMType] = None) -> Optional[ORMType]:
+    if orm is not None or database is None or database == DatabaseType.REDIS:
+        return orm
+    if database == DatabaseType.MONGODB:
+        return DOCUMENT_ORMS.get(framework)
+    return DEFAULT_ORMS.get(framework)
+
+
+def resolve_driver(framework: BackendFramework, language: str, database: Optional[DatabaseType]) -> Optional[str]:
+    if database is None:
+        return None
+    if framework == BackendFramework.DJANGO and database in SYNC_DRIVERS:
+        return SYNC_DRIVERS[database]
+    return DRIVERS.get((language, database))
+
+
+def compile_plan(config: Union[AnyBackendConfig, Dict[str, Any], GenerationPlan]) -> GenerationPlan:
+    """
+    Compile a config (dataclass, frozen or dict) into its ``GenerationPlan``.
+
+    Plans are memoised by frozen config, so compiling the same project
+    again is a dict lookup.
+    """
+    if isinstance(config, GenerationPlan):
+        return config
+    if isinstance(config, BackendConfig):
+        config = config.freeze()
+    elif isinstance(config, dict):
+        config = FrozenBackendConfig.from_dict(config)
+    return _compile(config)
+
+
+@lru_cache(maxsize=256)
+def _compile(config: FrozenBackendConfig) -> GenerationPlan:
+    framework = config.framework
+    language = config.language
+    database = config.database.type if config.database is not None else None
+    driver = config.database.driver if config.database is not None else None
+    auth = config.auth.method if config.auth is not None else None
+    available = {"database": database is not None, "auth": auth is not None}
+
+    return GenerationPlan(
+        config=config,
+        framework=framework,
+        language=language,
+        features=frozenset(config.features),
+        database=database,
+        orm=resolve_orm(framework, database, config.database.orm if config.database is not None else None),
+        driver=driver or resolve_driver(framework, language, database),
+        auth=auth,
+        tasks=tuple(
+            task for task, needs in PLAN_TASKS.get(framework, ())
+            if needs is None or available[needs]
+        ),
+        fingerprint=fingerprint(config)
+    )
@@ -0,0 +1,24 @@
+"""
+Post-processing of LLM output.
+
+Executor layer that keeps CPU-bound parsing of generated code off the
+event loop.
+"""
+
+from .executor import (
+    DEFAULT_OFFLOAD_THRESHOLD,
+    PostProcessor,
+    PostProcessorStats,
+    get_post_processor,
+    run_parsers,
+    set_post_processor,
+)
+
+__all__ = [
+    "DEFAULT_OFFLOAD_THRESHOLD",
+    "PostProcessor",
+    "PostProcessorStats",
+    "get_post_processor",
+    "run_parsers",
+    "set_post_processor",
+]
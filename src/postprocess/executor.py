@@ -0,0 +1,120 @@
+"""
+Post-Processing Executor
+
+Runs CPU-bound post-processing of LLM output (parsing, extraction,
+formatting, syntax checks) in a process pool so the event loop stays free
+for in-flight LLM calls.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import pickle
+
+logger = logging.getLogger(__name__)
+
+# Inputs below this many characters are processed inline: shipping them to
+# another process costs more than parsing them
+DEFAULT_OFFLOAD_THRESHOLD = 32 * 1024
+
+
+def run_parsers(text: str, parsers: Dict[str, Callable[[str], Any]]) -> Dict[str, Any]:
+    """Apply every parser to ``text``; runs inside the worker process."""
+    return {name: parser(text) for name, parser in parsers.items()}
+
+
+@dataclass
+class PostProcessorStats:
+    """Counters for a post-processor."""
+
+    inline: int = 0
+    offloaded: int = 0
+    fallbacks: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"inline": self.inline, "offloaded": self.offloaded, "fallbacks": self.fallbacks}
+
+
+class PostProcessor:
+    """
+    Process-pool executor for post-processing generated code.
+
+    Work on inputs of at least ``threshold`` characters is sent to a lazily
+    created ``ProcessPoolExecutor``; smaller inputs run inline. Callables
+    must be picklable (module-level functions, static methods, or
+    ``functools.partial`` of them). Unpicklable work and a broken pool fall
+    back to inline execution.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, threshold: int = DEFAULT_OFFLOAD_THRESHOLD):
+        if threshold < 0:
+            raise ValueError("threshold must not be negative")
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self.stats = PostProcessorStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        """Schedule ``fn(*args)`` in the process pool and return its future."""
+        self.stats.offloaded += 1
+        return asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, size: Optional[int] = None) -> Any:
+        """Run ``fn(*args)``, offloaded when ``size`` reaches the threshold."""
+        if size is not None and size < self.threshold:
+            self.stats.inline += 1
+            return fn(*args)
+
+        try:
+            return await self.submit(fn, *args)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            if not _is_pickling_error(e):
+                raise
+            logger.warning(f"Post-processing {getattr(fn, '__qualname__', fn)} inline: {e}")
+        except BrokenProcessPool:
+            logger.warning("Post-processing pool broke; recreating it")
+            self._executor = None
+
+        self.stats.fallbacks += 1
+        return fn(*args)
+
+    async def parse(self, text: str, parsers: Dict[str, Callable[[str], Any]]) -> Dict[str, Any]:
+        """Apply several parsers to one LLM response in a single pool job."""
+        size = len(text) if isinstance(text, str) else 0
+        return await self.run(run_parsers, text, parsers, size=size)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+
+def _is_pickling_error(error: Exception) -> bool:
+    return isinstance(error, pickle.PicklingError) or "pickle" in str(error).lower()
+
+
+_default_processor: Optional[PostProcessor] = None
+
+
+def get_post_processor() -> PostProcessor:
+    """Return the process-wide post-processor shared by every agent."""
+    global _default_processor
+    if _default_processor is None:
+        _default_processor = PostProcessor()
+    return _default_processor
+
+
+def set_post_processor(processor: Optional[PostProcessor]) -> None:
+    """Replace the process-wide post-processor (``None`` restores the default)."""
+    global _default_processor
+    if _default_processor is not None and _default_processor is not processor:
+        _default_processor.shutdown(wait=False)
+    _default_processor = processor
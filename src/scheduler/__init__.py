@@ -0,0 +1,30 @@
+"""
+Generation scheduling.
+
+Multi-tenant job queue and worker pool in front of the framework agents,
+plus broker-fed worker processes for distributed generation.
+"""
+
+from .broker import InMemoryBroker, JobBroker, RedisBroker, SQLiteBroker, open_broker
+from .distributed import BrokerWorker, DistributedScheduler, run_worker, spawn_workers
+from .jobs import FairJobQueue, GenerationJob, JobStatus, estimate_job_cost
+from .pool import PROJECT_TASKS, GenerationScheduler, SchedulerMetrics
+
+__all__ = [
+    "InMemoryBroker",
+    "JobBroker",
+    "RedisBroker",
+    "SQLiteBroker",
+    "open_broker",
+    "BrokerWorker",
+    "DistributedScheduler",
+    "run_worker",
+    "spawn_workers",
+    "FairJobQueue",
+    "GenerationJob",
+    "JobStatus",
+    "estimate_job_cost",
+    "PROJECT_TASKS",
+    "GenerationScheduler",
+    "SchedulerMetrics",
+]
@@ -0,0 +1,411 @@
+"""
+Job Brokers
+
+Queues that carry generation jobs from submitters to worker processes and
+results back by job ID. ``RedisBroker`` is the production transport (the
+instance under ``docker/redis``); ``SQLiteBroker`` serves worker processes
+on one machine and ``InMemoryBroker`` a single process, mainly for tests.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import heapq
+import itertools
+import json
+import sqlite3
+import time
+
+# Messages are JSON objects with at least "id" and "priority";
+# results are serialized ``TaskResult`` fields
+Message = Dict[str, Any]
+
+# Seconds a claimed job may go without a heartbeat before it is redelivered
+DEFAULT_VISIBILITY_TIMEOUT = 300.0
+
+
+def encode(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class JobBroker(ABC):
+    """
+    Interface shared by the brokers.
+
+    Jobs are dequeued highest ``priority`` first, then in submission order.
+    Every dequeued job is claimed by one worker at a time. Brokers shared
+    between processes redeliver a claim that has not been completed or
+    ``touch``-ed within ``visibility_timeout`` seconds, so a job whose
+    worker died runs again (delivery is at least once).
+    """
+
+    visibility_timeout: Optional[float] = None
+
+    @abstractmethod
+    async def enqueue(self, message: Message) -> None:
+        """Queue a job."""
+
+    @abstractmethod
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Message]:
+        """Claim the next job, or return ``None`` after ``timeout`` seconds."""
+
+    @abstractmethod
+    async def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Publish the result of a claimed job."""
+
+    @abstractmethod
+    async def get_result(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait for the result of ``job_id``; ``None`` if ``timeout`` expires first."""
+
+    async def touch(self, job_id: str) -> None:
+        """Extend the claim on a running job (heartbeat)."""
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryBroker(JobBroker):
+    """Broker for workers running in the submitting process."""
+
+    def __init__(self):
+        self._queue: List[Tuple[int, int, Message]] = []
+        self._counter = itertools.count()
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._changed: Optional[asyncio.Condition] = None
+
+    async def enqueue(self, message: Message) -> None:
+        async with self._condition():
+            heapq.heappush(self._queue, (-message.get("priority", 0), next(self._counter), message))
+            self._changed.notify_all()
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Message]:
+        async with self._condition():
+            if not await self._wait_for(lambda: self._queue, timeout):
+                return None
+            return heapq.heappop(self._queue)[2]
+
+    async def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        async with self._condition():
+            # Round-trip through JSON so results match the other brokers
+            self._results[job_id] = json.loads(encode(result))
+            self._changed.notify_all()
+
+    async def get_result(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        async with self._condition():
+            if not await self._wait_for(lambda: job_id in self._results, timeout):
+                return None
+            return self._results[job_id]
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def _wait_for(self, predicate, timeout: Optional[float]) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait_for(predicate), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class SQLiteBroker(JobBroker):
+    """
+    Broker backed by a SQLite file shared by processes on one machine.
+
+    Each call opens its own connection, so instances can be created in
+    worker processes from the same ``path``. Jobs are claimed inside an
+    immediate transaction, which first returns expired claims to the
+    queue; waiting is done by polling every ``poll_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        poll_interval: float = 0.05,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT
+    ):
+        if visibility_timeout <= 0:
+            raise ValueError("visibility_timeout must be positive")
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = self._connect()
+        try:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL, "
+                "priority INTEGER NOT NULL, message TEXT NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'queued', result TEXT, "
+                "claimed_at REAL, finished_at REAL)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_queue "
+                "ON jobs (status, priority DESC, seq)"
+            )
+        finally:
+            db.close()
+
+    async def enqueue(self, message: Message) -> None:
+        await asyncio.to_thread(self._insert, message)
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Message]:
+        return await self._poll(self._claim, timeout)
+
+    async def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._store, job_id, encode(result))
+
+    async def get_result(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        return await self._poll(lambda: self._load(job_id), timeout)
+
+    async def touch(self, job_id: str) -> None:
+        await asyncio.to_thread(self._touch, job_id)
+
+    async def _poll(self, fetch, timeout: Optional[float]) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            value = await asyncio.to_thread(fetch)
+            if value is not None:
+                return value
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; ``_claim`` manages its own transaction
+        return sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+
+    def _insert(self, message: Message) -> None:
+        db = self._connect()
+        try:
+            db.execute(
+                "INSERT INTO jobs (id, priority, message) VALUES (?, ?, ?)",
+                (message["id"], message.get("priority", 0), encode(message))
+            )
+        finally:
+            db.close()
+
+    def _claim(self) -> Optional[Message]:
+        db = self._connect()
+        now = time.time()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            # Redeliver jobs whose worker stopped sending heartbeats
+            db.execute(
+                "UPDATE jobs SET status = 'queued', claimed_at = NULL "
+                "WHERE status = 'running' AND claimed_at < ?",
+                (now - self.visibility_timeout,)
+            )
+            row = db.execute(
+                "SELECT seq, message FROM jobs WHERE status = 'queued' "
+                "ORDER BY priority DESC, seq LIMIT 1"
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', claimed_at = ? WHERE seq = ?",
+                (now, row[0])
+            )
+            db.execute("COMMIT")
+            return json.loads(row[1])
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def _touch(self, job_id: str) -> None:
+        db = self._connect()
+        try:
+            db.execute(
+                "UPDATE jobs SET claimed_at = ? WHERE id = ? AND status = 'running'",
+                (time.time(), job_id)
+            )
+        finally:
+            db.close()
+
+    def _store(self, job_id: str, encoded: str) -> None:
+        db = self._connect()
+        try:
+            db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, finished_at = ? WHERE id = ?",
+                (encoded, time.time(), job_id)
+            )
+        finally:
+            db.close()
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        db = self._connect()
+        try:
+            row = db.execute(
+                "SELECT result FROM jobs WHERE id = ? AND status = 'done'",
+                (job_id,)
+            ).fetchone()
+        finally:
+            db.close()
+        return None if row is None else json.loads(row[0])
+
+
+# Atomically return expired claims to the queue, then move the first queued
+# job into the processing set (scored by its claim deadline) and return it.
+# KEYS: queue, processing, messages, scores; ARGV: visibility timeout
+_CLAIM_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+    redis.call('ZREM', KEYS[2], id)
+    local score = redis.call('HGET', KEYS[4], id)
+    if score then
+        redis.call('ZADD', KEYS[1], score, id)
+    end
+end
+local head = redis.call('ZRANGE', KEYS[1], 0, 0)
+if #head == 0 then
+    return false
+end
+local id = head[1]
+redis.call('ZREM', KEYS[1], id)
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[1]), id)
+return redis.call('HGET', KEYS[3], id)
+"""
+
+# Push a running job's claim deadline forward. KEYS: processing; ARGV: id, visibility timeout
+_TOUCH_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+return redis.call('ZADD', KEYS[1], 'XX', now + tonumber(ARGV[2]), ARGV[1])
+"""
+
+
+class RedisBroker(JobBroker):
+    """
+    Broker backed by Redis, for workers on several machines.
+
+    Jobs live in a sorted set scored by priority and submission sequence.
+    A Lua script claims the head atomically by moving it into a processing
+    set scored by its claim deadline; the message stays stored until the
+    job completes, and claims not touched within ``visibility_timeout`` are
+    moved back to the queue by the next claim. Idle workers block on a
+    wake-up list instead of polling. Results are stored under
+    ``{namespace}:result:{id}`` for ``result_ttl`` seconds. Requires the
+    ``redis`` package (``pip install genesis-backend[redis]``).
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        namespace: str = "genesis:jobs",
+        result_ttl: int = 24 * 3600,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT
+    ):
+        if visibility_timeout <= 0:
+            raise ValueError("visibility_timeout must be positive")
+        self.url = url
+        self.namespace = namespace
+        self.result_ttl = result_ttl
+        self.visibility_timeout = visibility_timeout
+        self._client = None
+        self._claim = None
+        self._touch = None
+
+    async def enqueue(self, message: Message) -> None:
+        client = self._redis()
+        sequence = await client.incr(self._key("sequence"))
+        # Higher priority sorts first; submission order breaks ties
+        score = -message.get("priority", 0) * 1e12 + sequence
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key("messages"), message["id"], encode(message))
+            pipe.hset(self._key("scores"), message["id"], repr(score))
+            pipe.zadd(self._key("queue"), {message["id"]: score})
+            pipe.rpush(self._key("ready"), 1)
+            await pipe.execute()
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Message]:
+        client = self._redis()
+        deadline = time.monotonic() + timeout
+        while True:
+            encoded = await self._claim(
+                keys=[self._key("queue"), self._key("processing"), self._key("messages"), self._key("scores")],
+                args=[self.visibility_timeout]
+            )
+            if encoded is not None:
+                return json.loads(encoded)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Expired claims are only noticed by a claim, so wake at least every second
+            await client.blpop(self._key("ready"), timeout=min(remaining, 1.0))
+
+    async def touch(self, job_id: str) -> None:
+        self._redis()
+        await self._touch(keys=[self._key("processing")], args=[job_id, self.visibility_timeout])
+
+    async def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        client = self._redis()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.set(self._key("result", job_id), encode(result), ex=self.result_ttl)
+            pipe.zrem(self._key("processing"), job_id)
+            pipe.hdel(self._key("messages"), job_id)
+            pipe.hdel(self._key("scores"), job_id)
+            pipe.rpush(self._key("done", job_id), 1)
+            pipe.expire(self._key("done", job_id), self.result_ttl)
+            await pipe.execute()
+
+    async def get_result(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        client = self._redis()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            encoded = await client.get(self._key("result", job_id))
+            if encoded is not None:
+                return json.loads(encoded)
+            remaining = 1.0 if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Another waiter may take the notification, so wake at least every second
+            await client.blpop(self._key("done", job_id), timeout=min(remaining, 1.0))
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _redis(self):
+        if self._client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError("RedisBroker requires the 'redis' package") from e
+            self._client = redis.from_url(self.url)
+            self._claim = self._client.register_script(_CLAIM_SCRIPT)
+            self._touch = self._client.register_script(_TOUCH_SCRIPT)
+        return self._client
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.namespace,) + parts)
+
+
+def _text(value: Union[str, bytes]) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def open_broker(url: str) -> JobBroker:
+    """
+    Create a broker from a URL.
+
+    - ``memory://``: ``InMemoryBroker`` (single process only)
+    - ``sqlite:///jobs.db`` (relative) or ``sqlite:////var/jobs.db``: ``SQLiteBroker``
+    - ``redis://host:port/db`` or ``rediss://...``: ``RedisBroker``
+    """
+    scheme, _, rest = url.partition("://")
+    if scheme == "memory":
+        return InMemoryBroker()
+    if scheme == "sqlite":
+        return SQLiteBroker(rest[1:] if rest.startswith("/") else rest)
+    if scheme in ("redis", "rediss"):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported broker URL: {url}")
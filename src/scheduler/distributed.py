@@ -0,0 +1,216 @@
+"""
+Distributed Generation
+
+Runs generation jobs on worker processes fed through a ``JobBroker``, on
+one machine or several. Submitters use ``DistributedScheduler``; each worker
+process runs a ``BrokerWorker`` with its own agents and event loop.
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import multiprocessing
+import uuid
+
+from genesis_agents import AgentTask, TaskResult
+
+from ..config import AnyBackendConfig, BackendFramework
+from ..plan import compile_plan
+from .broker import JobBroker, Message, open_broker
+from .pool import PROJECT_TASKS, _default_agent
+
+logger = logging.getLogger(__name__)
+
+
+def result_to_dict(result: TaskResult) -> Dict[str, Any]:
+    return {
+        "task_id": result.task_id,
+        "success": result.success,
+        "result": result.result,
+        "error": result.error,
+        "metadata": result.metadata or {},
+    }
+
+
+def result_from_dict(data: Dict[str, Any]) -> TaskResult:
+    return TaskResult(
+        task_id=data["task_id"],
+        success=data["success"],
+        result=data.get("result"),
+        error=data.get("error"),
+        metadata=data.get("metadata") or {}
+    )
+
+
+class DistributedScheduler:
+    """
+    Submit side of distributed generation.
+
+    ``submit`` puts a job on the broker and returns its ID; ``result``
+    waits for whichever worker ran it.
+    """
+
+    def __init__(self, broker: JobBroker):
+        self.broker = broker
+
+    async def submit(
+        self,
+        config: AnyBackendConfig,
+        architecture: Optional[Dict[str, Any]] = None,
+        tenant: str = "default",
+        priority: int = 0
+    ) -> str:
+        task_name = PROJECT_TASKS.get(config.framework)
+        if task_name is None:
+            raise ValueError(f"No generator for framework {config.framework.value}")
+
+        job_id = uuid.uuid4().hex
+        await self.broker.enqueue({
+            "id": job_id,
+            "framework": config.framework.value,
+            "task": task_name,
+            "params": {"config": config.to_dict(), "architecture": architecture or {}},
+            "tenant": tenant,
+            "priority": priority,
+        })
+        return job_id
+
+    async def result(self, job_id: str, timeout: Optional[float] = None) -> TaskResult:
+        """Wait for a job's ``TaskResult``; raises ``asyncio.TimeoutError`` on timeout."""
+        data = await self.broker.get_result(job_id, timeout)
+        if data is None:
+            raise asyncio.TimeoutError(f"No result for job {job_id} within {timeout}s")
+        return result_from_dict(data)
+
+
+class BrokerWorker:
+    """
+    Consumer side of distributed generation.
+
+    Responsibilities:
+    - Claim jobs from the broker, ``concurrency`` at a time
+    - Run each on the agent for its framework, touching the claim meanwhile
+    - Publish the ``TaskResult`` (or the failure) back by job ID
+    """
+
+    def __init__(
+        self,
+        broker: JobBroker,
+        agents: Optional[Dict[BackendFramework, Any]] = None,
+        concurrency: int = 1,
+        poll_timeout: float = 1.0
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.broker = broker
+        self.concurrency = concurrency
+        self.poll_timeout = poll_timeout
+        self.processed = 0
+
+        self._agents: Dict[BackendFramework, Any] = dict(agents or {})
+        self._stopping = False
+
+    async def run(self, max_jobs: Optional[int] = None) -> int:
+        """
+        Process jobs until ``stop`` is called or ``max_jobs`` have run.
+
+        Returns the number of jobs this call processed.
+        """
+        self._stopping = False
+        start = self.processed
+        await asyncio.gather(*(self._loop(start, max_jobs) for _ in range(self.concurrency)))
+        return self.processed - start
+
+    def stop(self) -> None:
+        """Finish the running jobs and return from ``run``."""
+        self._stopping = True
+
+    async def _loop(self, start: int, max_jobs: Optional[int]) -> None:
+        while not self._stopping:
+            if max_jobs is not None and self.processed - start >= max_jobs:
+                return
+            message = await self.broker.dequeue(self.poll_timeout)
+            if message is None:
+                continue
+            heartbeat = asyncio.create_task(self._heartbeat(message["id"]))
+            try:
+                result = await self._execute(message)
+            finally:
+                heartbeat.cancel()
+            await self.broker.complete(message["id"], result_to_dict(result))
+            self.processed += 1
+
+    async def _heartbeat(self, job_id: str) -> None:
+        # Keep the claim ahead of the broker's visibility timeout so long
+        # jobs are not redelivered while this worker is still running them
+        if not self.broker.visibility_timeout:
+            return
+        while True:
+            await asyncio.sleep(self.broker.visibility_timeout / 3)
+            try:
+                await self.broker.touch(job_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+
+    async def _execute(self, message: Message) -> TaskResult:
+        try:
+            agent = self._agent_for(BackendFramework(message["framework"]))
+            # Plans are not serialisable; compile once here for all of the job's tasks
+            params = dict(message["params"])
+            params["plan"] = compile_plan(params["config"])
+            return await agent.execute_task(AgentTask(
+                id=message["id"],
+                name=message["task"],
+                params=params
+            ))
+        except Exception as e:
+            logger.error(f"Job {message['id']} for tenant {message.get('tenant')} failed: {e}")
+            return TaskResult(
+                task_id=message["id"],
+                success=False,
+                error=str(e),
+                metadata={"tenant": message.get("tenant")}
+            )
+
+    def _agent_for(self, framework: BackendFramework) -> Any:
+        agent = self._agents.get(framework)
+        if agent is None:
+            agent = self._agents[framework] = _default_agent(framework)
+        return agent
+
+
+def run_worker(broker_url: str, concurrency: int = 1, max_jobs: Optional[int] = None) -> int:
+    """Run a ``BrokerWorker`` on ``broker_url`` in the current process."""
+
+    async def main() -> int:
+        broker = open_broker(broker_url)
+        try:
+            return await BrokerWorker(broker, concurrency=concurrency).run(max_jobs)
+        finally:
+            await broker.close()
+
+    return asyncio.run(main())
+
+
+def spawn_workers(broker_url: str, processes: int, concurrency: int = 1) -> List[multiprocessing.Process]:
+    """
+    Start ``processes`` worker processes consuming ``broker_url``.
+
+    Each process has its own event loop, agents and LLM client, so
+    throughput grows with the number of processes. Stop them with
+    ``terminate``; in-flight jobs are lost.
+    """
+    if broker_url.startswith("memory://"):
+        raise ValueError("memory:// brokers cannot be shared with worker processes")
+
+    workers = []
+    for index in range(processes):
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(broker_url, concurrency),
+            name=f"genesis-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        workers.append(process)
+    return workers
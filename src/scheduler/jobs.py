@@ -0,0 +1,184 @@
+"""
+Generation Jobs
+
+Job model and the multi-tenant priority queue used by the generation
+scheduler.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import heapq
+import itertools
+import time
+import uuid
+
+from genesis_agents import TaskResult
+
+from ..config import AnyBackendConfig
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a generation job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+def estimate_job_cost(architecture: Dict[str, Any]) -> float:
+    """Relative size of a job: one unit plus one per entity or data model."""
+    entities = architecture.get("entities") or architecture.get("data_models") or []
+    return 1.0 + (len(entities) if isinstance(entities, (list, dict)) else 0)
+
+
+@dataclass(eq=False)
+class GenerationJob:
+    """A backend config (mutable or frozen) plus architecture to generate for one tenant."""
+
+    config: AnyBackendConfig
+    architecture: Dict[str, Any] = field(default_factory=dict)
+    tenant: str = "default"
+    priority: int = 0
+    cost: Optional[float] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[TaskResult] = None
+
+    def __post_init__(self) -> None:
+        if self.cost is None:
+            self.cost = estimate_job_cost(self.architecture)
+        if self.cost <= 0:
+            raise ValueError("cost must be positive")
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """Seconds spent queued (``None`` until the job starts)."""
+        return None if self.started_at is None else self.started_at - self.submitted_at
+
+    @property
+    def run_time(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class FairJobQueue:
+    """
+    Priority queue with per-tenant fair sharing.
+
+    Jobs are grouped by base ``priority``. The group whose oldest job has
+    the highest effective level goes first, where a job's level is its
+    priority plus one per ``aging_seconds`` spent waiting, so low-priority
+    work cannot starve; ties go to the higher base priority. Aging only
+    moves a group against other priorities: within one priority, jobs are
+    ordered by weighted fair queuing, the tenant with the least virtual
+    start time first. Service is charged per job cost, so a tenant running
+    large jobs (or holding an old backlog) yields to tenants with small
+    ones while its own jobs keep progressing. A tenant's jobs of the same
+    priority run in submission order.
+
+    ``pop`` costs O(priorities × tenants + log jobs): each group keeps a
+    FIFO per tenant and a heap of submission times, from which removed
+    jobs are dropped lazily.
+    """
+
+    def __init__(
+        self,
+        aging_seconds: Optional[float] = 60.0,
+        tenant_weights: Optional[Dict[str, float]] = None
+    ):
+        if aging_seconds is not None and aging_seconds <= 0:
+            raise ValueError("aging_seconds must be positive")
+        self.aging_seconds = aging_seconds
+        self.tenant_weights: Dict[str, float] = dict(tenant_weights or {})
+
+        self._groups: Dict[int, Dict[str, Deque[GenerationJob]]] = {}
+        self._oldest: Dict[int, List[Tuple[float, int, GenerationJob]]] = {}
+        self._depth: Dict[str, int] = {}
+        # Push sequence of every queued job; heap entries not in here are stale
+        self._sequence: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self._service: Dict[str, float] = {}
+        self._virtual_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self._sequence)
+
+    def push(self, job: GenerationJob) -> None:
+        if job.id in self._sequence:
+            self._remove(job)
+        sequence = next(self._counter)
+        self._sequence[job.id] = sequence
+        self._groups.setdefault(job.priority, {}).setdefault(job.tenant, deque()).append(job)
+        heapq.heappush(self._oldest.setdefault(job.priority, []), (job.submitted_at, sequence, job))
+        self._depth[job.tenant] = self._depth.get(job.tenant, 0) + 1
+
+    def pop(self, now: Optional[float] = None) -> Optional[GenerationJob]:
+        """Remove and return the next job to run, or ``None`` if empty."""
+        now = time.monotonic() if now is None else now
+        best_group = None
+        best_key = None
+        for priority in self._groups:
+            key = (self._level(self._oldest_job(priority), now), priority)
+            if best_key is None or key > best_key:
+                best_group, best_key = priority, key
+
+        if best_group is None:
+            return None
+
+        tenants = self._groups[best_group]
+        start, _, tenant = min(
+            (max(self._service.get(tenant, 0.0), self._virtual_time), self._sequence[jobs[0].id], tenant)
+            for tenant, jobs in tenants.items()
+        )
+        job = tenants[tenant][0]
+        self._remove(job)
+        weight = self.tenant_weights.get(tenant, 1.0)
+        self._service[tenant] = start + job.cost / weight
+        self._virtual_time = start
+        return job
+
+    def remove(self, job: GenerationJob) -> bool:
+        """Drop a queued job; returns ``False`` if it was not queued."""
+        if job.id not in self._sequence:
+            return False
+        self._remove(job)
+        return True
+
+    def depth_by_tenant(self) -> Dict[str, int]:
+        return dict(self._depth)
+
+    def _level(self, job: GenerationJob, now: float) -> int:
+        if self.aging_seconds is None:
+            return job.priority
+        return job.priority + int((now - job.submitted_at) // self.aging_seconds)
+
+    def _oldest_job(self, priority: int) -> GenerationJob:
+        heap = self._oldest[priority]
+        while self._sequence.get(heap[0][2].id) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][2]
+
+    def _remove(self, job: GenerationJob) -> None:
+        del self._sequence[job.id]
+        tenants = self._groups[job.priority]
+        jobs = tenants[job.tenant]
+        if jobs[0] is job:
+            jobs.popleft()
+        else:
+            jobs.remove(job)
+        if not jobs:
+            del tenants[job.tenant]
+            if not tenants:
+                del self._groups[job.priority]
+                del self._oldest[job.priority]
+        self._depth[job.tenant] -= 1
+        if not self._depth[job.tenant]:
+            del self._depth[job.tenant]
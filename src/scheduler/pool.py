@@ -0,0 +1,280 @@
+"""
+Generation Scheduler
+
+Worker pool that runs queued generation jobs on the framework agents.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from genesis_agents import AgentTask, TaskResult
+
+from ..config import AnyBackendConfig, BackendFramework
+from ..plan import compile_plan
+from .jobs import FairJobQueue, GenerationJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Task that generates a whole project on each framework's agent
+PROJECT_TASKS: Dict[BackendFramework, str] = {
+    BackendFramework.FASTAPI: "generate_fastapi_app",
+    BackendFramework.DJANGO: "generate_django_project",
+    BackendFramework.NESTJS: "generate_nestjs_project",
+}
+
+
+def _default_agent(framework: BackendFramework) -> Any:
+    from ..agents import DjangoAgent, FastAPIAgent, NestJSAgent
+
+    agents = {
+        BackendFramework.FASTAPI: FastAPIAgent,
+        BackendFramework.DJANGO: DjangoAgent,
+        BackendFramework.NESTJS: NestJSAgent,
+    }
+    return agents[framework]()
+
+
+# Recent waits kept per tenant for the p95; count, mean and max stay exact
+WAIT_WINDOW = 1024
+
+
+@dataclass
+class WaitStats:
+    """Wait times of one tenant (or all): exact totals plus a window of recent waits."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=WAIT_WINDOW))
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0, "mean": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(self.recent)
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4),
+            "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+            "max": round(self.max, 4),
+        }
+
+
+@dataclass
+class SchedulerMetrics:
+    """Queue and job counters for a scheduler."""
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    max_queue_depth: int = 0
+    waits: WaitStats = field(default_factory=WaitStats)
+    wait_times: Dict[str, WaitStats] = field(default_factory=dict)
+
+    def record_wait(self, tenant: str, seconds: float) -> None:
+        self.waits.record(seconds)
+        self.wait_times.setdefault(tenant, WaitStats()).record(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "max_queue_depth": self.max_queue_depth,
+            "wait_seconds": self.waits.summary(),
+            "wait_seconds_by_tenant": {
+                tenant: waits.summary()
+                for tenant, waits in sorted(self.wait_times.items())
+            },
+        }
+
+
+class GenerationScheduler:
+    """
+    Multi-tenant scheduler in front of the framework agents.
+
+    Responsibilities:
+    - Queue jobs with priorities and per-tenant fair sharing (``FairJobQueue``)
+    - Run them on ``workers`` concurrent workers
+    - Dispatch each job to the agent for its ``config.framework``
+    - Track queue depth and wait times per tenant
+
+    Use as ``async with GenerationScheduler(...) as scheduler`` or call
+    ``start``/``stop`` explicitly.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        agents: Optional[Dict[BackendFramework, Any]] = None,
+        queue: Optional[FairJobQueue] = None
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.queue = queue if queue is not None else FairJobQueue()
+        self.metrics = SchedulerMetrics()
+
+        self._agents: Dict[BackendFramework, Any] = dict(agents or {})
+        self._futures: Dict[str, "asyncio.Future[TaskResult]"] = {}
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._closing = False
+
+    async def __aenter__(self) -> "GenerationScheduler":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.queue)
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._closing = False
+        self._ready = asyncio.Semaphore(len(self.queue))
+        self._workers = [
+            asyncio.ensure_future(self._worker(index))
+            for index in range(self.workers)
+        ]
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the workers.
+
+        With ``drain`` queued jobs are run first; otherwise they are
+        cancelled. Running jobs always finish.
+        """
+        if not self._workers:
+            return
+        if drain:
+            await asyncio.gather(*self._futures.values(), return_exceptions=True)
+        else:
+            while True:
+                job = self.queue.pop()
+                if job is None:
+                    break
+                self._finish(job, JobStatus.CANCELLED, None)
+
+        self._closing = True
+        for _ in self._workers:
+            self._ready.release()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        config: AnyBackendConfig,
+        architecture: Optional[Dict[str, Any]] = None,
+        tenant: str = "default",
+        priority: int = 0,
+        cost: Optional[float] = None
+    ) -> GenerationJob:
+        """Queue a job; await ``wait(job)`` for its ``TaskResult``."""
+        job = GenerationJob(
+            config=config,
+            architecture=architecture or {},
+            tenant=tenant,
+            priority=priority,
+            cost=cost
+        )
+        self._futures[job.id] = asyncio.get_running_loop().create_future()
+        self.queue.push(job)
+
+        self.metrics.submitted += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, len(self.queue))
+        if self._ready is not None:
+            self._ready.release()
+        return job
+
+    async def wait(self, job: GenerationJob) -> TaskResult:
+        """Wait for ``job`` to finish; raises ``CancelledError`` if it was cancelled."""
+        future = self._futures.get(job.id)
+        if future is None:
+            if job.status == JobStatus.CANCELLED:
+                raise asyncio.CancelledError()
+            return job.result
+        return await asyncio.shield(future)
+
+    def cancel(self, job: GenerationJob) -> bool:
+        """Cancel a job that has not started yet."""
+        if not self.queue.remove(job):
+            return False
+        self._finish(job, JobStatus.CANCELLED, None)
+        return True
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            await self._ready.acquire()
+            if self._closing:
+                return
+            # The permit may belong to a job that was cancelled while queued
+            job = self.queue.pop()
+            if job is not None:
+                await self._run(job)
+
+    async def _run(self, job: GenerationJob) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.monotonic()
+        self.metrics.record_wait(job.tenant, job.wait_time)
+
+        try:
+            framework = job.config.framework
+            task_name = PROJECT_TASKS.get(framework)
+            if task_name is None:
+                raise ValueError(f"No generator for framework {framework.value}")
+
+            result = await self._agent_for(framework).execute_task(AgentTask(
+                id=job.id,
+                name=task_name,
+                params=compile_plan(job.config).params(job.architecture)
+            ))
+        except Exception as e:
+            logger.error(f"Job {job.id} for tenant {job.tenant} failed: {e}")
+            result = TaskResult(
+                task_id=job.id,
+                success=False,
+                error=str(e),
+                metadata={"tenant": job.tenant}
+            )
+
+        self._finish(job, JobStatus.SUCCEEDED if result.success else JobStatus.FAILED, result)
+
+    def _agent_for(self, framework: BackendFramework) -> Any:
+        agent = self._agents.get(framework)
+        if agent is None:
+            agent = self._agents[framework] = _default_agent(framework)
+        return agent
+
+    def _finish(self, job: GenerationJob, status: JobStatus, result: Optional[TaskResult]) -> None:
+        job.status = status
+        job.finished_at = time.monotonic()
+        job.result = result
+
+        if status == JobStatus.SUCCEEDED:
+            self.metrics.succeeded += 1
+        elif status == JobStatus.FAILED:
+            self.metrics.failed += 1
+        else:
+            self.metrics.cancelled += 1
+
+        future = self._futures.pop(job.id)
+        if status == JobStatus.CANCELLED:
+            future.cancel()
+        else:
+            future.set_result(result)
@@ -0,0 +1,36 @@
+"""
+Workflow orchestration.
+
+Runs agent tasks as a dependency graph so independent phases execute
+concurrently, and regenerates projects incrementally from input diffs.
+"""
+
+from .architecture import architecture_workflow
+from .checkpoint import CheckpointStore, workflow_fingerprint
+from .engine import Ref, Workflow, WorkflowNode, WorkflowResult
+from .incremental import (
+    FASTAPI_STEPS,
+    ArtifactStore,
+    GenerationStep,
+    IncrementalGenerator,
+    IncrementalResult,
+)
+from .speculative import SpeculativeGenerator, SpeculativeResult, accepts_architecture
+
+__all__ = [
+    "Ref",
+    "Workflow",
+    "WorkflowNode",
+    "WorkflowResult",
+    "architecture_workflow",
+    "CheckpointStore",
+    "workflow_fingerprint",
+    "FASTAPI_STEPS",
+    "ArtifactStore",
+    "GenerationStep",
+    "IncrementalGenerator",
+    "IncrementalResult",
+    "SpeculativeGenerator",
+    "SpeculativeResult",
+    "accepts_architecture",
+]
@@ -0,0 +1,68 @@
+"""
+Architecture Workflow
+
+The ``ArchitectAgent`` phases declared as a dependency graph.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .checkpoint import CheckpointStore
+from .engine import Ref, Workflow
+
+
+def architecture_workflow(
+    architect: Any,
+    description: str,
+    features: Optional[List[str]] = None,
+    constraints: Optional[List[str]] = None,
+    preferences: Optional[Dict[str, Any]] = None,
+    entities: Optional[List[Any]] = None,
+    workflow_id: str = "architecture",
+    max_concurrency: Optional[int] = None,
+    checkpoint: Optional[CheckpointStore] = None
+) -> Workflow:
+    """
+    Build the backend architecture workflow.
+
+    Node ids: ``requirements``, ``technologies``, ``api_design``,
+    ``data_models``, ``services`` and ``validation``. Technology selection
+    runs alongside API design; validation receives every design result.
+    Generation nodes can be added to the returned workflow and reference
+    these nodes with ``Ref``.
+    """
+    workflow = Workflow(workflow_id=workflow_id, max_concurrency=max_concurrency, checkpoint=checkpoint)
+    requirements = Ref("requirements", "backend_requirements")
+    api_specification = Ref("api_design", "api_specification")
+
+    workflow.add("requirements", architect, "analyze_backend_requirements", {
+        "description": description,
+        "features": features or [],
+        "constraints": constraints or [],
+    })
+    workflow.add("technologies", architect, "select_backend_technologies", {
+        "requirements": requirements,
+        "constraints": constraints or [],
+        "preferences": preferences or {},
+    })
+    workflow.add("api_design", architect, "design_api_architecture", {
+        "requirements": requirements,
+        "entities": entities or [],
+    })
+    workflow.add("data_models", architect, "design_data_models", {
+        "requirements": requirements,
+        "api_design": api_specification,
+    })
+    workflow.add("services", architect, "design_service_architecture", {
+        "data_models": Ref("data_models", "data_models"),
+        "api_design": api_specification,
+    })
+    workflow.add("validation", architect, "validate_backend_architecture", {
+        "architecture": {
+            "requirements": Ref("requirements"),
+            "technologies": Ref("technologies"),
+            "api_design": Ref("api_design"),
+            "data_models": Ref("data_models"),
+            "services": Ref("services"),
+        },
+    })
+    return workflow
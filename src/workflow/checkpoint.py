@@ -0,0 +1,135 @@
+"""
+Workflow Checkpoints
+
+Persists completed node results so a failed workflow can be retried
+without re-running the nodes that already succeeded.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from genesis_agents import TaskResult
+
+logger = logging.getLogger(__name__)
+
+
+def _canonical(value: Any) -> Any:
+    # Late import: ``Ref`` lives in the engine, which imports this module
+    from .engine import Ref
+
+    if isinstance(value, Ref):
+        return {"$ref": value.node, "path": value.path}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def workflow_fingerprint(workflow: Any) -> str:
+    """
+    Digest of a workflow's inputs: every node's task name, params and
+    dependencies. Agents are left out, so a retry with fresh agent
+    instances resumes the same checkpoints.
+    """
+    nodes = {
+        node_id: {
+            "task": node.task_name,
+            "params": _canonical(node.params),
+            "depends_on": sorted(node.depends_on),
+        }
+        for node_id, node in workflow.nodes.items()
+    }
+    payload = json.dumps(nodes, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """
+    SQLite store of successful node results.
+
+    Keyed by workflow ID, workflow fingerprint and node ID, so changing any
+    node's inputs starts the workflow afresh. ``path=None`` keeps the store
+    in memory for the lifetime of the process.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(self.path) if self.path is not None else ":memory:",
+            check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "workflow_id TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "node TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (workflow_id, fingerprint, node))"
+        )
+        self._db.commit()
+
+    def load(self, workflow_id: str, fingerprint: str) -> Dict[str, TaskResult]:
+        """Checkpointed results of a workflow run, keyed by node ID."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT node, result FROM checkpoints WHERE workflow_id = ? AND fingerprint = ?",
+                (workflow_id, fingerprint)
+            ).fetchall()
+
+        restored = {}
+        for node, encoded in rows:
+            data = json.loads(encoded)
+            restored[node] = TaskResult(
+                task_id=data["task_id"],
+                success=data["success"],
+                result=data.get("result"),
+                error=data.get("error"),
+                metadata=data.get("metadata") or {}
+            )
+        return restored
+
+    def save(self, workflow_id: str, fingerprint: str, node: str, result: TaskResult) -> None:
+        """Checkpoint a successful node result; failures are never stored."""
+        if not result.success:
+            return
+        encoded = json.dumps({
+            "task_id": result.task_id,
+            "success": result.success,
+            "result": result.result,
+            "error": result.error,
+            "metadata": result.metadata or {},
+        }, default=str)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (workflow_id, fingerprint, node, result, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (workflow_id, fingerprint, node, encoded, time.time())
+            )
+            self._db.commit()
+
+    def clear(self, workflow_id: str, fingerprint: Optional[str] = None) -> None:
+        """Drop the checkpoints of a workflow (of one fingerprint, if given)."""
+        with self._lock:
+            if fingerprint is None:
+                self._db.execute("DELETE FROM checkpoints WHERE workflow_id = ?", (workflow_id,))
+            else:
+                self._db.execute(
+                    "DELETE FROM checkpoints WHERE workflow_id = ? AND fingerprint = ?",
+                    (workflow_id, fingerprint)
+                )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,269 @@
+"""
+Workflow Engine
+
+Declarative dependency graph of agent tasks. Nodes run as soon as the
+nodes they depend on have succeeded, so independent branches execute
+concurrently and wall time follows the critical path.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+import time
+
+from genesis_agents import AgentTask, TaskResult
+
+from .checkpoint import CheckpointStore, workflow_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Ref:
+    """
+    Reference to an upstream node's result, resolved when the node runs.
+
+    ``path`` is a dotted path into the result (``"api_specification.endpoints"``);
+    an empty path refers to the whole result. The referenced object is
+    passed as-is, not copied.
+    """
+
+    node: str
+    path: str = ""
+
+    def resolve(self, results: Dict[str, TaskResult]) -> Any:
+        value = results[self.node].result
+        for part in filter(None, self.path.split(".")):
+            value = value[part] if isinstance(value, dict) else getattr(value, part)
+        return value
+
+
+def _find_refs(value: Any) -> Set[str]:
+    if isinstance(value, Ref):
+        return {value.node}
+    if isinstance(value, dict):
+        return set().union(*(_find_refs(item) for item in value.values()))
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_find_refs(item) for item in value))
+    return set()
+
+
+def _resolve(value: Any, results: Dict[str, TaskResult]) -> Any:
+    if isinstance(value, Ref):
+        return value.resolve(results)
+    if isinstance(value, dict):
+        return {key: _resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_resolve(item, results) for item in value)
+    return value
+
+
+@dataclass
+class WorkflowNode:
+    """One agent task in a workflow."""
+
+    id: str
+    agent: Any
+    task_name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+
+    @property
+    def dependencies(self) -> Set[str]:
+        """Nodes referenced by ``params`` plus explicit ``depends_on``."""
+        return _find_refs(self.params) | set(self.depends_on)
+
+
+@dataclass
+class WorkflowResult:
+    """Task results of a workflow run, keyed by node id."""
+
+    workflow_id: str
+    results: Dict[str, TaskResult]
+    completed: List[str] = field(default_factory=list)
+    resumed: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def __getitem__(self, node_id: str) -> TaskResult:
+        return self.results[node_id]
+
+    @property
+    def success(self) -> bool:
+        return all(result.success for result in self.results.values())
+
+    @property
+    def failed(self) -> List[str]:
+        return [node_id for node_id, result in self.results.items() if not result.success]
+
+
+class Workflow:
+    """
+    Dependency graph of agent tasks.
+
+    Responsibilities:
+    - Declare nodes whose params reference upstream results with ``Ref``
+    - Validate the graph (unknown dependencies, cycles)
+    - Run every node as soon as its dependencies succeeded, at most
+      ``max_concurrency`` at a time
+    - Skip the dependents of failed nodes while independent branches continue
+    - With a ``checkpoint`` store, persist successful nodes and resume a
+      retried run from the first incomplete one
+    """
+
+    def __init__(
+        self,
+        workflow_id: str = "workflow",
+        max_concurrency: Optional[int] = None,
+        checkpoint: Optional[CheckpointStore] = None
+    ):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.workflow_id = workflow_id
+        self.max_concurrency = max_concurrency
+        self.checkpoint = checkpoint
+        self.nodes: Dict[str, WorkflowNode] = {}
+
+    def add(
+        self,
+        node_id: str,
+        agent: Any,
+        task_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        depends_on: Optional[List[str]] = None
+    ) -> WorkflowNode:
+        """Add a node running ``agent.execute_task`` for ``task_name``."""
+        if node_id in self.nodes:
+            raise ValueError(f"Duplicate workflow node: {node_id}")
+        node = WorkflowNode(
+            id=node_id,
+            agent=agent,
+            task_name=task_name,
+            params=params or {},
+            depends_on=list(depends_on or [])
+        )
+        self.nodes[node_id] = node
+        return node
+
+    def validate(self) -> List[str]:
+        """Return the nodes in a topological order; raise on a broken graph."""
+        for node in self.nodes.values():
+            unknown = node.dependencies - set(self.nodes)
+            if unknown:
+                raise ValueError(f"Node {node.id} depends on unknown node(s): {sorted(unknown)}")
+
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(node_id: str, path: List[str]) -> None:
+            if state.get(node_id) == "done":
+                return
+            if state.get(node_id) == "visiting":
+                cycle = path[path.index(node_id):] + [node_id]
+                raise ValueError(f"Workflow cycle: {' -> '.join(cycle)}")
+            state[node_id] = "visiting"
+            for dependency in sorted(self.nodes[node_id].dependencies):
+                visit(dependency, path + [node_id])
+            state[node_id] = "done"
+            order.append(node_id)
+
+        for node_id in self.nodes:
+            visit(node_id, [])
+        return order
+
+    async def run(self, deadline: Optional[float] = None) -> WorkflowResult:
+        """
+        Execute the workflow.
+
+        ``deadline`` (epoch seconds) is passed to every task. The run stops
+        only when no node can make progress; failures are reported in the
+        returned results rather than raised. Nodes checkpointed by an
+        earlier run with the same inputs are restored instead of re-run.
+        """
+        order = self.validate()
+        start = time.monotonic()
+        result = WorkflowResult(workflow_id=self.workflow_id, results={})
+        fingerprint = workflow_fingerprint(self) if self.checkpoint is not None else None
+        restored = self.checkpoint.load(self.workflow_id, fingerprint) if self.checkpoint is not None else {}
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        pending: Dict["asyncio.Future[TaskResult]", str] = {}
+        started: Set[str] = set()
+
+        def _schedule() -> None:
+            for node_id in order:
+                if node_id in started:
+                    continue
+                dependencies = self.nodes[node_id].dependencies
+                if not dependencies <= set(result.results):
+                    continue
+                started.add(node_id)
+                if node_id in restored:
+                    result.results[node_id] = restored[node_id]
+                    result.resumed.append(node_id)
+                    continue
+                failed = sorted(d for d in dependencies if not result.results[d].success)
+                if failed:
+                    result.results[node_id] = self._skipped(node_id, failed)
+                    continue
+                future = asyncio.ensure_future(self._run_node(node_id, result.results, semaphore, deadline))
+                pending[future] = node_id
+
+        try:
+            _schedule()
+            while pending:
+                done, _ = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    node_id = pending.pop(future)
+                    result.results[node_id] = future.result()
+                    result.completed.append(node_id)
+                    if self.checkpoint is not None:
+                        self.checkpoint.save(self.workflow_id, fingerprint, node_id, result.results[node_id])
+                _schedule()
+        finally:
+            for future in pending:
+                future.cancel()
+
+        result.elapsed = time.monotonic() - start
+        logger.info(
+            f"Workflow {self.workflow_id} finished in {result.elapsed:.2f}s "
+            f"({len(result.failed)} failed, {len(result.resumed)} resumed of {len(result.results)})"
+        )
+        return result
+
+    async def _run_node(
+        self,
+        node_id: str,
+        results: Dict[str, TaskResult],
+        semaphore: Optional[asyncio.Semaphore],
+        deadline: Optional[float]
+    ) -> TaskResult:
+        node = self.nodes[node_id]
+        task_id = f"{self.workflow_id}:{node_id}"
+        try:
+            params = _resolve(node.params, results)
+            if deadline is not None:
+                params["deadline"] = deadline
+            task = AgentTask(id=task_id, name=node.task_name, params=params)
+
+            if semaphore is None:
+                return await node.agent.execute_task(task)
+            async with semaphore:
+                return await node.agent.execute_task(task)
+        except Exception as e:
+            logger.error(f"Workflow node {node_id} failed: {e}")
+            return TaskResult(
+                task_id=task_id,
+                success=False,
+                error=str(e),
+                metadata={"workflow": self.workflow_id, "node": node_id}
+            )
+
+    def _skipped(self, node_id: str, failed: List[str]) -> TaskResult:
+        return TaskResult(
+            task_id=f"{self.workflow_id}:{node_id}",
+            success=False,
+            error=f"Skipped: dependency {', '.join(failed)} failed",
+            metadata={"workflow": self.workflow_id, "node": node_id, "skipped": True}
+        )
@@ -0,0 +1,334 @@
+"""
+Incremental Regeneration
+
+Re-runs only the generation tasks whose inputs changed. Each step declares
+the ``BackendConfig`` fields and architecture nodes it reads; on a re-run
+steps whose inputs are unchanged reuse their stored artifacts.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+import hashlib
+import json
+import logging
+import time
+
+from genesis_agents import AgentTask, TaskResult
+
+from ..config import AnyBackendConfig
+from ..fingerprint import canonical_request, fingerprint
+from ..plan import compile_plan
+
+logger = logging.getLogger(__name__)
+
+# Marks a path absent from the inputs, distinct from a ``None`` value
+_MISSING = object()
+
+
+def resolve_input(inputs: Dict[str, Any], path: str) -> Any:
+    """Look up a dotted path (``"config.auth.method"``) in the inputs."""
+    value: Any = inputs
+    for part in filter(None, path.split(".")):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def input_digest(value: Any) -> str:
+    """Stable digest of an input value (secrets are never stored in clear)."""
+    encoded = json.dumps(
+        None if value is _MISSING else value,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def flatten_inputs(value: Any, prefix: str = "") -> Dict[str, str]:
+    """Digest of every leaf of the inputs, keyed by dotted path."""
+    if isinstance(value, dict) and value:
+        flat: Dict[str, str] = {}
+        for key, item in value.items():
+            flat.update(flatten_inputs(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    return {prefix: input_digest(value)}
+
+
+def _overlaps(read: str, changed: str) -> bool:
+    return (
+        read == changed
+        or changed.startswith(read + ".")
+        or read.startswith(changed + ".")
+    )
+
+
+@dataclass(frozen=True)
+class GenerationStep:
+    """
+    One generation task and the inputs it depends on.
+
+    ``params`` maps task parameter names to input paths. ``reads`` lists
+    the paths the task's output depends on and defaults to the ``params``
+    paths; declare it when a task receives a whole object but only uses
+    some of its fields. A step with ``when`` runs only while that input is
+    truthy.
+    """
+
+    name: str
+    task_name: str
+    params: Dict[str, str]
+    reads: Tuple[str, ...] = ()
+    when: Optional[str] = None
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        return self.reads or tuple(self.params.values())
+
+    def fingerprint(self, inputs: Dict[str, Any]) -> str:
+        return input_digest({path: resolve_input(inputs, path) for path in self.dependencies})
+
+    def affected_by(self, changed: List[str]) -> bool:
+        return any(_overlaps(read, path) for read in self.dependencies for path in changed)
+
+    def build_params(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        params = {}
+        for name, path in self.params.items():
+            value = resolve_input(inputs, path)
+            if value is not _MISSING:
+                params[name] = value
+        return params
+
+
+# Dependency map of the FastAPI generation tasks. The main application
+# prompt embeds the CORS origins too, so a CORS change regenerates
+# ``application`` and ``middleware`` only; its config files embed the whole
+# database config (driver, pool settings, replicas).
+FASTAPI_STEPS: Tuple[GenerationStep, ...] = (
+    GenerationStep(
+        "application",
+        "generate_fastapi_app",
+        {"config": "config", "architecture": "architecture"},
+        reads=(
+            "config.project_name", "config.description", "config.features",
+            "config.database", "config.auth.method", "config.api_version",
+            "config.cors_origins", "architecture",
+        )
+    ),
+    GenerationStep(
+        "middleware",
+        "generate_fastapi_middleware",
+        {"config": "config", "features": "config.features"},
+        reads=("config.features", "config.cors_origins", "config.auth.method", "config.debug")
+    ),
+    GenerationStep(
+        "dependencies",
+        "generate_fastapi_dependencies",
+        {"config": "config"},
+        reads=("config.database.type", "config.auth.method", "config.features")
+    ),
+    GenerationStep(
+        "models",
+        "generate_sqlalchemy_models",
+        {
+            "data_models": "architecture.data_models",
+            "relationships": "architecture.relationships",
+            "database_config": "config.database",
+        }
+    ),
+    GenerationStep(
+        "schemas",
+        "generate_pydantic_models",
+        {"data_models": "architecture.data_models", "api_design": "architecture.api_design"}
+    ),
+    GenerationStep(
+        "routes",
+        "generate_fastapi_routes",
+        {
+            "api_design": "architecture.api_design",
+            "data_models": "architecture.data_models",
+            "auth_required": "config.auth",
+        }
+    ),
+    GenerationStep(
+        "authentication",
+        "generate_fastapi_auth",
+        {"auth_config": "config.auth", "user_model": "architecture.user_model"},
+        when="config.auth"
+    ),
+)
+
+
+class ArtifactStore:
+    """
+    Previous inputs and step artifacts per project.
+
+    Kept in memory, or as one JSON file per project under ``path``. Only
+    input digests are stored, never the inputs themselves.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path is not None else None
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def load(self, key: str) -> Dict[str, Any]:
+        if self.path is None:
+            return self._memory.get(key, {})
+        file = self._file(key)
+        if not file.exists():
+            return {}
+        try:
+            return json.loads(file.read_text(encoding="utf-8"))
+        except ValueError:
+            logger.warning(f"Ignoring unreadable artifact store {file}")
+            return {}
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        if self.path is None:
+            self._memory[key] = json.loads(json.dumps(state, default=str))
+            return
+        file = self._file(key)
+        tmp = file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, default=str), encoding="utf-8")
+        tmp.replace(file)
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json"
+
+
+@dataclass
+class IncrementalResult:
+    """Step results of an incremental run, what was regenerated and the request fingerprint."""
+
+    results: Dict[str, TaskResult]
+    changed: List[str] = field(default_factory=list)
+    regenerated: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    fingerprint: str = ""
+
+    @property
+    def success(self) -> bool:
+        return all(result.success for result in self.results.values())
+
+    def __getitem__(self, step: str) -> TaskResult:
+        return self.results[step]
+
+
+class IncrementalGenerator:
+    """
+    Regenerates a project by re-running only the affected steps.
+
+    Responsibilities:
+    - Diff config and architecture against the previous run's inputs
+    - Re-execute steps whose declared inputs changed (or whose last run failed)
+    - Reuse stored artifacts for every other step
+    - Persist the new inputs and artifacts for the next run
+    """
+
+    def __init__(
+        self,
+        agent: Any,
+        steps: Tuple[GenerationStep, ...] = FASTAPI_STEPS,
+        store: Optional[ArtifactStore] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        names = [step.name for step in steps]
+        if len(set(names)) != len(names):
+            raise ValueError("Step names must be unique")
+        self.agent = agent
+        self.steps = steps
+        self.store = store if store is not None else ArtifactStore()
+        self.max_concurrency = max_concurrency
+
+    async def generate(
+        self,
+        config: AnyBackendConfig,
+        architecture: Optional[Dict[str, Any]] = None,
+        key: Optional[str] = None,
+        force: bool = False
+    ) -> IncrementalResult:
+        """
+        Generate ``config``/``architecture``, reusing unaffected artifacts.
+
+        ``key`` identifies the project in the store (defaults to the
+        project name); ``force`` regenerates every step. Inputs are diffed
+        in canonical form, so result metadata and key order change nothing.
+        """
+        started = time.perf_counter()
+        key = key or config.project_name
+        inputs = {"config": config.to_dict(), "architecture": architecture or {}}
+        canonical = canonical_request(config, architecture)
+        plan = compile_plan(config)
+
+        previous = self.store.load(key)
+        digests = flatten_inputs(canonical)
+        old_digests = previous.get("inputs", {})
+        changed = sorted(
+            path for path in set(digests) | set(old_digests)
+            if digests.get(path) != old_digests.get(path)
+        )
+
+        stored = previous.get("steps", {})
+        results: Dict[str, TaskResult] = {}
+        pending: List[Tuple[GenerationStep, str]] = []
+        reused = []
+        for step in self.steps:
+            if step.when is not None and not self._enabled(step, inputs):
+                continue
+            step_fingerprint = step.fingerprint(canonical)
+            entry = stored.get(step.name)
+            if not force and entry is not None and entry["fingerprint"] == step_fingerprint and entry["success"]:
+                results[step.name] = TaskResult(
+                    task_id=f"{key}:{step.name}",
+                    success=True,
+                    result=entry["result"],
+                    metadata={"reused": True}
+                )
+                reused.append(step.name)
+            else:
+                pending.append((step, step_fingerprint))
+
+        tasks = [
+            AgentTask(
+                id=f"{key}:{step.name}",
+                name=step.task_name,
+                params={**step.build_params(inputs), "plan": plan}
+            )
+            for step, _ in pending
+        ]
+        fresh = await self.agent.execute_tasks(tasks, max_concurrency=self.max_concurrency) if tasks else []
+        entries = {name: stored[name] for name in reused}
+        for (step, step_fingerprint), result in zip(pending, fresh):
+            results[step.name] = result
+            entries[step.name] = {
+                "fingerprint": step_fingerprint,
+                "success": result.success,
+                "result": result.result,
+            }
+        self.store.save(key, {"inputs": digests, "steps": entries})
+
+        regenerated = [step.name for step, _ in pending]
+        logger.info(f"Incremental generation of {key}: regenerated {regenerated}, reused {reused}")
+        return IncrementalResult(
+            results={step.name: results[step.name] for step in self.steps if step.name in results},
+            changed=changed,
+            regenerated=regenerated,
+            reused=reused,
+            elapsed=time.perf_counter() - started,
+            fingerprint=fingerprint(plan.config, architecture)
+        )
+
+    def affected_steps(self, changed: List[str]) -> List[str]:
+        """Names of the steps that read any of the ``changed`` input paths."""
+        return [step.name for step in self.steps if step.affected_by(changed)]
+
+    @staticmethod
+    def _enabled(step: GenerationStep, inputs: Dict[str, Any]) -> bool:
+        value = resolve_input(inputs, step.when)
+        return value is not _MISSING and bool(value)
@@ -0,0 +1,143 @@
+"""
+Speculative Generation
+
+Starts framework generation on the pre-validation architecture while
+``validate_backend_architecture`` is still running. Validation usually
+confirms the design, taking its LLM round-trip off the critical path; when
+its verdict rejects the design the speculative output is discarded.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from genesis_agents import AgentTask, TaskResult
+
+from ..agents.sharding import verdict_rank
+from ..config import BackendConfig
+from .incremental import IncrementalGenerator, IncrementalResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpeculativeResult:
+    """
+    Outcome of a validated generation.
+
+    ``speculation`` is ``"confirmed"`` (speculative output kept),
+    ``"discarded"`` (validation failed or rejected the architecture,
+    nothing generated) or ``"disabled"``.
+    """
+
+    validation: TaskResult
+    generation: Optional[IncrementalResult]
+    speculation: str
+    regenerated: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.validation.success and self.generation is not None and self.generation.success
+
+
+def accepts_architecture(validation: TaskResult, min_rating: int = 1) -> bool:
+    """
+    Whether a validation result lets the architecture be generated.
+
+    The task must succeed and its ``validation_result`` (the merged verdict
+    of every subsystem) must not rate ``overall_score`` below
+    ``min_rating`` on the ``VERDICT_RATINGS`` scale (1 is "fair") or set a
+    ``valid``/``passed`` flag to false. Unrecognised ratings do not reject.
+    """
+    if not validation.success:
+        return False
+    result = validation.result if isinstance(validation.result, dict) else {}
+    verdict = result.get("validation_result") or {}
+    if any(verdict.get(flag) is False for flag in ("valid", "passed")):
+        return False
+    score = verdict.get("overall_score")
+    if isinstance(score, str):
+        rank = verdict_rank(score)
+        return rank < 0 or rank >= min_rating
+    return True
+
+
+class SpeculativeGenerator:
+    """
+    Validates an architecture and generates the project from it.
+
+    Responsibilities:
+    - Run validation and generation on the unvalidated architecture concurrently
+    - Keep the speculative output when the validation verdict accepts the
+      architecture (see ``accepts_architecture``)
+    - Cancel the speculative work when validation fails or rejects it
+    """
+
+    def __init__(
+        self,
+        architect: Any,
+        generator: IncrementalGenerator,
+        speculate: bool = True,
+        min_rating: int = 1
+    ):
+        self.architect = architect
+        self.generator = generator
+        self.speculate = speculate
+        self.min_rating = min_rating
+
+    async def generate(
+        self,
+        config: BackendConfig,
+        architecture: Dict[str, Any],
+        key: Optional[str] = None
+    ) -> SpeculativeResult:
+        started = time.perf_counter()
+        key = key or config.project_name
+        validation_task = AgentTask(
+            id=f"{key}:validation",
+            name="validate_backend_architecture",
+            params={"architecture": architecture}
+        )
+
+        if not self.speculate:
+            validation = await self.architect.execute_task(validation_task)
+            generation = None
+            if accepts_architecture(validation, self.min_rating):
+                generation = await self.generator.generate(config, architecture, key)
+            return SpeculativeResult(
+                validation=validation,
+                generation=generation,
+                speculation="disabled",
+                regenerated=generation.regenerated if generation else [],
+                elapsed=time.perf_counter() - started
+            )
+
+        speculative = asyncio.ensure_future(self.generator.generate(config, architecture, key))
+        try:
+            validation = await self.architect.execute_task(validation_task)
+        except BaseException:
+            speculative.cancel()
+            raise
+
+        if not accepts_architecture(validation, self.min_rating):
+            speculative.cancel()
+            await asyncio.gather(speculative, return_exceptions=True)
+            logger.info(f"Validation of {key} rejected the architecture; speculative generation discarded")
+            return SpeculativeResult(
+                validation=validation,
+                generation=None,
+                speculation="discarded",
+                elapsed=time.perf_counter() - started
+            )
+
+        generation = await speculative
+        logger.info(f"Speculative generation of {key} confirmed")
+        return SpeculativeResult(
+            validation=validation,
+            generation=generation,
+            speculation="confirmed",
+            elapsed=time.perf_counter() - started
+        )
@@ -2,6 +2,8 @@
 Tests for backend generation agents.
 """
 
+import asyncio
+import time
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from genesis_agents import AgentTask, TaskResult
@@ -23,6 +25,7 @@ from genesis_backend.config import (
     AuthConfig,
     ORMType
 )
+from genesis_backend.plan import compile_plan
 
 
 class TestArchitectAgent:
@@ -193,6 +196,22 @@ class TestFastAPIAgent:
             assert "main_application" in result.result
             assert result.metadata["framework"] == "fastapi"
     
+    @pytest.mark.asyncio
+    async def test_generate_fastapi_app_from_plan(self, fastapi_agent, fastapi_config):
+        """Test a compiled plan in the params replaces config parsing."""
+        plan = compile_plan(fastapi_config)
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="FastAPI app generated")
+
+            result = await fastapi_agent.execute_task(AgentTask(
+                id="fastapi-app-plan",
+                name="generate_fastapi_app",
+                params={"plan": plan, "architecture": {}}
+            ))
+
+        assert result.success is True
+        assert "main_application" in result.result
+
     @pytest.mark.asyncio
     async def test_generate_pydantic_models_task(self, fastapi_agent):
         """Test Pydantic models generation task."""
@@ -216,6 +235,138 @@ class TestFastAPIAgent:
             
             assert result.success is True
             assert "schemas_code" in result.result
+    
+    @pytest.mark.asyncio
+    async def test_generate_fastapi_app_bounded_concurrency(self, fastapi_config):
+        """Test supporting files are requested concurrently within the cap."""
+        agent = FastAPIAgent(max_concurrency=2)
+        in_flight = 0
+        peak = 0
+        
+        async def slow_send_request(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return AsyncMock(result="Generated")
+        
+        with patch('mcpturbo.protocol.send_request', side_effect=slow_send_request) as mock_protocol:
+            task = AgentTask(
+                id="fastapi-app-concurrent",
+                name="generate_fastapi_app",
+                params={"config": fastapi_config.to_dict()}
+            )
+            
+            result = await agent.execute_task(task)
+            
+            assert result.success is True
+            assert mock_protocol.call_count == 4
+            assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_generate_fastapi_app_failure_does_not_cancel_siblings(self, fastapi_agent, fastapi_config):
+        """Test a failing main call lets the supporting calls finish."""
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.side_effect = [
+                Exception("Network error"),
+                AsyncMock(result="Config"),
+                AsyncMock(result="Requirements"),
+                AsyncMock(result="Dockerfile")
+            ]
+            
+            task = AgentTask(
+                id="fastapi-app-partial-failure",
+                name="generate_fastapi_app",
+                params={"config": fastapi_config.to_dict()}
+            )
+            
+            result = await fastapi_agent.execute_task(task)
+            
+            assert result.success is False
+            assert "Network error" in result.error
+            assert mock_protocol.call_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_generate_fastapi_app_deadline(self, fastapi_agent, fastapi_config):
+        """Test an expired deadline cancels the task and keeps partial artifacts."""
+        cancelled = []
+        
+        async def send_request(**kwargs):
+            if "main FastAPI application" in kwargs["data"]["prompt"]:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(kwargs["action"])
+                    raise
+            return AsyncMock(result="Supporting file")
+        
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            task = AgentTask(
+                id="fastapi-app-deadline",
+                name="generate_fastapi_app",
+                params={"config": fastapi_config.to_dict(), "deadline": time.time() + 0.05}
+            )
+            
+            result = await fastapi_agent.execute_task(task)
+            
+            assert result.success is False
+            assert result.metadata["timed_out"] is True
+            assert len(result.result["partial_artifacts"]) == 3
+            assert len(cancelled) == 1
+    
+    @pytest.mark.asyncio
+    async def test_generate_fastapi_app_records_llm_usage(self, fastapi_agent, fastapi_config):
+        """Test per-request LLM accounting is aggregated into task metadata."""
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="Generated file")
+            
+            task = AgentTask(
+                id="fastapi-app-usage",
+                name="generate_fastapi_app",
+                params={"config": fastapi_config.to_dict()}
+            )
+            
+            result = await fastapi_agent.execute_task(task)
+            
+            usage = result.metadata["llm_usage"]
+            assert usage["requests"] == 4
+            assert usage["prompt_tokens"] > 0
+            assert usage["response_chars"] == 4 * len("Generated file")
+            assert sum(group["requests"] for group in usage["by_action"].values()) == 4
+    
+    @pytest.mark.asyncio
+    async def test_execute_tasks_batch(self, fastapi_agent):
+        """Test batch execution keeps input order and isolates failures."""
+        in_flight = 0
+        peak = 0
+        
+        async def send_request(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if "Broken" in kwargs["data"]["prompt"]:
+                raise Exception("Network error")
+            return AsyncMock(result="class Model: pass")
+        
+        tasks = [
+            AgentTask(
+                id=f"models-{i}",
+                name="generate_pydantic_models",
+                params={"data_models": [{"name": "Broken" if i == 2 else f"Model{i}"}]}
+            )
+            for i in range(6)
+        ]
+        
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            results = await fastapi_agent.execute_tasks(tasks, max_concurrency=3)
+        
+        assert [result.task_id for result in results] == [task.id for task in tasks]
+        assert [result.success for result in results] == [True, True, False, True, True, True]
+        assert "Network error" in results[2].error
+        assert peak == 3
 
 
 class TestDjangoAgent:
@@ -541,6 +692,266 @@ class TestAuthAgent:
             assert "crud_operations" in result.result
 
 
+class TestShardedGeneration:
+    """Test sharded generation of large model lists."""
+
+    def test_related_models_share_a_shard(self):
+        """Test relationships keep related models together."""
+        from genesis_backend.agents.sharding import shard_models
+
+        models = [{"name": name} for name in ["User", "Product", "Order", "Review", "Tag"]]
+        relationships = [{"from": "User", "to": "Order"}, {"from": "Product", "to": "Review"}]
+
+        shards = shard_models(models, relationships, shard_size=2)
+
+        assert [[model["name"] for model in shard] for shard in shards] == [
+            ["User", "Order"], ["Product", "Review"], ["Tag"]
+        ]
+
+    def test_merge_deduplicates_imports(self):
+        """Test merged modules hoist and combine imports."""
+        from genesis_backend.agents.sharding import merge_modules
+
+        merged = merge_modules([
+            "from sqlalchemy import Column, Integer\nimport uuid\n\nclass User(Base):\n    pass\n",
+            "from sqlalchemy import Column, String\nimport uuid\n\nclass Order(Base):\n    pass\n",
+        ])
+
+        assert merged.count("import uuid") == 1
+        assert "from sqlalchemy import Column, Integer, String" in merged
+        assert merged.index("class User") < merged.index("class Order")
+
+    def test_merge_keeps_one_shared_prelude(self):
+        """Test shards repeating Base, engine and session merge into one definition each."""
+        from genesis_backend.agents.sharding import merge_modules
+
+        def shard(model, other):
+            return (
+                "from sqlalchemy import ForeignKey, create_engine\n"
+                "from sqlalchemy.orm import DeclarativeBase, relationship, sessionmaker\n\n\n"
+                "class Base(DeclarativeBase):\n    pass\n\n\n"
+                "engine = create_engine(\n    \"sqlite://\",\n)\n"
+                "SessionLocal = sessionmaker(bind=engine)\n\n\n"
+                f"class {model}(Base):\n"
+                f"    __tablename__ = \"{model.lower()}s\"\n"
+                f"    related = relationship(\"{other}\")\n"
+            )
+
+        merged = merge_modules([shard("User", "Order"), shard("Order", "User")])
+        compile(merged, "models.py", "exec")
+
+        assert merged.count("class Base(") == 1
+        assert merged.count("engine = create_engine(") == 1
+        assert merged.count("SessionLocal =") == 1
+        assert merged.index("class User(") < merged.index("class Order(")
+
+        entities = merge_modules([
+            "import { Entity } from 'typeorm';\n\nexport abstract class Audited {}\n\n@Entity()\nexport class User extends Audited {\n}\n",
+            "import { Entity } from 'typeorm';\n\nexport abstract class Audited {}\n\n@Entity()\nexport class Order extends Audited {\n}\n",
+        ], "typescript")
+
+        assert entities.count("class Audited") == 1
+        assert entities.count("@Entity()") == 2
+
+    @pytest.mark.asyncio
+    async def test_large_schema_is_sharded(self):
+        """Test 50 models are generated in concurrent shards and merged."""
+        agent = FastAPIAgent()
+        data_models = [
+            {"name": f"Model{i}", "fields": [f"field{j}" for j in range(20)]}
+            for i in range(50)
+        ]
+        prompts = []
+
+        async def send_request(**kwargs):
+            prompts.append(kwargs["data"]["prompt"])
+            model = f"Model{len(prompts)}"
+            return AsyncMock(result=f"from sqlalchemy import Column\n\nclass {model}(Base):\n    pass\n")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            result = await agent.execute_task(AgentTask(
+                id="sharded-models",
+                name="generate_sqlalchemy_models",
+                params={"data_models": data_models, "shard_size": 10}
+            ))
+
+        assert result.success is True
+        assert len(prompts) == 5
+        assert all("Model0" not in prompt for prompt in prompts[1:])
+        assert result.result["models_code"].count("from sqlalchemy import Column") == 1
+        assert result.result["models_code"].count("class Model") == 5
+        assert result.result["generation_metadata"]["shards"] == 5
+
+    @pytest.mark.asyncio
+    async def test_over_budget_schema_is_sharded_not_trimmed(self):
+        """Test a schema too large for one prompt reaches the LLM whole, in shards."""
+        agent = FastAPIAgent()
+        data_models = [
+            {"name": f"Model{i}", "fields": [f"field{j}" for j in range(20)]}
+            for i in range(50)
+        ]
+        prompts = []
+
+        async def send_request(**kwargs):
+            prompts.append(kwargs["data"]["prompt"])
+            return AsyncMock(result="class Model(Base):\n    pass\n")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            result = await agent.execute_task(AgentTask(
+                id="auto-sharded-models",
+                name="generate_sqlalchemy_models",
+                params={"data_models": data_models}
+            ))
+
+        assert result.success is True
+        assert len(prompts) > 1
+        assert all(any(f'"Model{i}"' in prompt for prompt in prompts) for i in range(50))
+        assert not any("…+" in prompt for prompt in prompts)
+
+    @pytest.mark.asyncio
+    async def test_failed_shard_is_retried_alone(self):
+        """Test one bad response only retries its own shard."""
+        agent = NestJSAgent()
+        calls = 0
+
+        async def send_request(**kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("malformed response")
+            return AsyncMock(result="import { Entity } from 'typeorm';\n@Entity()\nexport class E {}\n")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            result = await agent.execute_task(AgentTask(
+                id="sharded-entities",
+                name="generate_typeorm_entities",
+                params={"data_models": [{"name": f"E{i}"} for i in range(6)], "shard_size": 3}
+            ))
+
+        assert result.success is True
+        assert calls == 3
+        assert result.result["entities_code"].count("import { Entity } from 'typeorm';") == 1
+
+
+class TestChunkedValidation:
+    """Test map-reduce validation of large architectures."""
+
+    @staticmethod
+    def large_architecture(entities: int = 40):
+        return {
+            "requirements": {"description": "Marketplace"},
+            "data_models": {"data_models": [
+                {"name": f"Entity{i}", "fields": [f"attribute_{j}" for j in range(10)]}
+                for i in range(entities)
+            ]},
+            "api_design": {"api_specification": {"endpoints": [
+                {"path": f"/entity{i}s", "method": method}
+                for i in range(entities) for method in ("GET", "POST")
+            ] + [{"path": "/health", "method": "GET"}]}},
+        }
+
+    def test_split_architecture(self):
+        """Test subsystems cover every entity and endpoint once."""
+        from genesis_backend.agents.sharding import split_architecture
+
+        architecture = self.large_architecture()
+        subsystems = split_architecture(architecture, chunk_size=8)
+
+        entities = [model for _, part in subsystems for model in part.get("data_models", [])]
+        endpoints = [endpoint for _, part in subsystems for endpoint in part["endpoints"]]
+        assert len(subsystems) == 6
+        assert len(entities) == 40
+        assert len(endpoints) == 81
+        assert subsystems[-1][0] == "endpoints:health"
+        assert "data_models" not in subsystems[0][1]["context"]["data_models"]
+        assert split_architecture({"data_models": [{"name": "User"}]}, chunk_size=8) == [
+            ("architecture", {"data_models": [{"name": "User"}]})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_large_architecture_validated_in_chunks(self):
+        """Test subsystems are validated concurrently and findings deduplicated."""
+        architect = ArchitectAgent()
+        in_flight = 0
+        peak = 0
+
+        async def send_request(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return AsyncMock(result="Validation complete")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request) as mock_protocol:
+            result = await architect.execute_task(AgentTask(
+                id="chunked-validation",
+                name="validate_backend_architecture",
+                params={"architecture": self.large_architecture()}
+            ))
+
+        assert result.success is True
+        assert mock_protocol.call_count == 6
+        assert peak > 1
+        validation = result.result
+        assert validation["validation_metadata"]["subsystems"] == 6
+        assert validation["validation_result"]["overall_score"] == "good"
+        assert len(validation["validation_result"]["subsystems"]) == 6
+        assert len(validation["issues_found"]) == 3
+        assert len(validation["recommendations"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_small_architecture_single_call(self):
+        """Test architectures within budget keep a single validation call."""
+        architect = ArchitectAgent()
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="Validation complete")
+            result = await architect.execute_task(AgentTask(
+                id="single-validation",
+                name="validate_backend_architecture",
+                params={"architecture": {"data_models": [{"name": "User"}]}}
+            ))
+
+        assert mock_protocol.call_count == 1
+        assert "subsystems" not in result.result["validation_metadata"]
+
+    def test_merge_findings(self):
+        """Test near-duplicate findings collapse to the first wording."""
+        from genesis_backend.agents.sharding import merge_findings
+
+        assert merge_findings([
+            ["No rate limiting configured", "Missing indexes"],
+            ["no rate-limiting configured.", "Weak password policy"],
+        ]) == ["No rate limiting configured", "Missing indexes", "Weak password policy"]
+
+    def test_merge_verdicts_is_pessimistic(self):
+        """Test one failing subsystem decides the merged verdict."""
+        from genesis_backend.agents.sharding import merge_verdicts
+
+        assert merge_verdicts([
+            {"score": 9, "secure": True, "security": "good", "issues": ["Missing indexes"]},
+            {"score": 4, "secure": False, "security": "poor", "issues": ["No rate limiting"]},
+            {"score": 8, "secure": True, "security": "high", "consistency": "adequate"},
+        ]) == {
+            "score": 4,
+            "secure": False,
+            "security": "poor",
+            "issues": ["Missing indexes", "No rate limiting"],
+            "consistency": "adequate",
+        }
+
+    def test_merge_verdicts_only_ranks_score_keys(self):
+        """Test keys of unknown direction keep every distinct value."""
+        from genesis_backend.agents.sharding import merge_verdicts
+
+        assert merge_verdicts([
+            {"risk": "low", "complexity": 3, "overall_score": "good"},
+            {"risk": "high", "complexity": 7, "overall_score": "fair"},
+            {"risk": "low", "complexity": 3, "overall_score": "good"},
+        ]) == {"risk": ["low", "high"], "complexity": [3, 7], "overall_score": "fair"}
+
+
 class TestAgentErrorHandling:
     """Test error handling in agents."""
     
@@ -676,3 +1087,83 @@ class TestAgentIntegration:
         assert db_result.success is True
         assert auth_result.success is True
         assert app_result.success is True
+
+
+class TestDatabaseTuning:
+    """Test pool and driver settings flowing into generated configuration."""
+
+    DATABASE_URL = (
+        "postgresql://app@db:5432/shop?pool_size=10&max_overflow=5&pool_recycle=1800"
+        "&pool_pre_ping=true&statement_cache_size=0&replica=postgresql://ro@replica-1/shop"
+    )
+
+    def make_plan(self, framework, driver=None):
+        database = DatabaseConfig.from_url(self.DATABASE_URL)
+        database.driver = driver
+        return compile_plan(BackendConfig(project_name="shop", framework=framework, database=database))
+
+    def test_fastapi_engine_options(self):
+        """Test SQLAlchemy engine options, with the asyncpg statement cache."""
+        plan = self.make_plan(BackendFramework.FASTAPI)
+
+        assert plan.driver == "asyncpg"
+        assert FastAPIAgent._engine_options(plan) == {
+            "pool_size": 10,
+            "max_overflow": 5,
+            "pool_recycle": 1800,
+            "pool_pre_ping": True,
+            "connect_args": {"statement_cache_size": 0},
+        }
+
+    def test_django_databases_setting(self):
+        """Test DATABASES uses the psycopg pool and lists replicas."""
+        databases = DjangoAgent._databases_setting(self.make_plan(BackendFramework.DJANGO))
+
+        assert databases["default"]["OPTIONS"] == {
+            "pool": {"min_size": 10, "max_size": 15, "max_lifetime": 1800},
+            "prepare_threshold": None,
+        }
+        assert "CONN_MAX_AGE" not in databases["default"]
+        assert databases["default"]["CONN_HEALTH_CHECKS"] is True
+        assert databases["replica_1"]["HOST"] == "replica-1"
+        assert databases["replica_1"]["TEST"] == {"MIRROR": "default"}
+
+        unpooled = DjangoAgent._databases_setting(self.make_plan(BackendFramework.DJANGO, driver="psycopg2"))
+        assert unpooled["default"]["CONN_MAX_AGE"] == 1800
+        assert "OPTIONS" not in unpooled["default"]
+
+    @pytest.mark.asyncio
+    async def test_django_replicas_are_routed(self):
+        """Test replica aliases come with a read-replica router."""
+        files = await DjangoAgent()._generate_django_settings_files(self.make_plan(BackendFramework.DJANGO).config)
+
+        assert "DATABASE_ROUTERS = ['shop.settings.routers.ReadReplicaRouter']" in files["base.py"]
+        assert "REPLICAS = ['replica_1']" in files["routers.py"]
+        compile(files["routers.py"], "routers.py", "exec")
+        compile(files["base.py"], "base.py", "exec")
+
+    @pytest.mark.asyncio
+    async def test_django_requirements_match_driver(self):
+        """Test pooled settings pin Django 5.1 and psycopg 3 with the pool extra."""
+        agent = DjangoAgent()
+        pooled = await agent._generate_requirements_files(self.make_plan(BackendFramework.DJANGO).config)
+        unpooled = await agent._generate_requirements_files(
+            self.make_plan(BackendFramework.DJANGO, driver="psycopg2").config
+        )
+
+        assert pooled["requirements/base.txt"].splitlines() == ["Django>=5.1", "psycopg[binary,pool]>=3.1"]
+        assert unpooled["requirements/base.txt"].splitlines() == ["Django>=4.2.0", "psycopg2-binary>=2.9.0"]
+
+    @pytest.mark.asyncio
+    async def test_nestjs_typeorm_options(self):
+        """Test TypeORM pool options and replication in ormconfig.json."""
+        plan = self.make_plan(BackendFramework.NESTJS)
+        options = NestJSAgent._typeorm_options(plan)
+
+        assert options["type"] == "postgres"
+        assert options["poolSize"] == 10
+        assert options["extra"] == {"max": 15, "maxLifetimeSeconds": 1800}
+        assert options["replication"]["slaves"] == [{"database": "shop", "host": "replica-1", "username": "ro"}]
+
+        files = await NestJSAgent()._generate_nestjs_config_files(plan.config)
+        assert '"poolSize": 10' in files["ormconfig.json"]
@@ -0,0 +1,128 @@
+"""
+Tests for bulk config specs.
+"""
+
+import json
+import pytest
+from genesis_backend.bulk import ConfigInterner, read_configs, spec_format, write_configs
+from genesis_backend.config import (
+    BackendConfig,
+    BackendFramework,
+    DatabaseConfig,
+    DatabaseType,
+    FrozenBackendConfig,
+)
+
+
+def make_configs(count):
+    return [
+        BackendConfig(
+            project_name=f"api-{index}",
+            framework=BackendFramework.FASTAPI if index % 2 else BackendFramework.DJANGO,
+            features=["auth", "crud"],
+            database=DatabaseConfig(type=DatabaseType.POSTGRESQL, name="app")
+        )
+        for index in range(count)
+    ]
+
+
+class TestBulkSpecs:
+    """Test streaming config spec files."""
+
+    def test_jsonl_round_trip(self, tmp_path):
+        """Configs written as JSONL read back equal."""
+        configs = make_configs(5)
+        path = tmp_path / "specs.jsonl"
+
+        assert write_configs(configs, path) == 5
+        records = list(read_configs(path))
+
+        assert all(record.ok for record in records)
+        assert [record.position for record in records] == [1, 2, 3, 4, 5]
+        assert all(isinstance(record.config, FrozenBackendConfig) for record in records)
+        assert [record.config.thaw().to_dict() for record in records] == [c.to_dict() for c in configs]
+
+    def test_gzip_and_mutable_configs(self, tmp_path):
+        """Gzipped files stream too; frozen=False yields independent configs."""
+        path = tmp_path / "specs.jsonl.gz"
+        write_configs(make_configs(3), path)
+
+        configs = [record.config for record in read_configs(path, frozen=False)]
+
+        assert all(isinstance(config, BackendConfig) for config in configs)
+        assert configs[0].database is not configs[1].database
+        assert spec_format(path) == "jsonl"
+
+    def test_invalid_records_do_not_abort(self, tmp_path):
+        """Bad JSON and invalid specs become error records."""
+        path = tmp_path / "specs.jsonl"
+        path.write_text("\n".join([
+            json.dumps({"project_name": "ok-1"}),
+            "{not json",
+            json.dumps({"project_name": "bad", "framework": "rails"}),
+            "",
+            json.dumps({"description": "no name"}),
+            json.dumps({"project_name": "bad-db", "database": {"type": "oracle"}}),
+            json.dumps({"project_name": "ok-2", "unknown": True}),
+            json.dumps({"project_name": "ok-3"}),
+        ]) + "\n")
+
+        records = list(read_configs(path))
+
+        assert [record.position for record in records if record.ok] == [1, 8]
+        errors = {record.position: record.error for record in records if not record.ok}
+        assert sorted(errors) == [2, 3, 5, 6, 7]
+        assert errors[2].startswith("Invalid JSON")
+        assert "rails" in errors[3]
+        assert records[1].data == "{not json"
+
+    def test_undecodable_lines_and_wrong_types(self, tmp_path):
+        """Non-UTF-8 lines and mistyped fields only invalidate their record."""
+        path = tmp_path / "specs.jsonl"
+        path.write_bytes(b"\n".join([
+            json.dumps({"project_name": "ok-1"}).encode(),
+            b"\xff\xfe",
+            json.dumps({"project_name": "flag", "debug": "yes"}).encode(),
+            json.dumps({"project_name": "mapping", "features": {"a": 1}}).encode(),
+            json.dumps({"project_name": "cookie", "auth": {"method": "jwt", "cookie_secure": 1}}).encode(),
+            json.dumps({"project_name": "ok-2", "debug": True, "features": ["crud"]}).encode(),
+        ]) + b"\n")
+
+        records = list(read_configs(path))
+
+        assert [record.position for record in records if record.ok] == [1, 6]
+        errors = {record.position: record.error for record in records if not record.ok}
+        assert errors[2].startswith("Invalid UTF-8")
+        assert records[1].data == b"\xff\xfe"
+        assert "debug must be a boolean" in errors[3]
+        assert "list of strings" in errors[4]
+        assert "cookie_secure" in errors[5]
+
+    def test_nested_objects_are_interned(self, tmp_path):
+        """Equal nested configs and enum members are shared between records."""
+        path = tmp_path / "specs.jsonl"
+        write_configs(make_configs(4), path)
+
+        configs = [record.config for record in read_configs(path)]
+
+        assert all(config.database is configs[0].database for config in configs)
+        assert all(config.features is configs[0].features for config in configs)
+
+    def test_interner_limit(self):
+        """The intern table is reset instead of growing without bound."""
+        interner = ConfigInterner(limit=2)
+        for index in range(10):
+            interner.database({"type": "sqlite", "name": f"db-{index}"})
+
+        assert len(interner._objects) <= 2
+
+    def test_msgpack_round_trip(self, tmp_path):
+        """msgpack files round-trip when the optional package is installed."""
+        pytest.importorskip("msgpack")
+        configs = make_configs(3)
+        path = tmp_path / "specs.msgpack"
+
+        write_configs(configs, path)
+        records = list(read_configs(path))
+
+        assert [record.config.thaw().to_dict() for record in records] == [c.to_dict() for c in configs]
@@ -2,7 +2,9 @@
 Tests for backend configuration.
 """
 
+import pickle
 import pytest
+from dataclasses import FrozenInstanceError
 from genesis_backend.config import (
     BackendConfig,
     BackendFramework,
@@ -10,7 +12,9 @@ from genesis_backend.config import (
     AuthMethod,
     DatabaseConfig,
     AuthConfig,
-    ORMType
+    ORMType,
+    FrozenBackendConfig,
+    FrozenDatabaseConfig,
 )
 
 
@@ -189,6 +193,76 @@ class TestDatabaseConfig:
         expected_url = "sqlite:///test.db"
         assert db_config.connection_url == expected_url
     
+    def test_from_url(self):
+        """Test parsing driver, credentials and pool settings from a URL."""
+        db_config = DatabaseConfig.from_url(
+            "postgresql+asyncpg://app:p%40ss@db:5432/shop"
+            "?pool_size=10&max_overflow=5&pool_recycle=1800&pool_pre_ping=true"
+            "&statement_cache_size=0&replica=postgresql://ro@replica-1/shop"
+        )
+
+        assert db_config.type == DatabaseType.POSTGRESQL
+        assert (db_config.host, db_config.port, db_config.name) == ("db", 5432, "shop")
+        assert (db_config.user, db_config.password) == ("app", "p@ss")
+        assert db_config.driver == "asyncpg"
+        assert db_config.driver_url.startswith("postgresql+asyncpg://")
+        assert db_config.pool_options == {
+            "pool_size": 10,
+            "max_overflow": 5,
+            "pool_recycle": 1800,
+            "statement_cache_size": 0,
+            "pool_pre_ping": True,
+        }
+        assert db_config.replica_urls == ["postgresql://ro@replica-1/shop"]
+        assert DatabaseConfig.from_url("sqlite:///test.db").connection_url == "sqlite:///test.db"
+        assert DatabaseConfig.from_url("postgres://db/shop").type == DatabaseType.POSTGRESQL
+
+    def test_from_url_srv_and_options(self):
+        """Test mongodb+srv URLs and unknown query parameters round-trip."""
+        mongo = DatabaseConfig.from_url("mongodb+srv://app@cluster0.example.net/shop?authSource=admin")
+
+        assert (mongo.type, mongo.driver, mongo.srv) == (DatabaseType.MONGODB, None, True)
+        assert mongo.options == {"authSource": "admin"}
+        assert mongo.connection_url == "mongodb+srv://app@cluster0.example.net/shop?authSource=admin"
+
+        pg = DatabaseConfig.from_url("postgresql://db/shop?sslmode=require&pool_size=5")
+        assert pg.options == {"sslmode": "require"}
+        assert pg.connection_url == "postgresql://db/shop?sslmode=require"
+        assert DatabaseConfig.from_dict(pg.to_dict()) == pg
+        assert pg.freeze().thaw() == pg
+
+    def test_connection_url_quotes_credentials(self):
+        """Test reserved characters in credentials survive a URL round trip."""
+        db_config = DatabaseConfig.from_url("postgresql://u%40x:p%2Fs%3Fs@h:5433/db")
+
+        assert db_config.password == "p/s?s"
+        assert db_config.connection_url == "postgresql://u%40x:p%2Fs%3Fs@h:5433/db"
+        assert DatabaseConfig.from_url(db_config.driver_url) == DatabaseConfig.from_url(db_config.connection_url)
+        assert DatabaseConfig.from_url(db_config.connection_url).password == "p/s?s"
+
+    def test_pool_settings_validation(self):
+        """Test invalid pool settings and drivers are rejected."""
+        with pytest.raises(ValueError):
+            DatabaseConfig(type=DatabaseType.POSTGRESQL, pool_size=-1)
+        with pytest.raises(ValueError):
+            DatabaseConfig(type=DatabaseType.POSTGRESQL, driver="motor")
+        with pytest.raises(ValueError):
+            DatabaseConfig.from_url("oracle://db/shop")
+        with pytest.raises(ValueError, match="pool_size must be a non-negative integer"):
+            DatabaseConfig.from_url("postgresql://db/shop?pool_size=abc")
+        with pytest.raises(ValueError):
+            DatabaseConfig(type=DatabaseType.POSTGRESQL, srv=True)
+
+    def test_pool_settings_round_trip(self):
+        """Test pool settings survive to_dict, from_dict and freezing."""
+        db_config = DatabaseConfig.from_url("mysql+aiomysql://db/shop?pool_size=4&replica=mysql://ro/shop")
+
+        assert DatabaseConfig.from_dict(db_config.to_dict()) == db_config
+        frozen = db_config.freeze()
+        assert frozen.replica_urls == ("mysql://ro/shop",)
+        assert frozen.thaw() == db_config
+        assert FrozenDatabaseConfig.from_url("mysql+aiomysql://db/shop?pool_size=4&replica=mysql://ro/shop") == frozen
+
     def test_orm_selection(self):
         """Test ORM selection based on database type."""
         # PostgreSQL with SQLAlchemy
@@ -412,3 +486,61 @@ class TestIntegrationConfig:
         assert config.database.orm == ORMType.TYPEORM
         assert config.auth.algorithm == "RS256"
         assert "swagger" in config.features
+
+
+class TestFrozenConfig:
+    """Test the immutable config variants."""
+
+    @staticmethod
+    def make_config() -> BackendConfig:
+        return BackendConfig(
+            project_name="shop-api",
+            features=["auth", "orders"],
+            cors_origins=["http://localhost:3000"],
+            database=DatabaseConfig(type=DatabaseType.POSTGRESQL, host="db", name="shop"),
+            auth=AuthConfig(method=AuthMethod.OAUTH2, oauth_providers=["google"])
+        )
+
+    def test_round_trip(self):
+        """Test freezing and thawing preserve every field."""
+        config = self.make_config()
+        frozen = config.freeze()
+
+        assert isinstance(frozen, FrozenBackendConfig)
+        assert isinstance(frozen.database, FrozenDatabaseConfig)
+        assert frozen.features == ("auth", "orders")
+        assert frozen.auth.oauth_providers == ("google",)
+        assert frozen.thaw() == config
+        assert frozen.to_dict() == config.to_dict()
+        assert FrozenBackendConfig.from_dict(config.to_dict()) == frozen
+        assert frozen.database.connection_url == config.database.connection_url
+        assert frozen.language == "python"
+
+    def test_immutable_and_slotted(self):
+        """Test frozen configs reject assignment and have no instance dict."""
+        frozen = self.make_config().freeze()
+
+        with pytest.raises(FrozenInstanceError):
+            frozen.debug = True
+        assert not hasattr(frozen, "__dict__")
+        assert frozen.replace(debug=True).debug is True
+        assert frozen.debug is False
+
+    def test_usable_as_keys(self):
+        """Test equal configs hash equally and deduplicate in dicts and sets."""
+        first = self.make_config().freeze()
+        second = self.make_config().freeze()
+        other = first.replace(cors_origins=("https://shop.example",))
+
+        assert first == second and hash(first) == hash(second)
+        assert first != other
+        assert len({first, second, other}) == 2
+        assert {first: "cached"}[second] == "cached"
+        assert pickle.loads(pickle.dumps(first)) == first
+
+    def test_validation(self):
+        """Test frozen configs validate like the dataclasses."""
+        with pytest.raises(ValueError):
+            FrozenBackendConfig(project_name="")
+        with pytest.raises(ValueError):
+            FrozenDatabaseConfig(type="unknown")
@@ -0,0 +1,82 @@
+"""
+Tests for request fingerprints.
+"""
+
+from genesis_backend.config import AuthConfig, AuthMethod, BackendConfig, DatabaseConfig, DatabaseType
+from genesis_backend.fingerprint import SECRET_FIELDS, canonical_architecture, fingerprint
+
+
+def make_config(**overrides):
+    values = {
+        "project_name": "shop-api",
+        "features": ["auth", "crud"],
+        "cors_origins": ["http://localhost:3000"],
+        "database": DatabaseConfig(type=DatabaseType.POSTGRESQL, name="shop", password="s3cret"),
+        "auth": AuthConfig(method=AuthMethod.JWT, secret_key="key-1"),
+    }
+    values.update(overrides)
+    return BackendConfig(**values)
+
+
+ARCHITECTURE = {
+    "data_models": [
+        {"name": "User", "fields": [{"name": "email", "type": "String"}]},
+        {"name": "Order", "fields": [{"name": "total", "type": "Float"}]},
+    ],
+    "endpoints": [{"path": "/users", "methods": ["GET", "POST"]}],
+}
+
+
+class TestFingerprint:
+    """Test canonical request fingerprints."""
+
+    def test_ignores_metadata_and_ordering(self):
+        """Metadata, key order and set-like list order do not change the fingerprint."""
+        reordered = {
+            "endpoints": ARCHITECTURE["endpoints"],
+            "data_models": ARCHITECTURE["data_models"],
+            "design_metadata": {"designed_at": "2024-01-01T00:00:00"},
+            "metadata": {"source": "architect"},
+        }
+
+        assert fingerprint(make_config(), ARCHITECTURE) == fingerprint(
+            make_config(features=["crud", "auth"]), reordered
+        )
+        assert "design_metadata" not in canonical_architecture(reordered)
+        assert "metadata" not in canonical_architecture(reordered)
+
+    def test_content_changes_the_fingerprint(self):
+        """Real changes, including list order and model metadata, change it."""
+        base = fingerprint(make_config(), ARCHITECTURE)
+        methods = {**ARCHITECTURE, "endpoints": [{"path": "/users", "methods": ["POST", "GET"]}]}
+        models = {**ARCHITECTURE, "data_models": list(reversed(ARCHITECTURE["data_models"]))}
+        model_metadata = {
+            **ARCHITECTURE,
+            "data_models": [{**ARCHITECTURE["data_models"][0], "metadata": {"table": "users"}}]
+            + ARCHITECTURE["data_models"][1:],
+        }
+
+        assert fingerprint(make_config(description="Shop"), ARCHITECTURE) != base
+        assert fingerprint(make_config(), methods) != base
+        assert fingerprint(make_config(), models) != base
+        assert fingerprint(make_config(), model_metadata) != base
+
+    def test_frozen_mutable_and_dict_configs_agree(self):
+        """Every config representation fingerprints the same."""
+        config = make_config()
+
+        assert fingerprint(config) == fingerprint(config.freeze()) == fingerprint(config.to_dict())
+
+    def test_excluded_secrets(self):
+        """Excluded fields, by name or dotted path, do not contribute."""
+        rotated = make_config(
+            database=DatabaseConfig(type=DatabaseType.POSTGRESQL, name="shop", password="other"),
+            auth=AuthConfig(method=AuthMethod.JWT, secret_key="key-2")
+        )
+
+        assert fingerprint(make_config()) != fingerprint(rotated)
+        assert fingerprint(make_config(), exclude=SECRET_FIELDS) == fingerprint(rotated, exclude=SECRET_FIELDS)
+        assert fingerprint(make_config().freeze(), exclude=SECRET_FIELDS) == fingerprint(rotated, exclude=SECRET_FIELDS)
+        assert fingerprint(
+            make_config(), exclude=["config.database.password", "config.auth.secret_key"]
+        ) == fingerprint(rotated, exclude=["config.database.password", "config.auth.secret_key"])
@@ -0,0 +1,716 @@
+"""
+Tests for the LLM transport layer.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from genesis_backend.llm import (
+    Cassette,
+    CassetteMiss,
+    FileStreamParser,
+    GeneratedFile,
+    HedgingPolicy,
+    LatencyTracker,
+    LLMClient,
+    PayloadTooLarge,
+    RateLimiter,
+    RateLimitPolicy,
+    RequestLog,
+    ResponseCache,
+    SingleFlight,
+    TokenBucket,
+    collect_requests,
+    compact_payload,
+    get_rate_limiter,
+    request_key,
+    throttle_signal
+)
+
+
+class TestResponseCache:
+    """Test ResponseCache functionality."""
+
+    def test_request_key_is_content_addressed(self):
+        """Test keys depend on content, not on dict ordering."""
+        key_a = request_key("claude", "reasoning", {"prompt": "p", "system_prompt": "s"})
+        key_b = request_key("claude", "reasoning", {"system_prompt": "s", "prompt": "p"})
+        key_c = request_key("openai", "reasoning", {"prompt": "p", "system_prompt": "s"})
+
+        assert key_a == key_b
+        assert key_a != key_c
+
+    def test_memory_hit_and_miss(self):
+        """Test memory tier hits and misses are counted."""
+        cache = ResponseCache()
+
+        assert cache.get("missing") is None
+        cache.set("key", "value")
+
+        assert cache.get("key") == "value"
+        assert cache.stats.memory_hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        """Test expired entries are treated as misses."""
+        cache = ResponseCache(ttl_seconds=0)
+        cache.set("key", "value")
+
+        assert cache.get("key") is None
+        assert cache.stats.misses == 1
+
+    def test_disk_tier_persists(self, tmp_path):
+        """Test entries survive a new cache instance on the same file."""
+        path = tmp_path / "llm_cache.sqlite"
+        first = ResponseCache(path=path)
+        first.set("key", {"code": "print('hi')"})
+        first.close()
+
+        second = ResponseCache(path=path)
+
+        assert second.get("key") == {"code": "print('hi')"}
+        assert second.stats.disk_hits == 1
+
+        # Promoted to the memory tier after the disk hit
+        assert second.get("key") == {"code": "print('hi')"}
+        assert second.stats.memory_hits == 1
+
+    def test_disk_size_eviction(self, tmp_path):
+        """Test the disk tier stays under its byte budget."""
+        cache = ResponseCache(path=tmp_path / "cache.sqlite", max_entries=1, max_disk_bytes=30)
+        cache.set("old", "x" * 20)
+        cache.set("new", "y" * 20)
+
+        assert cache.get("old") is None
+        assert cache.get("new") == "y" * 20
+
+    @pytest.mark.asyncio
+    async def test_async_access_and_running_size(self, tmp_path):
+        """Test aget/aset reach the disk tier and the size total stays exact."""
+        path = tmp_path / "cache.sqlite"
+        cache = ResponseCache(path=path, max_entries=1, max_disk_bytes=50)
+        await cache.aset("a", "x" * 10)
+        await cache.aset("a", "x" * 20)
+        await cache.aset("b", "y" * 20)
+
+        assert cache._disk_bytes == 44
+        assert await cache.aget("a") == "x" * 20
+        assert cache.stats.disk_hits == 1
+        await cache.aset("c", "z" * 20)
+        assert await cache.aget("a", "missing") == "missing"
+        cache.close()
+
+        reopened = ResponseCache(path=path, max_disk_bytes=50)
+        assert reopened._disk_bytes == 44
+        assert reopened.get("b") == "y" * 20
+
+
+class TestLLMClient:
+    """Test LLMClient send path."""
+
+    @pytest.mark.asyncio
+    async def test_passthrough_without_cache(self):
+        """Test the client forwards every call when no cache is configured."""
+        client = LLMClient()
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="Generated")
+
+            await client.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+            await client.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+
+            assert mock_protocol.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_protocol(self):
+        """Test identical requests are served from the cache."""
+        client = LLMClient(cache=ResponseCache())
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="Generated")
+
+            first = await client.send_request("agent_a", "claude", "reasoning", {"prompt": "p"})
+            second = await client.send_request("agent_b", "claude", "reasoning", {"prompt": "p"})
+
+            assert mock_protocol.call_count == 1
+            assert first.result == second.result == "Generated"
+            assert second.cached is True
+            assert client.cache.stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_requests_reach_metrics_sink(self):
+        """Test every request is recorded and handed to the metrics sink."""
+        records = []
+        log = RequestLog()
+        client = LLMClient(cache=ResponseCache(), limiter=RateLimiter(), metrics_sink=records.append)
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="x" * 40)
+
+            with collect_requests(log):
+                await client.send_request("agent", "claude", "reasoning", {"prompt": "p" * 80})
+                await client.send_request("agent", "claude", "reasoning", {"prompt": "p" * 80})
+
+        assert [record.cached for record in records] == [False, True]
+        assert records[0].provider == "claude"
+        assert records[0].action == "reasoning"
+        assert records[0].prompt_chars == 80
+        assert records[0].prompt_tokens == 20
+        assert records[0].response_tokens == 10
+        assert records[0].latency >= records[0].queue_wait >= 0
+
+        summary = log.summary()
+        assert summary["requests"] == 2
+        assert summary["cached"] == 1
+        assert summary["by_provider"]["claude"]["prompt_tokens"] == 20
+        assert summary["response_tokens"] == 10
+
+
+class TestSingleFlight:
+    """Test SingleFlight request coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_upstream(self):
+        """Test identical in-flight calls wait on one leader."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "shared"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        assert results == ["shared"] * 5
+        assert calls == 1
+        assert flight.stats.leaders == 1
+        assert flight.stats.followers == 4
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_waiter(self):
+        """Test the leader's exception is raised to all followers."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Provider unavailable")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(3)),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_last_cancelled_waiter_cancels_the_call(self):
+        """Test the shared call survives one cancellation but not all of them."""
+        flight = SingleFlight()
+        upstream = []
+
+        async def fetch():
+            upstream.append(asyncio.current_task())
+            await asyncio.sleep(10)
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        assert not upstream[0].done()
+
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert upstream[0].cancelled()
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_client_coalesces_identical_requests(self):
+        """Test LLMClient issues one protocol call for concurrent duplicates."""
+        client = LLMClient(single_flight=SingleFlight())
+
+        async def slow_send_request(**kwargs):
+            await asyncio.sleep(0.01)
+            return AsyncMock(result="requirements.txt")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=slow_send_request) as mock_protocol:
+            responses = await asyncio.gather(*(
+                client.send_request(f"agent-{i}", "deepseek", "fast_coding", {"prompt": "reqs"})
+                for i in range(4)
+            ))
+
+            assert mock_protocol.call_count == 1
+            assert all(response.result == "requirements.txt" for response in responses)
+
+    @pytest.mark.asyncio
+    async def test_coalesced_requests_are_not_double_counted(self):
+        """Test followers are flagged and left out of upstream token totals."""
+        records = []
+        log = RequestLog()
+        client = LLMClient(single_flight=SingleFlight(), limiter=RateLimiter(), metrics_sink=records.append)
+
+        async def slow_send_request(**kwargs):
+            await asyncio.sleep(0.01)
+            return AsyncMock(result="x" * 40)
+
+        with patch('mcpturbo.protocol.send_request', side_effect=slow_send_request):
+            with collect_requests(log):
+                await asyncio.gather(*(
+                    client.send_request(f"agent-{i}", "deepseek", "fast_coding", {"prompt": "p" * 80})
+                    for i in range(3)
+                ))
+
+        assert sorted(record.coalesced for record in records) == [False, True, True]
+        assert [len(record.attempts) for record in records if record.coalesced] == [0, 0]
+        summary = log.summary()
+        assert (summary["requests"], summary["coalesced"], summary["attempts"]) == (3, 2, 1)
+        assert (summary["prompt_tokens"], summary["response_tokens"]) == (20, 10)
+
+
+class TestRateLimiter:
+    """Test per-provider rate limiting."""
+
+    def test_token_bucket_delay(self):
+        """Test the bucket reports the wait needed to refill."""
+        now = [0.0]
+        bucket = TokenBucket(per_minute=60, clock=lambda: now[0])
+
+        bucket.consume(60)
+        assert bucket.delay_for(1) == pytest.approx(1.0)
+
+        now[0] = 30.0
+        assert bucket.delay_for(30) == 0.0
+
+    def test_throttle_signal_detection(self):
+        """Test throttling is recognised from exceptions and responses."""
+        assert throttle_signal(Exception("429 Too Many Requests")) == 0.0
+        assert throttle_signal(Exception("Network error")) is None
+        assert throttle_signal(MagicMock(success=False, error="rate limit exceeded", retry_after=2)) == 2.0
+        assert throttle_signal(MagicMock(success=True, result="ok")) is None
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight(self):
+        """Test the provider semaphore caps concurrent calls."""
+        limiter = RateLimiter(default_policy=RateLimitPolicy(max_in_flight=2))
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "ok"
+
+        await asyncio.gather(*(limiter.run("claude", call) for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.stats()["claude"]["requests"] == 6
+
+    @pytest.mark.asyncio
+    async def test_throttled_call_is_retried(self):
+        """Test a throttled call backs off and is retried."""
+        limiter = RateLimiter(
+            default_policy=RateLimitPolicy(backoff_base=0.01, backoff_max=0.05)
+        )
+        outcomes = [Exception("429 Too Many Requests"), "ok"]
+
+        async def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert await limiter.run("openai", call) == "ok"
+
+        stats = limiter.stats()["openai"]
+        assert stats["throttled"] == 1
+        assert stats["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_waits_do_not_hold_a_slot(self):
+        """Test a call waiting for token budget lets other calls take the slot."""
+        limiter = RateLimiter(default_policy=RateLimitPolicy(max_in_flight=1, tokens_per_minute=6000))
+        order = []
+
+        def call(name):
+            async def run():
+                order.append(name)
+                return "ok"
+            return run
+
+        await limiter.run("claude", call("large"), estimated_tokens=6000)
+        await asyncio.gather(
+            limiter.run("claude", call("waiting"), estimated_tokens=5),
+            limiter.run("claude", call("unbudgeted"))
+        )
+
+        assert order == ["large", "unbudgeted", "waiting"]
+
+    @pytest.mark.asyncio
+    async def test_non_throttle_errors_propagate(self):
+        """Test ordinary failures are not retried."""
+        limiter = RateLimiter()
+
+        async def call():
+            raise RuntimeError("Network error")
+
+        with pytest.raises(RuntimeError):
+            await limiter.run("deepseek", call)
+
+        assert limiter.stats()["deepseek"]["retries"] == 0
+
+    def test_limiter_shared_across_agents(self):
+        """Test every agent's default client shares the process-wide limiter."""
+        from genesis_backend.agents import ArchitectAgent, FastAPIAgent, DjangoAgent, NestJSAgent
+
+        limiters = {
+            id(agent.llm_client.limiter)
+            for agent in (ArchitectAgent(), FastAPIAgent(), DjangoAgent(), NestJSAgent())
+        }
+
+        assert limiters == {id(get_rate_limiter())}
+
+
+class TestHedging:
+    """Test hedged requests and provider failover."""
+
+    def test_hedge_delay_uses_recent_percentile(self):
+        """Test the hedge delay follows the provider's latency percentile."""
+        tracker = LatencyTracker()
+        policy = HedgingPolicy(percentile=0.9, min_samples=10, initial_delay=5.0)
+
+        for latency in range(1, 6):
+            tracker.record("claude", latency / 10)
+        assert policy.hedge_delay(tracker, "claude") == 5.0
+
+        for latency in range(6, 11):
+            tracker.record("claude", latency / 10)
+        assert policy.hedge_delay(tracker, "claude") == pytest.approx(0.9)
+
+    def test_candidates_follow_action_fallbacks(self):
+        """Test fallback order is configured per action."""
+        policy = HedgingPolicy(
+            fallbacks={"reasoning": ["claude", "openai", "deepseek"]},
+            default_fallbacks=["deepseek"],
+            max_hedges=2
+        )
+
+        assert policy.candidates("claude", "reasoning") == ["claude", "openai", "deepseek"]
+        assert policy.candidates("openai", "fast_coding") == ["openai", "deepseek"]
+
+    @pytest.mark.asyncio
+    async def test_slow_provider_is_hedged(self):
+        """Test a slow primary is raced against a fallback and cancelled."""
+        client = LLMClient(
+            limiter=RateLimiter(),
+            hedging=HedgingPolicy(initial_delay=0.01, default_fallbacks=["openai"])
+        )
+        cancelled = []
+
+        async def send_request(**kwargs):
+            if kwargs["target_id"] == "claude":
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append("claude")
+                    raise
+            return AsyncMock(result=f"from {kwargs['target_id']}")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            response = await client.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+            # The losing attempt is cancelled without waiting for it to unwind
+            await asyncio.sleep(0)
+
+        assert response.result == "from openai"
+        assert cancelled == ["claude"]
+        assert client.latency.count("openai") == 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_attempts_are_accounted_separately(self):
+        """Test each hedged attempt keeps its own provider, wait and outcome."""
+        records = []
+        client = LLMClient(
+            limiter=RateLimiter(),
+            hedging=HedgingPolicy(initial_delay=0.01, default_fallbacks=["openai"]),
+            metrics_sink=records.append
+        )
+
+        async def send_request(**kwargs):
+            if kwargs["target_id"] == "claude":
+                await asyncio.sleep(1)
+            return AsyncMock(result="answer")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            await client.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+            await asyncio.sleep(0)
+
+        record = records[0]
+        primary, hedge = record.attempts
+        assert (primary.provider, primary.cancelled, primary.won) == ("claude", True, False)
+        assert (hedge.provider, hedge.success, hedge.won) == ("openai", True, True)
+        assert record.provider == "openai"
+        assert record.queue_wait == hedge.queue_wait
+        assert [attempt["provider"] for attempt in record.to_dict()["attempts"]] == ["claude", "openai"]
+
+    @pytest.mark.asyncio
+    async def test_failed_provider_fails_over(self):
+        """Test an error from the primary moves on to the fallback."""
+        client = LLMClient(
+            limiter=RateLimiter(),
+            hedging=HedgingPolicy(fallbacks={"fast_coding": ["openai"]})
+        )
+
+        async def send_request(**kwargs):
+            if kwargs["target_id"] == "deepseek":
+                raise RuntimeError("Network error")
+            return AsyncMock(result="fallback")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request) as mock_protocol:
+            response = await client.send_request("agent", "deepseek", "fast_coding", {"prompt": "p"})
+
+        assert response.result == "fallback"
+        assert mock_protocol.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing_raises(self):
+        """Test the last failure surfaces when every provider fails."""
+        client = LLMClient(
+            limiter=RateLimiter(),
+            hedging=HedgingPolicy(default_fallbacks=["openai"])
+        )
+
+        with patch('mcpturbo.protocol.send_request', side_effect=RuntimeError("Network error")):
+            with pytest.raises(RuntimeError):
+                await client.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+
+
+class TestPayloadSerialization:
+    """Test compact prompt payload serialization."""
+
+    def test_drops_metadata_and_sorts_keys(self):
+        """Test metadata keys are dropped and key order does not matter."""
+        first = {"version": "v1", "style": "REST", "analysis_metadata": {"timestamp": "2024-01-01"}}
+        second = {"style": "REST", "version": "v1"}
+
+        assert compact_payload(first) == compact_payload(second) == '{"style":"REST","version":"v1"}'
+
+    def test_collapses_repeated_structure(self):
+        """Test lists of same-shaped objects become a column/row table."""
+        fields = [{"name": "id", "type": "int"}, {"name": "email", "type": "str"}]
+
+        assert compact_payload({"fields": fields}) == (
+            '{"fields":{"columns":["name","type"],"rows":[["id","int"],["email","str"]]}}'
+        )
+
+    def test_enforces_token_budget(self):
+        """Test large payloads raise over budget unless trimming is asked for."""
+        entities = [{"name": f"Entity{i}", "description": "x" * 200} for i in range(100)]
+
+        assert "Entity99" in compact_payload({"entities": entities})
+        with pytest.raises(PayloadTooLarge):
+            compact_payload({"entities": entities}, max_tokens=200)
+
+        text = compact_payload({"entities": entities}, max_tokens=200, truncate=True)
+
+        assert len(text) <= 200 * 4
+        assert "Entity0" in text
+        assert "more" in text
+
+    def test_keeps_nested_metadata_fields(self):
+        """Test metadata keys inside user schemas survive."""
+        models = {"data_models": [{"name": "Document", "metadata": {"indexed": True}}]}
+
+        assert '"metadata":{"indexed":true}' in compact_payload(models)
+
+    def test_drops_nested_result_metadata(self):
+        """Test ``*_metadata`` copied from earlier results is dropped at any depth."""
+        first = {"requirements": {"style": "REST", "analysis_metadata": {"analyzed_at": "2024-01-01"}}}
+        second = {"requirements": {"style": "REST", "analysis_metadata": {"analyzed_at": "2024-06-30"}}}
+
+        assert compact_payload(first) == compact_payload(second) == '{"requirements":{"style":"REST"}}'
+
+    def test_default_budgets(self):
+        """Test schemas have a hard default ceiling and context is trimmed to fit."""
+        from genesis_backend.llm import DEFAULT_CONTEXT_TOKENS, MAX_PAYLOAD_TOKENS, context_payload
+
+        huge = [{"name": f"Entity{i}", "description": "x" * 400} for i in range(400)]
+
+        with pytest.raises(PayloadTooLarge) as error:
+            compact_payload(huge)
+        assert error.value.max_tokens == MAX_PAYLOAD_TOKENS
+        assert len(context_payload({"entities": huge})) <= DEFAULT_CONTEXT_TOKENS * 4
+
+
+class TestCassette:
+    """Test record/replay cassettes."""
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay_offline(self, tmp_path):
+        """Test recorded responses replay in order without the protocol."""
+        path = tmp_path / "agents.jsonl.gz"
+        recorder = LLMClient(limiter=RateLimiter(), transport=Cassette(path, mode="record"))
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.side_effect = [AsyncMock(result="first"), AsyncMock(result="second")]
+            await recorder.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+            await recorder.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+
+        cassette = Cassette(path)
+        player = LLMClient(limiter=RateLimiter(), transport=cassette)
+
+        with patch('mcpturbo.protocol.send_request', side_effect=AssertionError("network used")):
+            results = [
+                (await player.send_request("other", "claude", "reasoning", {"prompt": "p"})).result
+                for _ in range(3)
+            ]
+
+        assert len(cassette) == 2
+        assert results == ["first", "second", "second"]
+
+    @pytest.mark.asyncio
+    async def test_rerecording_replaces_cassette(self, tmp_path):
+        """Test record mode starts over instead of appending to the old file."""
+        path = tmp_path / "agents.jsonl"
+        for result in ("stale", "fresh"):
+            cassette = Cassette(path, mode="record")
+            with patch('mcpturbo.protocol.send_request') as mock_protocol:
+                mock_protocol.return_value = AsyncMock(result=result)
+                await cassette.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+            assert len(cassette) == 1
+
+        replayed = Cassette(path)
+        assert len(replayed) == 1
+        assert (await replayed.send_request("agent", "claude", "reasoning", {"prompt": "p"})).result == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_replay_miss_raises(self, tmp_path):
+        """Test an unrecorded request fails instead of reaching the network."""
+        client = LLMClient(limiter=RateLimiter(), transport=Cassette(tmp_path / "empty.jsonl"))
+
+        with pytest.raises(CassetteMiss):
+            await client.send_request("agent", "openai", "code_generation", {"prompt": "p"})
+
+    @pytest.mark.asyncio
+    async def test_replay_injects_recorded_latency(self, tmp_path):
+        """Test replay sleeps for the scaled recorded latency."""
+        path = tmp_path / "slow.jsonl"
+        path.write_text(
+            '{"key":"%s","target_id":"claude","action":"reasoning","result":"ok","latency":0.05}\n'
+            % request_key("claude", "reasoning", {"prompt": "p"})
+        )
+        cassette = Cassette(path, latency_scale=1.0)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        response = await cassette.send_request("agent", "claude", "reasoning", {"prompt": "p"})
+
+        assert response.result == "ok"
+        assert loop.time() - start >= 0.05
+
+
+class TestStreaming:
+    """Test streaming consumption and incremental file emission."""
+
+    def test_parser_emits_files_on_closing_fence(self):
+        """Test files are emitted as soon as their fence closes."""
+        parser = FileStreamParser()
+        text = (
+            "### app/routers/users.py\n"
+            "```python\n"
+            "router = APIRouter()\n"
+            "```\n"
+            "```python app/main.py\n"
+            "app = FastAPI()\n"
+            "```\n"
+        )
+
+        emitted = []
+        for position in range(0, len(text), 5):
+            for generated in parser.feed(text[position:position + 5]):
+                emitted.append((position, generated))
+
+        assert [generated.path for _, generated in emitted] == ["app/routers/users.py", "app/main.py"]
+        assert emitted[0][1].content == "router = APIRouter()\n"
+        assert emitted[0][1].language == "python"
+        assert emitted[0][0] < emitted[1][0]
+        assert parser.close() == []
+
+    def test_parser_handles_large_chunks(self):
+        """Test one chunk holding many files and a line split across chunks."""
+        parser = FileStreamParser()
+        text = "".join(f"```python file_{i}.py\nvalue = {i}\n```\n" for i in range(200))
+
+        files = parser.feed(text[:-5]) + parser.feed("") + parser.feed(text[-5:])
+
+        assert len(files) == 200
+        assert files[-1].path == "file_199.py"
+        assert files[-1].content == "value = 199\n"
+        assert parser.close() == []
+
+    def test_parser_flushes_unterminated_block(self):
+        """Test a block cut off by the end of the stream is still emitted."""
+        parser = FileStreamParser()
+        parser.feed("```\npartial")
+
+        files = parser.close()
+
+        assert len(files) == 1
+        assert files[0].path == "file_1"
+        assert files[0].content == "partial\n"
+
+    @pytest.mark.asyncio
+    async def test_stream_task_yields_files_before_result(self):
+        """Test agents emit files while the LLM is still streaming."""
+        from genesis_agents import AgentTask, TaskResult
+        from genesis_backend.agents import FastAPIAgent
+
+        progress = []
+
+        async def stream_request(**kwargs):
+            for chunk in ["```python app/routers/users.py\n", "router = 1\n", "```\n",
+                          "```python app/routers/items.py\n", "router = 2\n", "```\n"]:
+                progress.append(chunk)
+                await asyncio.sleep(0)
+                yield chunk
+
+        agent = FastAPIAgent()
+        task = AgentTask(
+            id="stream-routes-1",
+            name="generate_fastapi_routes",
+            params={"api_design": {"version": "v1"}}
+        )
+
+        with patch('mcpturbo.protocol.stream_request', new=stream_request, create=True):
+            events = []
+            async for event in agent.stream_task(task):
+                events.append((len(progress), event))
+
+        files = [event for _, event in events if isinstance(event, GeneratedFile)]
+        assert [generated.path for generated in files] == ["app/routers/users.py", "app/routers/items.py"]
+        # First file arrives before the stream has finished
+        assert events[0][0] < 6
+        assert isinstance(events[-1][1], TaskResult)
+        assert events[-1][1].success is True
+        assert "router = 1" in events[-1][1].result["routes_code"]
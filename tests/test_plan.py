@@ -0,0 +1,75 @@
+"""
+Tests for generation plans.
+"""
+
+import pytest
+from dataclasses import FrozenInstanceError
+from genesis_backend.config import (
+    AuthConfig,
+    AuthMethod,
+    BackendConfig,
+    BackendFramework,
+    DatabaseConfig,
+    DatabaseType,
+    ORMType,
+)
+from genesis_backend.plan import GenerationPlan, compile_plan
+
+
+def make_config(**overrides):
+    values = {
+        "project_name": "shop-api",
+        "features": ["auth", "crud"],
+        "database": DatabaseConfig(type=DatabaseType.POSTGRESQL),
+        "auth": AuthConfig(method=AuthMethod.JWT, secret_key="s3cret"),
+    }
+    values.update(overrides)
+    return BackendConfig(**values)
+
+
+class TestGenerationPlan:
+    """Test compiling configs into generation plans."""
+
+    def test_resolves_config(self):
+        """Enums, features, ORM, driver and tasks are resolved once."""
+        plan = compile_plan(make_config())
+
+        assert plan.framework == BackendFramework.FASTAPI
+        assert plan.language == "python"
+        assert plan.database == DatabaseType.POSTGRESQL
+        assert plan.orm == ORMType.SQLALCHEMY
+        assert plan.driver == "asyncpg"
+        assert plan.auth == AuthMethod.JWT
+        assert plan.has_feature("crud") and not plan.has_feature("admin")
+        assert plan.tasks[0] == "generate_fastapi_app"
+        assert "generate_fastapi_auth" in plan.tasks
+
+        with pytest.raises(FrozenInstanceError):
+            plan.orm = ORMType.PRISMA
+
+    def test_framework_defaults_and_optional_tasks(self):
+        """Defaults follow the framework; tasks needing absent config are left out."""
+        django = compile_plan(make_config(framework=BackendFramework.DJANGO, auth=None))
+        nestjs = compile_plan(make_config(
+            framework=BackendFramework.NESTJS,
+            database=DatabaseConfig(type=DatabaseType.MONGODB)
+        ))
+        explicit = compile_plan(make_config(
+            database=DatabaseConfig(type=DatabaseType.SQLITE, orm=ORMType.PRISMA)
+        ))
+
+        assert (django.orm, django.driver) == (ORMType.DJANGO_ORM, "psycopg")
+        assert "generate_django_auth" not in django.tasks
+        assert (nestjs.language, nestjs.orm, nestjs.driver) == ("typescript", ORMType.MONGOOSE, "mongodb")
+        assert explicit.orm == ORMType.PRISMA
+
+    def test_compiled_once_per_project(self):
+        """Equal configs, in any representation, share one plan."""
+        config = make_config()
+        plan = compile_plan(config)
+
+        assert compile_plan(config.to_dict()) is plan
+        assert compile_plan(config.freeze()) is plan
+        assert compile_plan(plan) is plan
+        assert isinstance(plan.params()["plan"], GenerationPlan)
+        assert plan.params()["config"] == config.to_dict()
@@ -0,0 +1,89 @@
+"""
+Tests for post-processing offload.
+"""
+
+import asyncio
+import pytest
+from functools import partial
+from unittest.mock import AsyncMock, patch
+from genesis_agents import AgentTask
+
+from genesis_backend.postprocess import PostProcessor, set_post_processor
+
+
+def count_lines(text: str) -> int:
+    return text.count("\n")
+
+
+def count_token(text: str, token: str) -> int:
+    return text.count(token)
+
+
+class TestPostProcessor:
+    """Test PostProcessor execution."""
+
+    @pytest.mark.asyncio
+    async def test_small_inputs_run_inline(self):
+        """Test inputs under the threshold skip the process pool."""
+        processor = PostProcessor(threshold=1024)
+
+        result = await processor.parse("a\nb\n", {"lines": count_lines})
+
+        assert result == {"lines": 2}
+        assert processor.stats.inline == 1
+        assert processor.stats.offloaded == 0
+
+    @pytest.mark.asyncio
+    async def test_large_inputs_are_offloaded(self):
+        """Test large inputs are parsed in the process pool."""
+        processor = PostProcessor(max_workers=1, threshold=10)
+        text = "def handler():\n    pass\n" * 100
+
+        try:
+            result = await processor.parse(text, {
+                "lines": count_lines,
+                "functions": partial(count_token, token="def ")
+            })
+        finally:
+            processor.shutdown()
+
+        assert result == {"lines": 200, "functions": 100}
+        assert processor.stats.offloaded == 1
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_work_falls_back_inline(self):
+        """Test closures that cannot be pickled still run."""
+        processor = PostProcessor(max_workers=1, threshold=0)
+        marker = "x"
+
+        try:
+            result = await processor.parse("xx", {"markers": lambda text: text.count(marker)})
+        finally:
+            processor.shutdown()
+
+        assert result == {"markers": 2}
+        assert processor.stats.fallbacks == 1
+
+    @pytest.mark.asyncio
+    async def test_agent_parsers_run_in_pool(self):
+        """Test agent parse/extract helpers can be shipped to the pool."""
+        from genesis_backend.agents import FastAPIAgent
+
+        processor = PostProcessor(max_workers=1, threshold=0)
+        set_post_processor(processor)
+        try:
+            with patch('mcpturbo.protocol.send_request') as mock_protocol:
+                mock_protocol.return_value = AsyncMock(result="class UserCreate(BaseModel): ...")
+
+                result = await FastAPIAgent().execute_task(AgentTask(
+                    id="schemas-offloaded",
+                    name="generate_pydantic_models",
+                    params={"data_models": [{"name": "User"}]}
+                ))
+        finally:
+            set_post_processor(None)
+
+        assert result.success is True
+        assert "schema_classes" in result.result
+        assert processor.stats.offloaded == 1
+        assert processor.stats.fallbacks == 0
@@ -0,0 +1,310 @@
+"""
+Tests for the generation scheduler.
+"""
+
+import asyncio
+import pytest
+from genesis_agents import TaskResult
+
+from genesis_backend.config import BackendConfig, BackendFramework
+from genesis_backend.scheduler import (
+    BrokerWorker,
+    DistributedScheduler,
+    FairJobQueue,
+    GenerationJob,
+    GenerationScheduler,
+    InMemoryBroker,
+    JobBroker,
+    JobStatus,
+    RedisBroker,
+    SQLiteBroker,
+    open_broker,
+)
+
+
+class RecordingAgent:
+    """Framework agent stub recording the order tasks start in."""
+
+    def __init__(self, started, delay: float = 0.01):
+        self.started = started
+        self.delay = delay
+
+    async def execute_task(self, task):
+        self.started.append((task.name, task.params["config"]["project_name"]))
+        await asyncio.sleep(self.delay)
+        return TaskResult(task_id=task.id, success=True, result={"project": task.params["config"]["project_name"]})
+
+
+def make_config(name: str, framework: BackendFramework = BackendFramework.FASTAPI) -> BackendConfig:
+    return BackendConfig(project_name=name, framework=framework)
+
+
+class TestFairJobQueue:
+    """Test FairJobQueue ordering."""
+
+    def test_priority_first(self):
+        """Test higher priority jobs are taken first."""
+        queue = FairJobQueue()
+        low = GenerationJob(config=make_config("low"))
+        high = GenerationJob(config=make_config("high"), priority=5)
+        queue.push(low)
+        queue.push(high)
+
+        assert queue.pop() is high
+        assert queue.pop() is low
+        assert queue.pop() is None
+
+    def test_small_tenant_not_starved(self):
+        """Test a tenant with large jobs yields to a tenant with a small one."""
+        queue = FairJobQueue()
+        big_jobs = [
+            GenerationJob(config=make_config(f"big-{i}"), tenant="team-a", architecture={"entities": list(range(50))})
+            for i in range(3)
+        ]
+        for job in big_jobs:
+            queue.push(job)
+        small = GenerationJob(config=make_config("small"), tenant="team-b")
+        queue.push(small)
+
+        assert [queue.pop() for _ in range(4)] == [big_jobs[0], small, big_jobs[1], big_jobs[2]]
+
+    def test_waiting_jobs_age_into_higher_priority(self):
+        """Test aging lifts long-waiting low priority jobs."""
+        queue = FairJobQueue(aging_seconds=10)
+        old = GenerationJob(config=make_config("old"), submitted_at=0.0)
+        new = GenerationJob(config=make_config("new"), priority=1, submitted_at=25.0)
+        queue.push(new)
+        queue.push(old)
+
+        assert queue.pop(now=25.0) is old
+
+    def test_aged_backlog_does_not_starve_other_tenants(self):
+        """Test an old backlog of one priority does not outrank fresh jobs of that priority."""
+        queue = FairJobQueue(aging_seconds=10)
+        backlog = [
+            GenerationJob(config=make_config(f"a-{i}"), tenant="team-a", submitted_at=0.0)
+            for i in range(20)
+        ]
+        for job in backlog:
+            queue.push(job)
+        fresh = GenerationJob(config=make_config("b"), tenant="team-b", submitted_at=70.0)
+        queue.push(fresh)
+
+        assert queue.pop(now=70.0) is backlog[0]
+        assert queue.pop(now=70.0) is fresh
+
+    def test_wait_metrics_are_bounded(self):
+        """Test wait samples are windowed while count, mean and max stay exact."""
+        from genesis_backend.scheduler.pool import WAIT_WINDOW, SchedulerMetrics
+
+        metrics = SchedulerMetrics()
+        for index in range(WAIT_WINDOW * 3):
+            metrics.record_wait("team-a", float(index))
+
+        summary = metrics.to_dict()["wait_seconds_by_tenant"]["team-a"]
+        assert len(metrics.wait_times["team-a"].recent) == WAIT_WINDOW
+        assert summary["count"] == WAIT_WINDOW * 3
+        assert summary["max"] == WAIT_WINDOW * 3 - 1
+
+    def test_removed_jobs_are_skipped(self):
+        """Test removed jobs never come out of the queue and depths stay exact."""
+        queue = FairJobQueue(aging_seconds=10)
+        jobs = [
+            GenerationJob(config=make_config(f"job-{i}"), tenant=f"team-{i % 2}", submitted_at=float(i))
+            for i in range(6)
+        ]
+        for job in jobs:
+            queue.push(job)
+
+        assert queue.remove(jobs[0]) is True
+        assert queue.remove(jobs[0]) is False
+        assert queue.remove(jobs[3]) is True
+        assert queue.depth_by_tenant() == {"team-0": 2, "team-1": 2}
+        popped = [queue.pop(now=10.0) for _ in range(5)]
+
+        assert popped[-1] is None
+        assert sorted(job.id for job in popped[:4]) == sorted(job.id for job in (jobs[1], jobs[2], jobs[4], jobs[5]))
+        assert len(queue) == 0 and queue.depth_by_tenant() == {}
+
+
+class TestGenerationScheduler:
+    """Test GenerationScheduler dispatch and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_dispatch_to_framework_agents(self):
+        """Test each job runs the project task of its framework's agent."""
+        started = []
+        agents = {
+            BackendFramework.FASTAPI: RecordingAgent(started),
+            BackendFramework.DJANGO: RecordingAgent(started),
+        }
+
+        async with GenerationScheduler(workers=2, agents=agents) as scheduler:
+            fastapi_job = scheduler.submit(make_config("shop"))
+            django_job = scheduler.submit(make_config("blog", BackendFramework.DJANGO))
+            express_job = scheduler.submit(make_config("api", BackendFramework.EXPRESS))
+
+            results = [await scheduler.wait(job) for job in (fastapi_job, django_job, express_job)]
+
+        assert sorted(started) == [("generate_django_project", "blog"), ("generate_fastapi_app", "shop")]
+        assert [result.success for result in results] == [True, True, False]
+        assert express_job.status == JobStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_fair_sharing_and_metrics(self):
+        """Test a small job overtakes a backlog of large jobs and waits are tracked."""
+        started = []
+        scheduler = GenerationScheduler(workers=1, agents={BackendFramework.FASTAPI: RecordingAgent(started)})
+
+        for i in range(4):
+            scheduler.submit(make_config(f"big-{i}"), {"entities": list(range(50))}, tenant="team-a")
+        small = scheduler.submit(make_config("small"), tenant="team-b")
+
+        await scheduler.start()
+        await scheduler.wait(small)
+        await scheduler.stop()
+
+        assert [name for _, name in started][:2] == ["big-0", "small"]
+
+        metrics = scheduler.metrics.to_dict()
+        assert metrics["submitted"] == 5
+        assert metrics["succeeded"] == 5
+        assert metrics["max_queue_depth"] == 5
+        assert metrics["wait_seconds_by_tenant"]["team-a"]["count"] == 4
+        assert scheduler.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_frozen_configs_are_accepted(self):
+        """Test jobs can be submitted with frozen configs."""
+        started = []
+        frozen = make_config("frozen").freeze()
+
+        async with GenerationScheduler(workers=1, agents={BackendFramework.FASTAPI: RecordingAgent(started)}) as scheduler:
+            result = await scheduler.wait(scheduler.submit(frozen))
+
+        assert result.success is True
+        assert started == [("generate_fastapi_app", "frozen")]
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job(self):
+        """Test a queued job can be cancelled before it starts."""
+        started = []
+        scheduler = GenerationScheduler(workers=1, agents={BackendFramework.FASTAPI: RecordingAgent(started)})
+        job = scheduler.submit(make_config("cancelled"))
+
+        assert scheduler.cancel(job) is True
+
+        await scheduler.start()
+        await scheduler.stop()
+
+        assert started == []
+        assert job.status == JobStatus.CANCELLED
+        with pytest.raises(asyncio.CancelledError):
+            await scheduler.wait(job)
+
+
+class FailingAgent:
+    """Framework agent stub that raises."""
+
+    async def execute_task(self, task):
+        raise RuntimeError("generator crashed")
+
+
+class TestDistributedGeneration:
+    """Test broker-fed workers."""
+
+    @pytest.mark.asyncio
+    async def test_results_return_by_job_id(self):
+        """Test jobs run on a worker and results come back by ID."""
+        started = []
+        broker = InMemoryBroker()
+        scheduler = DistributedScheduler(broker)
+        worker = BrokerWorker(broker, agents={BackendFramework.FASTAPI: RecordingAgent(started)}, concurrency=2)
+
+        job_ids = [await scheduler.submit(make_config(f"app-{i}")) for i in range(3)]
+        processed = await worker.run(max_jobs=3)
+
+        assert processed == 3
+        for i, job_id in enumerate(job_ids):
+            result = await scheduler.result(job_id, timeout=1.0)
+            assert result.task_id == job_id
+            assert result.result == {"project": f"app-{i}"}
+
+    @pytest.mark.asyncio
+    async def test_sqlite_workers_claim_each_job_once(self, tmp_path):
+        """Test workers sharing a SQLite broker split jobs by priority."""
+        path = tmp_path / "jobs.db"
+        started = []
+        scheduler = DistributedScheduler(SQLiteBroker(path))
+        job_ids = [await scheduler.submit(make_config(f"app-{i}")) for i in range(4)]
+        urgent = await scheduler.submit(make_config("urgent"), priority=5)
+
+        workers = [
+            BrokerWorker(SQLiteBroker(path), agents={BackendFramework.FASTAPI: RecordingAgent(started, delay=0)})
+            for _ in range(2)
+        ]
+        counts = await asyncio.gather(workers[0].run(max_jobs=3), workers[1].run(max_jobs=2))
+
+        assert sum(counts) == 5
+        assert started[0] == ("generate_fastapi_app", "urgent")
+        assert sorted(name for _, name in started) == ["app-0", "app-1", "app-2", "app-3", "urgent"]
+        assert (await scheduler.result(urgent, timeout=1.0)).result == {"project": "urgent"}
+        results = [await scheduler.result(job_id, timeout=1.0) for job_id in job_ids]
+        assert all(result.success for result in results)
+
+    @pytest.mark.asyncio
+    async def test_sqlite_redelivers_stale_claims(self, tmp_path):
+        """Test a job claimed by a worker that died is claimed again."""
+        path = tmp_path / "jobs.db"
+        broker = SQLiteBroker(path, visibility_timeout=0.2)
+        await broker.enqueue({"id": "job-1", "priority": 0})
+
+        assert (await broker.dequeue(timeout=0))["id"] == "job-1"
+        assert await broker.dequeue(timeout=0) is None
+        await asyncio.sleep(0.15)
+        await broker.touch("job-1")
+        await asyncio.sleep(0.1)
+        assert await broker.dequeue(timeout=0) is None
+
+        redelivered = await broker.dequeue(timeout=1.0)
+        assert redelivered["id"] == "job-1"
+        await broker.complete("job-1", {"success": True})
+        await asyncio.sleep(0.25)
+        assert await broker.dequeue(timeout=0) is None
+        assert await broker.get_result("job-1", timeout=0) == {"success": True}
+
+    def test_broker_interface_is_abstract(self):
+        """Test brokers must implement the whole interface."""
+        with pytest.raises(TypeError):
+            JobBroker()
+        with pytest.raises(ValueError):
+            SQLiteBroker(":memory:", visibility_timeout=0)
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts(self):
+        """Test agent errors become failed results and missing results time out."""
+        broker = InMemoryBroker()
+        scheduler = DistributedScheduler(broker)
+        worker = BrokerWorker(broker, agents={BackendFramework.FASTAPI: FailingAgent()})
+
+        with pytest.raises(ValueError):
+            await scheduler.submit(make_config("api", BackendFramework.EXPRESS))
+
+        job_id = await scheduler.submit(make_config("crash"), tenant="team-a")
+        await worker.run(max_jobs=1)
+
+        result = await scheduler.result(job_id, timeout=1.0)
+        assert result.success is False
+        assert result.error == "generator crashed"
+        assert result.metadata == {"tenant": "team-a"}
+
+        with pytest.raises(asyncio.TimeoutError):
+            await scheduler.result("unknown", timeout=0.05)
+
+    def test_open_broker(self, tmp_path):
+        """Test broker URLs map to broker classes."""
+        assert isinstance(open_broker("memory://"), InMemoryBroker)
+        assert open_broker(f"sqlite:///{tmp_path}/jobs.db").path == tmp_path / "jobs.db"
+        assert isinstance(open_broker("redis://localhost:6379/0"), RedisBroker)
+        with pytest.raises(ValueError):
+            open_broker("amqp://localhost")
@@ -0,0 +1,384 @@
+"""
+Tests for the workflow engine.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from genesis_agents import TaskResult
+
+from genesis_backend.agents import ArchitectAgent, FastAPIAgent
+from genesis_backend.config import AuthConfig, AuthMethod, BackendConfig, DatabaseConfig, DatabaseType
+from genesis_backend.workflow import (
+    ArtifactStore,
+    CheckpointStore,
+    IncrementalGenerator,
+    Ref,
+    SpeculativeGenerator,
+    Workflow,
+    accepts_architecture,
+    architecture_workflow,
+)
+
+
+class RecordingAgent:
+    """Agent stub that records task params and concurrency."""
+
+    def __init__(self, delay: float = 0.01, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.params = {}
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute_task(self, task):
+        self.params[task.name] = task.params
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+        if task.name in self.failing:
+            return TaskResult(task_id=task.id, success=False, error=f"{task.name} failed")
+        return TaskResult(task_id=task.id, success=True, result={"name": task.name, "items": [task.name]})
+
+
+class TestWorkflow:
+    """Test Workflow graph execution."""
+
+    @pytest.mark.asyncio
+    async def test_independent_branches_run_concurrently(self):
+        """Test nodes without mutual dependencies overlap."""
+        agent = RecordingAgent()
+        workflow = Workflow()
+        workflow.add("root", agent, "root")
+        workflow.add("left", agent, "left", {"input": Ref("root")})
+        workflow.add("right", agent, "right", {"input": Ref("root")})
+        workflow.add("join", agent, "join", {"left": Ref("left", "items"), "right": Ref("right")})
+
+        result = await workflow.run()
+
+        assert result.success is True
+        assert agent.peak == 2
+        assert result.completed[0] == "root"
+        assert result.completed[-1] == "join"
+
+    @pytest.mark.asyncio
+    async def test_results_pass_by_reference(self):
+        """Test referenced results reach dependents without copying."""
+        agent = RecordingAgent(delay=0)
+        workflow = Workflow()
+        workflow.add("root", agent, "root")
+        workflow.add("child", agent, "child", {"items": Ref("root", "items")})
+
+        result = await workflow.run()
+
+        assert agent.params["child"]["items"] is result["root"].result["items"]
+
+    @pytest.mark.asyncio
+    async def test_failure_skips_dependents_only(self):
+        """Test a failed node skips its dependents while other branches finish."""
+        agent = RecordingAgent(delay=0, failing={"left"})
+        workflow = Workflow()
+        workflow.add("left", agent, "left")
+        workflow.add("after_left", agent, "after_left", {"input": Ref("left")})
+        workflow.add("right", agent, "right")
+
+        result = await workflow.run()
+
+        assert result.failed == ["left", "after_left"]
+        assert result["after_left"].metadata["skipped"] is True
+        assert result["right"].success is True
+        assert "after_left" not in agent.params
+
+    def test_invalid_graphs_are_rejected(self):
+        """Test unknown dependencies and cycles fail validation."""
+        agent = RecordingAgent()
+
+        unknown = Workflow()
+        unknown.add("a", agent, "a", {"input": Ref("missing")})
+        with pytest.raises(ValueError, match="unknown"):
+            unknown.validate()
+
+        cyclic = Workflow()
+        cyclic.add("a", agent, "a", {"input": Ref("b")})
+        cyclic.add("b", agent, "b", {"input": Ref("a")})
+        with pytest.raises(ValueError, match="cycle"):
+            cyclic.validate()
+
+    @pytest.mark.asyncio
+    async def test_architecture_workflow(self):
+        """Test the architect phases run as a graph with parallel branches."""
+        in_flight = 0
+        peak = 0
+
+        async def send_request(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return AsyncMock(result="Architecture output")
+
+        workflow = architecture_workflow(
+            ArchitectAgent(),
+            description="E-commerce API",
+            features=["users", "orders"]
+        )
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            result = await workflow.run()
+
+        assert result.success is True
+        assert set(result.results) == {
+            "requirements", "technologies", "api_design", "data_models", "services", "validation"
+        }
+        # Technology selection overlaps API design
+        assert peak == 2
+        assert result.completed[-1] == "validation"
+
+
+class TestCheckpointResume:
+    """Test workflow checkpoints."""
+
+    @staticmethod
+    def build(agent, store, description="Shop"):
+        workflow = Workflow(workflow_id="project-42", checkpoint=store)
+        workflow.add("architect", agent, "architect", {"description": description})
+        workflow.add("database", agent, "database", {"design": Ref("architect")})
+        workflow.add("auth", agent, "auth", {"design": Ref("architect")})
+        workflow.add("app", agent, "app", {"database": Ref("database"), "auth": Ref("auth")})
+        return workflow
+
+    @pytest.mark.asyncio
+    async def test_retry_resumes_from_failed_step(self, tmp_path):
+        """Test a retry restores completed nodes and only re-runs the rest."""
+        store = CheckpointStore(tmp_path / "checkpoints.db")
+        failing_agent = RecordingAgent(delay=0, failing={"app"})
+
+        first = await self.build(failing_agent, store).run()
+        assert first.failed == ["app"]
+
+        # A new store instance on the same file, as after a process restart
+        retry_agent = RecordingAgent(delay=0)
+        retry = await self.build(retry_agent, CheckpointStore(tmp_path / "checkpoints.db")).run()
+
+        assert retry.success is True
+        assert sorted(retry.resumed) == ["architect", "auth", "database"]
+        assert retry.completed == ["app"]
+        assert list(retry_agent.params) == ["app"]
+        assert retry_agent.params["app"]["database"] == {"name": "database", "items": ["database"]}
+
+    @pytest.mark.asyncio
+    async def test_changed_inputs_start_afresh(self):
+        """Test checkpoints are keyed by the workflow's input fingerprint."""
+        store = CheckpointStore()
+        await self.build(RecordingAgent(delay=0), store).run()
+
+        agent = RecordingAgent(delay=0)
+        result = await self.build(agent, store, description="Blog").run()
+
+        assert result.resumed == []
+        assert set(agent.params) == {"architect", "database", "auth", "app"}
+
+        store.clear("project-42")
+        again = RecordingAgent(delay=0)
+        await self.build(again, store).run()
+        assert len(again.params) == 4
+
+
+def make_fastapi_config(**overrides) -> BackendConfig:
+    values = {
+        "project_name": "shop",
+        "database": DatabaseConfig(type=DatabaseType.POSTGRESQL),
+        "auth": AuthConfig(method=AuthMethod.JWT, secret_key="s3cret"),
+        "cors_origins": ["http://localhost:3000"],
+    }
+    values.update(overrides)
+    return BackendConfig(**values)
+
+
+ARCHITECTURE = {
+    "data_models": [{"name": "User"}, {"name": "Order"}],
+    "api_design": {"endpoints": ["/users", "/orders"]},
+}
+
+
+class TestIncrementalGenerator:
+    """Test incremental regeneration."""
+
+    @pytest.mark.asyncio
+    async def test_only_affected_steps_rerun(self):
+        """Test a CORS change reruns application and middleware and reuses the rest."""
+        generator = IncrementalGenerator(FastAPIAgent())
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="generated code")
+
+            first = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+            calls_after_first = mock_protocol.call_count
+
+            unchanged = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+            assert mock_protocol.call_count == calls_after_first
+
+            cors = await generator.generate(
+                make_fastapi_config(cors_origins=["http://localhost:3000", "https://shop.example"]),
+                ARCHITECTURE
+            )
+
+        assert first.success is True
+        assert first.reused == []
+        assert unchanged.regenerated == []
+        assert unchanged["routes"].result == first["routes"].result
+        assert unchanged["routes"].metadata["reused"] is True
+
+        assert cors.changed == ["config.cors_origins"]
+        assert cors.regenerated == ["application", "middleware"]
+        assert "models" in cors.reused
+        assert generator.affected_steps(["config.cors_origins"]) == ["application", "middleware"]
+        assert "application" in generator.affected_steps(["config.database.pool_size"])
+        assert "application" in generator.affected_steps(["config.database.replica_urls"])
+
+    @pytest.mark.asyncio
+    async def test_result_metadata_is_not_a_change(self):
+        """Test result metadata reuses every step while model order and metadata do not."""
+        generator = IncrementalGenerator(FastAPIAgent())
+        annotated = {**ARCHITECTURE, "design_metadata": {"designed_at": "2024-05-01T12:00:00"}}
+        reordered = {**annotated, "data_models": list(reversed(ARCHITECTURE["data_models"]))}
+        model_metadata = {
+            **reordered,
+            "data_models": [{"name": "Order", "metadata": {"table": "orders"}}, {"name": "User"}],
+        }
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="generated code")
+
+            first = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+            second = await generator.generate(make_fastapi_config(), annotated)
+            third = await generator.generate(make_fastapi_config(), reordered)
+            fourth = await generator.generate(make_fastapi_config(), model_metadata)
+
+        assert second.changed == []
+        assert second.regenerated == []
+        assert second.fingerprint == first.fingerprint
+        assert third.changed == ["architecture.data_models"]
+        assert "models" in third.regenerated
+        assert fourth.changed == ["architecture.data_models"]
+        assert "models" in fourth.regenerated
+
+    @pytest.mark.asyncio
+    async def test_failed_steps_rerun(self):
+        """Test a step that failed is regenerated even when its inputs are unchanged."""
+        generator = IncrementalGenerator(FastAPIAgent())
+        failing = {"active": True}
+
+        async def send_request(**kwargs):
+            if failing["active"] and "Generate FastAPI middleware" in kwargs["data"]["prompt"]:
+                raise RuntimeError("provider down")
+            return AsyncMock(result="generated code")
+
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            first = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+            failing["active"] = False
+            second = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+
+        assert first["middleware"].success is False
+        assert second.regenerated == ["middleware"]
+        assert second.success is True
+
+    @pytest.mark.asyncio
+    async def test_artifacts_persist_without_secrets(self, tmp_path):
+        """Test a file store is reused across generators and keeps no raw inputs."""
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="generated code")
+
+            await IncrementalGenerator(FastAPIAgent(), store=ArtifactStore(tmp_path)).generate(
+                make_fastapi_config(), ARCHITECTURE
+            )
+            calls = mock_protocol.call_count
+            rerun = await IncrementalGenerator(FastAPIAgent(), store=ArtifactStore(tmp_path)).generate(
+                make_fastapi_config(auth=None), ARCHITECTURE
+            )
+
+        # Dropping auth skips authentication and changes every step reading it
+        assert "authentication" not in rerun.results
+        assert set(rerun.regenerated) == {"application", "middleware", "dependencies", "routes"}
+        assert mock_protocol.call_count > calls
+        assert all("s3cret" not in file.read_text() for file in tmp_path.iterdir())
+
+
+class ValidatingArchitect:
+    """Architect stub whose validation may fail or rate the architecture poorly."""
+
+    def __init__(self, score: str = "good", success: bool = True, delay: float = 0.02):
+        self.score = score
+        self.success = success
+        self.delay = delay
+        self.finished = False
+
+    async def execute_task(self, task):
+        await asyncio.sleep(self.delay)
+        self.finished = True
+        if not self.success:
+            return TaskResult(task_id=task.id, success=False, error="architecture invalid")
+        result = {"validation_result": {"overall_score": self.score, "security": "low"}}
+        return TaskResult(task_id=task.id, success=True, result=result)
+
+
+class TestSpeculativeGenerator:
+    """Test speculative generation ahead of validation."""
+
+    @pytest.mark.asyncio
+    async def test_confirmed_speculation_overlaps_validation(self):
+        """Test generation starts before validation finishes and is kept."""
+        architect = ValidatingArchitect()
+        calls_before_validation = []
+
+        async def send_request(**kwargs):
+            calls_before_validation.append(not architect.finished)
+            return AsyncMock(result="generated code")
+
+        generator = SpeculativeGenerator(architect, IncrementalGenerator(FastAPIAgent()))
+        with patch('mcpturbo.protocol.send_request', side_effect=send_request):
+            result = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+
+        assert result.success is True
+        assert result.speculation == "confirmed"
+        assert result.regenerated == []
+        assert any(calls_before_validation)
+
+    @pytest.mark.asyncio
+    async def test_poor_verdict_discards_speculation(self):
+        """Test a successful validation with a failing verdict commits nothing."""
+        for speculate in (True, False):
+            generator = SpeculativeGenerator(
+                ValidatingArchitect(score="poor"), IncrementalGenerator(FastAPIAgent()), speculate=speculate
+            )
+
+            with patch('mcpturbo.protocol.send_request') as mock_protocol:
+                mock_protocol.return_value = AsyncMock(result="generated code")
+                result = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+
+            assert result.validation.success is True
+            assert result.success is False
+            assert result.generation is None
+
+        assert accepts_architecture(TaskResult(
+            task_id="v", success=True, result={"validation_result": {"overall_score": "fair"}}
+        ))
+        assert not accepts_architecture(TaskResult(
+            task_id="v", success=True, result={"validation_result": {"overall_score": "good", "valid": False}}
+        ))
+
+    @pytest.mark.asyncio
+    async def test_failed_validation_discards_speculation(self):
+        """Test speculative work is dropped when validation fails."""
+        generator = SpeculativeGenerator(ValidatingArchitect(success=False), IncrementalGenerator(FastAPIAgent()))
+
+        with patch('mcpturbo.protocol.send_request') as mock_protocol:
+            mock_protocol.return_value = AsyncMock(result="generated code")
+            result = await generator.generate(make_fastapi_config(), ARCHITECTURE)
+
+        assert result.success is False
+        assert result.speculation == "discarded"
+        assert result.generation is None